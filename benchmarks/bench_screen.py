@@ -0,0 +1,92 @@
+"""
+Compare the original linear substring scan with the n-gram index, and time
+the fuzzy matcher's per-query latency.
+
+Usage:
+    python benchmarks/bench_screen.py --entities 60000 --queries 2000
+    python benchmarks/bench_screen.py --entities 100000 --fuzzy
+"""
+
+import argparse
+import random
+import time
+
+from sanctions_pipeline.index import NameIndex
+from sanctions_pipeline.match import FuzzyMatcher
+
+SYLLABLES = ["al", "ba", "chi", "da", "el", "fa", "go", "ha", "ib", "jo", "ka"]
+SYLLABLES += ["li", "mo", "na", "or", "pe", "qu", "ra", "sa", "ti", "um", "vo"]
+
+
+def _name(rng: random.Random) -> str:
+    words = rng.randint(2, 4)
+    return " ".join(
+        "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+        for _ in range(words)
+    )
+
+
+def _linear_first_match(keys, q):
+    for i, n in enumerate(keys):
+        if q and n and q in n:
+            return i
+    return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entities", type=int, default=60000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--fuzzy", action="store_true", help="Also time fuzzy")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    names = [_name(rng) for _ in range(args.entities)]
+    # Half the queries are fragments of listed names, half are fresh names
+    queries = [
+        rng.choice(names)[2:14] if i % 2 else _name(rng) for i in range(args.queries)
+    ]
+
+    t0 = time.perf_counter()
+    index = NameIndex()
+    for i, n in enumerate(names):
+        index.add({"id": f"row-{i}", "schema": "Person", "name": n})
+    build_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    linear = [_linear_first_match(index.keys, q) for q in queries]
+    linear_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    indexed = [index.first_match(q) for q in queries]
+    indexed_s = time.perf_counter() - t0
+
+    assert linear == indexed, "index and linear scan disagree"
+    print(f"entities={args.entities} queries={args.queries}")
+    print(f"index build: {build_s:.2f}s")
+    print(f"linear scan: {linear_s:.2f}s ({args.queries / linear_s:,.0f} q/s)")
+    print(f"indexed:     {indexed_s:.2f}s ({args.queries / indexed_s:,.0f} q/s)")
+    print(f"speedup:     {linear_s / indexed_s:,.1f}x")
+
+    if args.fuzzy:
+        t0 = time.perf_counter()
+        matcher = FuzzyMatcher(index)
+        fuzzy_build_s = time.perf_counter() - t0
+
+        # Listed names with one character swapped, plus fresh names
+        typos = []
+        for i, q in enumerate(queries):
+            n = list(rng.choice(names))
+            n[rng.randrange(len(n))] = "x"
+            typos.append("".join(n) if i % 2 else q)
+
+        t0 = time.perf_counter()
+        hits = sum(matcher.best(q) is not None for q in typos)
+        fuzzy_s = time.perf_counter() - t0
+        print(f"fuzzy build: {fuzzy_build_s:.2f}s")
+        print(f"fuzzy:       {fuzzy_s * 1000 / len(typos):.2f} ms/query ({hits} hits)")
+
+
+if __name__ == "__main__":
+    main()
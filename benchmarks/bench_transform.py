@@ -0,0 +1,45 @@
+"""
+Compare the row-by-row CSV transform with the columnar (chunked pandas) path.
+
+Both write simple JSONL; the outputs are checked to be byte-identical.
+
+Usage:
+    python benchmarks/bench_transform.py --rows 200000
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from datagen import write_sanctions_csv
+from sanctions_pipeline.transform import transform_columnar, transform_to_simple_jsonl
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = write_sanctions_csv(Path(tmp) / "sanctions.csv", args.rows)
+        print(f"rows={args.rows} size={csv_path.stat().st_size / 1e6:.1f} MB")
+
+        outputs = {}
+        for label, fn in (
+            ("row-by-row", transform_to_simple_jsonl),
+            ("columnar", transform_columnar),
+        ):
+            out = Path(tmp) / f"{label}.jsonl"
+            t0 = time.perf_counter()
+            n = fn(str(csv_path), str(out))
+            elapsed = time.perf_counter() - t0
+            outputs[label] = out.read_bytes()
+            print(f"{label:>11}: {elapsed:.2f}s ({n / elapsed:,.0f} rows/s)")
+
+        assert outputs["row-by-row"] == outputs["columnar"], "outputs differ"
+        print("outputs identical")
+
+
+if __name__ == "__main__":
+    main()
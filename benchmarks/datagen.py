@@ -0,0 +1,178 @@
+"""
+Synthetic sanctions lists and customer files for benchmarks (no network).
+
+Sanctions files use the DFAT consolidated list headers, so they go through the
+same header normalization as the real download. Customer files mix names that
+are listed verbatim, listed names with spelling noise (case, hyphens, a typo)
+and names that are not listed at all.
+
+Usage:
+    python benchmarks/datagen.py --entities 100000 --customers 100000 --out data/bench
+"""
+
+import argparse
+import csv
+import random
+from pathlib import Path
+from typing import Iterator, List, Sequence
+
+SANCTIONS_HEADER = ["Reference", "Name of Individual or Entity", "Type"]
+SANCTIONS_HEADER += ["Committees", "Listing Information", "Date of Birth"]
+SANCTIONS_HEADER += ["Citizenship", "Address"]
+
+GIVEN = ["Ahmad", "Ali", "Anna", "Bogdan", "Chen", "Dmitri", "Elena", "Farid"]
+GIVEN += ["Hassan", "Igor", "Ivan", "Jamal", "Kim", "Li", "Maria", "Mohammed"]
+GIVEN += ["Nikolai", "Olga", "Omar", "Pavel", "Sergei", "Tariq", "Viktor", "Yusuf"]
+FAMILY = ["Abdullah", "Al-Rashid", "Bin Laden", "Chang", "Haqqani", "Ivanov"]
+FAMILY += ["Kadyrov", "Khan", "Kim", "Kuznetsov", "Mansour", "Nasser", "Petrov"]
+FAMILY += ["Popov", "Rahman", "Saleh", "Smirnov", "Sokolov", "Volkov", "Zhang"]
+ORG_WORDS = ["Al", "Atlas", "Baltic", "Crescent", "Eastern", "Falcon", "Global"]
+ORG_WORDS += ["Golden", "Horizon", "Islamic", "Meridian", "Northern", "Ocean"]
+ORG_WORDS += ["Orient", "Pacific", "Red", "Silk", "Star", "Trans", "United"]
+ORG_KINDS = ["Trading", "Shipping", "Petroleum", "Bank", "Logistics", "Holdings"]
+ORG_KINDS += ["Construction", "Foundation", "Industries", "Exchange"]
+ORG_SUFFIX = ["LLC", "Ltd", "Co.", "JSC", "FZE", "GmbH", "S.A.", ""]
+COMMITTEES = ["1267 (ISIL and Al-Qaida)", "1988 (Taliban)", "1718 (DPRK)"]
+COMMITTEES += ["Autonomous (Russia)", "Autonomous (Iran)", "Autonomous (Syria)"]
+COUNTRIES = ["Afghanistan", "Iran", "Iraq", "Russia", "Syria", "Yemen", "Libya"]
+
+
+def sanctioned_name(rng: random.Random, i: int) -> str:
+    """One listed name: mostly people, some organisations; unique via a suffix."""
+    if rng.random() < 0.7:
+        middle = f" {rng.choice(GIVEN)}" if rng.random() < 0.4 else ""
+        name = f"{rng.choice(GIVEN)}{middle} {rng.choice(FAMILY)}"
+    else:
+        words = " ".join(rng.sample(ORG_WORDS, rng.randint(1, 2)))
+        name = f"{words} {rng.choice(ORG_KINDS)} {rng.choice(ORG_SUFFIX)}".strip()
+    # The pools are small, so tag names to keep large lists mostly distinct
+    return f"{name} {_tag(i)}"
+
+
+def _tag(i: int) -> str:
+    """Pronounceable, unique token for a number (e.g. 0 -> "Ba")."""
+    syllables = "ba be bi bo bu da de di do du ka ke ki ko ku ma me mi mo mu".split()
+    out = []
+    while True:
+        i, r = divmod(i, len(syllables))
+        out.append(syllables[r])
+        if not i:
+            break
+    return "".join(out).capitalize()
+
+
+def sanctions_rows(n: int, seed: int = 1) -> Iterator[List[str]]:
+    """Yield n rows (without header) shaped like the DFAT consolidated list."""
+    rng = random.Random(seed)
+    for i in range(n):
+        individual = rng.random() < 0.7
+        yield [
+            str(i + 1),
+            sanctioned_name(rng, i),
+            "Individual" if individual else "Entity",
+            rng.choice(COMMITTEES),
+            f"Listed on {rng.randint(2001, 2024)}-{rng.randint(1, 12):02d}-01",
+            f"{rng.randint(1940, 2000)}-01-01" if individual else "",
+            rng.choice(COUNTRIES) if individual else "",
+            f"{rng.randint(1, 999)} Example Street, {rng.choice(COUNTRIES)}",
+        ]
+
+
+def write_sanctions_csv(path: Path, n: int, seed: int = 1) -> Path:
+    """Write a synthetic sanctions list as CSV."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(SANCTIONS_HEADER)
+        w.writerows(sanctions_rows(n, seed))
+    return path
+
+
+def write_sanctions_xlsx(path: Path, n: int, seed: int = 1) -> Path:
+    """Write a synthetic sanctions list as .xlsx (streamed, write-only mode)."""
+    import openpyxl
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(SANCTIONS_HEADER)
+    for row in sanctions_rows(n, seed):
+        ws.append(row)
+    wb.save(path)
+    return path
+
+
+def _noisy(rng: random.Random, name: str) -> str:
+    """A listed name as a customer file might spell it."""
+    kind = rng.randrange(3)
+    if kind == 0:
+        return name.upper()
+    if kind == 1:
+        return name.replace(" ", "-", 1)
+    chars = list(name)
+    pos = rng.randrange(len(chars))
+    chars[pos] = "x" if chars[pos] != "x" else "y"
+    return "".join(chars)
+
+
+def customer_names(
+    n: int, listed: Sequence[str], hit_rate: float = 0.05, seed: int = 2
+) -> Iterator[str]:
+    """
+    Yield n customer names; about `hit_rate` of them are (noisy) listed names.
+
+    Customer files repeat names heavily, so a third of the clean names are
+    drawn from a small pool of frequent customers.
+    """
+    rng = random.Random(seed)
+    frequent = [f"{rng.choice(GIVEN)} {rng.choice(FAMILY)} Jr" for _ in range(500)]
+    for i in range(n):
+        roll = rng.random()
+        if listed and roll < hit_rate / 2:
+            yield rng.choice(listed)
+        elif listed and roll < hit_rate:
+            yield _noisy(rng, rng.choice(listed))
+        elif roll < hit_rate + (1 - hit_rate) / 3:
+            yield rng.choice(frequent)
+        else:
+            yield f"{rng.choice(GIVEN)} {rng.choice(FAMILY)}son {_tag(i + 7_000_000)}"
+
+
+def write_customers_csv(
+    path: Path,
+    n: int,
+    listed: Sequence[str],
+    hit_rate: float = 0.05,
+    seed: int = 2,
+) -> Path:
+    """Write a customer CSV (customer_id, name, country) for screening."""
+    rng = random.Random(seed)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["customer_id", "name", "country"])
+        for i, name in enumerate(customer_names(n, listed, hit_rate, seed)):
+            w.writerow([f"C{i:08d}", name, rng.choice(COUNTRIES)])
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entities", type=int, default=10000)
+    parser.add_argument("--customers", type=int, default=10000)
+    parser.add_argument("--hit-rate", type=float, default=0.05)
+    parser.add_argument("--xlsx", action="store_true", help="Also write an .xlsx")
+    parser.add_argument("--out", default="data/bench")
+    args = parser.parse_args()
+
+    out = Path(args.out)
+    write_sanctions_csv(out / "sanctions.csv", args.entities)
+    if args.xlsx:
+        write_sanctions_xlsx(out / "sanctions.xlsx", args.entities)
+    listed = [row[1] for row in sanctions_rows(args.entities)]
+    write_customers_csv(out / "customers.csv", args.customers, listed, args.hit_rate)
+    print(f"Wrote {args.entities} entities and {args.customers} customers to {out}")
+
+
+if __name__ == "__main__":
+    main()
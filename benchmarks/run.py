@@ -0,0 +1,223 @@
+"""
+Timed end-to-end scenarios on synthetic data, with a JSON results file.
+
+Each scenario runs the public pipeline functions (transform, validate, screen)
+on data from datagen.py; nothing touches the network. Inputs are generated
+once per scale and reused from --data-dir. Results are written as JSON so a
+run can be compared with one from another commit via --compare.
+
+Usage:
+    python benchmarks/run.py --scale 10k
+    python benchmarks/run.py --scale 10k --scale 100k --output bench.json
+    python benchmarks/run.py --scale 100k --scenario screen --compare bench.json
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from datagen import (
+    sanctions_rows,
+    write_customers_csv,
+    write_sanctions_csv,
+    write_sanctions_xlsx,
+)
+from sanctions_pipeline.screen import screen_names
+from sanctions_pipeline.transform import (
+    transform_columnar,
+    transform_csv_to_ftm,
+    transform_to_simple_jsonl,
+)
+from sanctions_pipeline.validate import validate_jsonl
+
+RESULTS_VERSION = 1
+
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+SCENARIOS = [
+    "transform_csv",
+    "transform_columnar",
+    "transform_ftm",
+    "transform_xlsx",
+    "validate",
+    "screen",
+    "screen_fuzzy",
+]
+
+
+def _prepare(data_dir: Path, n: int) -> Dict[str, Path]:
+    """Generate (or reuse) the inputs for one scale."""
+    d = data_dir / str(n)
+    paths = {
+        "csv": d / "sanctions.csv",
+        "xlsx": d / "sanctions.xlsx",
+        "customers": d / "customers.csv",
+        "entities": d / "entities.jsonl",
+    }
+    if not paths["csv"].exists():
+        write_sanctions_csv(paths["csv"], n)
+    if not paths["customers"].exists():
+        listed = [row[1] for row in sanctions_rows(n)]
+        write_customers_csv(paths["customers"], n, listed)
+    if not paths["entities"].exists():
+        transform_to_simple_jsonl(str(paths["csv"]), str(paths["entities"]))
+    return paths
+
+
+def _scenario(name: str, paths: Dict[str, Path], out: Path) -> Callable[[], int]:
+    """Return a callable running one scenario and returning rows processed."""
+    if name == "transform_csv":
+        return lambda: transform_to_simple_jsonl(
+            str(paths["csv"]), str(out / "simple.jsonl")
+        )
+    if name == "transform_columnar":
+        return lambda: transform_columnar(
+            str(paths["csv"]), str(out / "columnar.jsonl")
+        )
+    if name == "transform_ftm":
+        return lambda: transform_csv_to_ftm(str(paths["csv"]), str(out / "ftm.jsonl"))
+    if name == "transform_xlsx":
+        if not paths["xlsx"].exists():
+            write_sanctions_xlsx(paths["xlsx"], _rows(paths["csv"]))
+        return lambda: transform_to_simple_jsonl(
+            str(paths["xlsx"]), str(out / "xlsx.jsonl")
+        )
+    if name == "validate":
+        return lambda: validate_jsonl(str(paths["entities"]))["total"]
+    if name in ("screen", "screen_fuzzy"):
+        method = "fuzzy" if name == "screen_fuzzy" else "substring"
+
+        def run() -> int:
+            screen_names(
+                str(paths["customers"]),
+                str(paths["entities"]),
+                str(out / f"{name}.csv"),
+                method=method,
+            )
+            return _rows(paths["customers"])
+
+        return run
+    raise ValueError(f"Unknown scenario: {name} (use {', '.join(SCENARIOS)})")
+
+
+def _rows(csv_path: Path) -> int:
+    with csv_path.open("rb") as f:
+        return sum(1 for _ in f) - 1
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(
+    scales: List[str], scenarios: List[str], data_dir: Path, repeat: int = 1
+) -> Dict:
+    """Run every scenario at every scale; keep the best of `repeat` timings."""
+    results = []
+    for scale in scales:
+        n = SCALES[scale]
+        paths = _prepare(data_dir, n)
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in scenarios:
+                fn = _scenario(name, paths, Path(tmp))
+                best = None
+                for _ in range(repeat):
+                    t0 = time.perf_counter()
+                    rows = fn()
+                    elapsed = time.perf_counter() - t0
+                    best = elapsed if best is None else min(best, elapsed)
+                result = {
+                    "scenario": name,
+                    "scale": scale,
+                    "rows": rows,
+                    "seconds": round(best, 4),
+                    "rows_per_s": round(rows / best, 1) if best else None,
+                }
+                results.append(result)
+                print(
+                    f"{scale:>5} {name:<15} {best:8.2f}s "
+                    f"{result['rows_per_s'] or 0:>12,.0f} rows/s"
+                )
+
+    return {
+        "version": RESULTS_VERSION,
+        "commit": _git_commit(),
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """
+    Compare two results files scenario by scenario.
+
+    Returns:
+        List[str]: "scenario@scale" for every result slower than the baseline
+        by more than `tolerance` (e.g. 0.1 = 10%)
+    """
+    before = {(r["scenario"], r["scale"]): r for r in baseline["results"]}
+    regressions = []
+    print(f"\nvs {(baseline.get('commit') or 'baseline')[:12]}:")
+    for r in current["results"]:
+        old = before.get((r["scenario"], r["scale"]))
+        if old is None:
+            continue
+        ratio = r["seconds"] / old["seconds"] if old["seconds"] else 1.0
+        flag = ""
+        if ratio > 1 + tolerance:
+            flag = "  REGRESSION"
+            regressions.append(f"{r['scenario']}@{r['scale']}")
+        print(
+            f"{r['scale']:>5} {r['scenario']:<15} {old['seconds']:8.2f}s -> "
+            f"{r['seconds']:8.2f}s ({ratio:.2f}x){flag}"
+        )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--scale", action="append", choices=list(SCALES))
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS)
+    parser.add_argument("--repeat", type=int, default=1, help="Best of N runs")
+    parser.add_argument("--data-dir", default="data/bench", help="Generated inputs")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", help="Earlier results file to compare with")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.1, help="Allowed slowdown (0.1 = 10%%)"
+    )
+    args = parser.parse_args()
+
+    current = run(
+        args.scale or ["10k"],
+        args.scenario or SCENARIOS,
+        Path(args.data_dir),
+        repeat=max(1, args.repeat),
+    )
+    Path(args.output).write_text(json.dumps(current, indent=2) + "\n")
+    print(f"Wrote {args.output}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        if compare(current, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,20 @@
 import sys
-from pathlib import Path
-import requests
+
+from sanctions_pipeline.extract import download
 
 DFAT_URL = "https://www.dfat.gov.au/sites/default/files/Australian_Sanctions_Consolidated_List.xlsx"
 
 
-def main(out_path="data/raw/dfat_consolidated.xlsx"):
-    p = Path(out_path)
-    p.parent.mkdir(parents=True, exist_ok=True)
+def main(out_path="data/raw/dfat_consolidated.xlsx", url=DFAT_URL):
     headers = {"User-Agent": "sanctions-pipeline/0.1 (+github)"}
-    r = requests.get(DFAT_URL, timeout=60, headers=headers)
-    if r.status_code != 200 or len(r.content) < 5000:
-        raise SystemExit(f"Download failed: status={r.status_code}")
-    p.write_bytes(r.content)
-    print(f"Saved {p}")
+    try:
+        result = download(url, out_path, headers=headers, min_bytes=5000)
+    except Exception as e:
+        raise SystemExit(f"Download failed: {e}")
+    if result["status"] == "not_modified":
+        print(f"Not modified: {out_path}")
+    else:
+        print(f"Saved {out_path}")
 
 
 if __name__ == "__main__":
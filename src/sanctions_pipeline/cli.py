@@ -1,92 +1,558 @@
-import pathlib
+from typing import List
+
 import typer
-import httpx
 import logging
 
+from . import metrics
+from .result_cache import MAX_ENTRIES
+
 app = typer.Typer(help="Sanctions pipeline CLI")
 
 
 @app.command()
-def extract(url: str, out: str = "data/raw/source.json") -> None:
-    """Download a URL to a local file."""
-    logging.info(f"Downloading: {url}")
-    p = pathlib.Path(out)
-    p.parent.mkdir(parents=True, exist_ok=True)
+def extract(
+    url: str,
+    out: str = "data/raw/source.json",
+    force: bool = typer.Option(
+        False, "--force", help="Download even if the source is unchanged"
+    ),
+) -> None:
+    """Download a URL to a local file (skipped if unchanged, resumed if cut off)."""
+    from .extract import download
 
-    with httpx.Client(timeout=30) as client:
-        r = client.get(url)
-        r.raise_for_status()
-        p.write_bytes(r.content)
+    logging.info(f"Downloading: {url}")
+    with metrics.stage("extract") as st:
+        result = download(url, out, force=force)
+        st.bytes_written += result["bytes"]
+        st.count({"bytes_downloaded": result["bytes"]})
 
+    if result["status"] == "not_modified":
+        typer.echo(f"Not modified: {out}")
+        return
     logging.info(f"Saved: {out}")
     typer.echo(f"Saved {out}")
 
 
+@app.command("extract-all")
+def extract_all(
+    manifest: str = typer.Option(
+        "sources.toml", "--manifest", help="TOML file of [sources.<id>] tables"
+    ),
+    source: List[str] = typer.Option(
+        None, "--source", "-s", help="Only these source ids (repeatable)"
+    ),
+    per_host: int = typer.Option(2, "--per-host", help="Concurrent downloads per host"),
+    retries: int = typer.Option(3, "--retries", help="Retries per source"),
+    force: bool = typer.Option(
+        False, "--force", help="Download even if sources are unchanged"
+    ),
+) -> None:
+    """Download every source in a manifest concurrently."""
+    import asyncio
+
+    from .extract import extract_all as run_extract_all, load_manifest
+
+    sources = load_manifest(manifest)
+    if source:
+        unknown = set(source) - set(sources)
+        if unknown:
+            typer.secho(
+                f"Unknown source(s): {', '.join(sorted(unknown))}", fg=typer.colors.RED
+            )
+            raise typer.Exit(1)
+        sources = {k: v for k, v in sources.items() if k in source}
+
+    with metrics.stage("extract_all") as st:
+        results = asyncio.run(
+            run_extract_all(sources, per_host=per_host, force=force, retries=retries)
+        )
+        for r in results:
+            st.bytes_written += r.get("bytes", 0)
+        st.rows = len(results)
+
+    failed = 0
+    for r in results:
+        if r["status"] == "failed":
+            failed += 1
+            typer.secho(f"{r['id']}: FAILED {r['error']}", fg=typer.colors.RED)
+        else:
+            typer.echo(f"{r['id']}: {r['status']} {r['out']} ({r['seconds']:.1f}s)")
+    if failed:
+        raise typer.Exit(1)
+
+
 @app.command()
 def transform(
     input: str = "data/raw/ofac_sdn.csv",
     output: str = "data/ftm/entities.jsonl",
     format: str = typer.Option(
-        "jsonl", "--format", "-f", help="Output format: jsonl or ftm"
+        "jsonl", "--format", "-f", help="Output format: jsonl, ftm, parquet or store"
+    ),
+    workers: int = typer.Option(
+        1, "--workers", "-w", help="Processes building entities (same output)"
+    ),
+    incremental: bool = typer.Option(
+        False,
+        "--incremental",
+        help="Only rebuild changed rows; also write a .delta.jsonl next to the output",
+    ),
+    columnar: bool = typer.Option(
+        False,
+        "--columnar",
+        help="CSV to simple JSONL with per-chunk column operations (same output)",
     ),
 ) -> None:
     """
-    Convert a CSV/XLSX file to either simplified JSONL or FollowTheMoney JSONL format.
+    Convert a CSV/XLSX file to simplified JSONL, FollowTheMoney JSONL, Parquet or an entity store.
 
     Args:
         input: Path to the input CSV/XLSX file
         output: Path where the transformed JSONL file will be saved
-        format: Output format ('jsonl' or 'ftm')
+        format: Output format ('jsonl', 'ftm', 'parquet' or 'store')
+        workers: Number of processes building entities in row batches
+        incremental: Reuse unchanged entities from the previous run and write a delta
+        columnar: Use the chunked column-operation path (CSV input, jsonl format)
     """
-    from .transform import transform_csv_to_ftm, transform_to_simple_jsonl
+    from .transform import (
+        transform_columnar,
+        transform_csv_to_ftm,
+        transform_incremental,
+        transform_to_parquet,
+        transform_to_simple_jsonl,
+        transform_to_store,
+    )
 
     try:
-        if format.lower() == "ftm":
-            n = transform_csv_to_ftm(input, output)
+        with metrics.stage("transform") as st:
+            st.read(input)
+            if incremental:
+                c = transform_incremental(input, output, format=format)
+                n = c["total"]
+                st.count({k: v for k, v in c.items() if k != "total"})
+            elif columnar:
+                if format.lower() != "jsonl":
+                    raise ValueError("--columnar only writes --format jsonl")
+                n = transform_columnar(input, output)
+            elif format.lower() == "store":
+                n = transform_to_store(input, output, workers=workers)
+            elif format.lower() == "parquet":
+                n = transform_to_parquet(input, output, workers=workers)
+            elif format.lower() == "ftm":
+                n = transform_csv_to_ftm(input, output, workers=workers)
+            else:
+                n = transform_to_simple_jsonl(input, output, workers=workers)
+            st.rows = n
+            st.wrote(output)
+
+        if incremental:
+            typer.echo(
+                f"Wrote {c['total']} entities to {output} "
+                f"({c['added']} added, {c['updated']} updated, "
+                f"{c['deleted']} deleted, {c['unchanged']} unchanged)"
+            )
+        elif format.lower() == "store":
+            typer.echo(f"Wrote {n} entities to store {output}")
+        elif format.lower() == "ftm":
             typer.echo(f"Wrote {n} FTM entities to {output}")
         else:
-            n = transform_to_simple_jsonl(input, output)
             typer.echo(f"Wrote {n} simple entities to {output}")
     except Exception as e:
         typer.secho(f"Error during transformation: {str(e)}", fg=typer.colors.RED)
         raise typer.Exit(1)
 
 
+@app.command()
+def merge(
+    inputs: List[str] = typer.Argument(
+        ..., help="Transformed JSONL files, as path or label=path"
+    ),
+    output: str = typer.Option(
+        "data/ftm/merged.jsonl", "--output", "-o", help="Merged JSONL entities"
+    ),
+    partitions: int = typer.Option(
+        64, "--partitions", help="Hash partitions (more = less memory per pass)"
+    ),
+):
+    """Merge several entity files into one set, one entity per name and schema."""
+    from .merge import merge_entities
+
+    with metrics.stage("merge") as st:
+        for spec in inputs:
+            st.read(spec.partition("=")[2] or spec)
+        c = merge_entities(inputs, output, partitions=partitions)
+        st.rows = c["input"]
+        st.count({k: v for k, v in c.items() if k != "input"})
+        st.wrote(output)
+    typer.echo(
+        f"Merged {c['input']} entities into {c['output']} -> {output} "
+        f"({c['duplicates']} duplicates, {c['skipped']} without a name)"
+    )
+
+
 @app.command()
 def screen(
     input_csv: str = typer.Option(
         ..., "--input-csv", help="CSV file with names to screen"
     ),
     entities: str = typer.Option(
-        "data/ftm/entities.jsonl", "--entities", help="JSONL entities file"
+        "data/ftm/entities.jsonl",
+        "--entities",
+        help="Entities file (JSONL, Parquet or store)",
     ),
     output_csv: str = typer.Option(
         "data/screen/results.csv", "--output-csv", help="Output CSV with matches"
     ),
+    index: str = typer.Option(
+        None, "--index", help="Persisted name index (built if missing or stale)"
+    ),
+    workers: int = typer.Option(
+        1, "--workers", "-w", help="Processes to screen with (splits the input CSV)"
+    ),
+    match: str = typer.Option(
+        "substring", "--match", "-m", help="Match method: substring or fuzzy"
+    ),
+    threshold: float = typer.Option(
+        None, "--threshold", help="Minimum match score (fuzzy default: 0.8)"
+    ),
+    top_k: int = typer.Option(
+        None, "--top-k", help="Return the best K matches per row, ranked"
+    ),
+    output_mode: str = typer.Option(
+        "rows", "--output-mode", help="With --top-k: rows (one per match) or json"
+    ),
+    attributes: bool = typer.Option(
+        True,
+        "--attributes/--no-attributes",
+        help="Only match entities of the row's type, birth year and country columns",
+    ),
+    result_cache: str = typer.Option(
+        None,
+        "--result-cache",
+        help="SQLite file caching results across runs (shareable between lists)",
+    ),
+    result_cache_size: int = typer.Option(
+        MAX_ENTRIES,
+        "--result-cache-size",
+        help="Most queries kept in the result cache",
+    ),
 ):
     """Match names in a CSV against entities; write matches to CSV."""
     from .screen import screen_names
 
-    n = screen_names(input_csv, entities, output_csv)
-    typer.echo(f"Matched {n} rows -> {output_csv}")
+    with metrics.stage("screen") as st:
+        st.read(input_csv)
+        n = screen_names(
+            input_csv,
+            entities,
+            output_csv,
+            index_path=index,
+            workers=workers,
+            method=match,
+            threshold=threshold,
+            top_k=top_k,
+            output_mode=output_mode,
+            attributes=attributes,
+            result_cache=result_cache,
+            result_cache_size=result_cache_size,
+        )
+        st.rows = st.counters.get("rows")
+        st.wrote(output_csv)
+    peak = metrics.peak_rss_bytes()
+    memory = f" (peak memory {peak / 2**20:,.0f} MiB)" if peak else ""
+    typer.echo(f"Matched {n} rows -> {output_csv}{memory}")
+
+
+@app.command("screen-text")
+def screen_text(
+    input_csv: str = typer.Option(
+        ..., "--input-csv", help="CSV file with a free-text column"
+    ),
+    column: str = typer.Option(
+        "text", "--column", "-c", help="Free-text column (memo, remarks, address)"
+    ),
+    entities: str = typer.Option(
+        "data/ftm/entities.jsonl",
+        "--entities",
+        help="Entities file (JSONL, Parquet or store)",
+    ),
+    output_csv: str = typer.Option(
+        "data/screen/text_hits.csv", "--output-csv", help="Output CSV, one row per hit"
+    ),
+    automaton: str = typer.Option(
+        None,
+        "--automaton",
+        help="Compiled name automaton cache (default: <entities>.ac)",
+    ),
+    min_length: int = typer.Option(
+        3, "--min-length", help="Shortest normalized name to look for"
+    ),
+):
+    """Find listed names inside free text; write every hit with its offsets."""
+    from .textscan import screen_text as run_screen_text
+
+    with metrics.stage("screen-text") as st:
+        st.read(input_csv)
+        c = run_screen_text(
+            input_csv,
+            entities,
+            output_csv,
+            column=column,
+            automaton_path=automaton or f"{entities}.ac",
+            min_length=min_length,
+        )
+        st.rows = c["rows"]
+        st.wrote(output_csv)
+    typer.echo(
+        f"Found {c['hits']} hits in {c['matched']} of {c['rows']} rows -> {output_csv}"
+    )
+
+
+@app.command()
+def rescreen(
+    input_csv: str = typer.Option(
+        ..., "--input-csv", help="CSV file with names to screen"
+    ),
+    previous_csv: str = typer.Option(
+        ..., "--previous", help="Results CSV of the previous screen run"
+    ),
+    entities: str = typer.Option(
+        "data/ftm/entities.jsonl", "--entities", help="New JSONL entities file"
+    ),
+    delta: str = typer.Option(
+        None, "--delta", help="Delta JSONL from transform --incremental"
+    ),
+    old_entities: str = typer.Option(
+        None, "--old-entities", help="Previous entities file (instead of --delta)"
+    ),
+    output_csv: str = typer.Option(
+        "data/screen/results.csv", "--output-csv", help="Output CSV with matches"
+    ),
+    index: str = typer.Option(
+        None, "--index", help="Persisted name index (built if missing or stale)"
+    ),
+    match: str = typer.Option(
+        "substring", "--match", "-m", help="Match method used for --previous"
+    ),
+    threshold: float = typer.Option(
+        None, "--threshold", help="Match threshold used for --previous"
+    ),
+):
+    """Update previous results by screening only against changed entities."""
+    from .screen import rescreen_names
+
+    if not (delta or old_entities):
+        typer.secho("Pass --delta or --old-entities", fg=typer.colors.RED)
+        raise typer.Exit(1)
+
+    with metrics.stage("rescreen") as st:
+        st.read(input_csv)
+        st.read(previous_csv)
+        stats = rescreen_names(
+            input_csv,
+            previous_csv,
+            entities,
+            output_csv,
+            delta_jsonl=delta,
+            old_entities_jsonl=old_entities,
+            index_path=index,
+            method=match,
+            threshold=threshold,
+        )
+        st.rows = stats["rows"]
+        st.count({k: v for k, v in stats.items() if k != "rows"})
+        st.wrote(output_csv)
+    typer.echo(
+        f"Matched {stats['matched']} rows -> {output_csv} "
+        f"({stats['changed_entities']} changed / {stats['deleted_entities']} deleted "
+        f"entities; {stats['rescreened']} of {stats['rows']} rows fully rescreened)"
+    )
+
+
+@app.command()
+def index(
+    entities: str = typer.Option(
+        "data/ftm/entities.jsonl",
+        "--entities",
+        help="Entities file (JSONL, Parquet or store)",
+    ),
+    output: str = typer.Option(
+        "data/ftm/entities.idx", "--output", help="Where to write the name index"
+    ),
+):
+    """Build the persistent name index used by `screen --index`."""
+    from .index import build_index
+
+    with metrics.stage("index") as st:
+        st.read(entities)
+        idx = build_index(entities)
+        idx.save(output)
+        st.rows = len(idx)
+        st.wrote(output)
+    typer.echo(f"Indexed {len(idx)} names -> {output}")
+
+
+@app.command()
+def serve(
+    entities: str = typer.Option(
+        "data/ftm/entities.jsonl",
+        "--entities",
+        help="Entities file (JSONL, Parquet or store)",
+    ),
+    host: str = typer.Option("127.0.0.1", "--host", help="Interface to bind"),
+    port: int = typer.Option(8000, "--port", help="Port to listen on"),
+    index: str = typer.Option(
+        None, "--index", help="Persisted name index (built if missing or stale)"
+    ),
+    match: str = typer.Option(
+        "substring", "--match", "-m", help="Match method: substring or fuzzy"
+    ),
+    threshold: float = typer.Option(
+        None, "--threshold", help="Minimum match score (fuzzy default: 0.8)"
+    ),
+    top_k: int = typer.Option(
+        None, "--top-k", help="Return the best K matches per name, ranked"
+    ),
+    watch: float = typer.Option(
+        5.0, "--watch", help="Seconds between entities-file checks (0 disables)"
+    ),
+):
+    """Serve screening over HTTP/JSON with the index kept in memory."""
+    import asyncio
+
+    from .service import ScreeningService, serve as run_server
+
+    service = ScreeningService(
+        entities, index_path=index, method=match, threshold=threshold, top_k=top_k
+    )
+    typer.echo(f"Loaded {service.screener.matcher.index.entities} entities")
+    try:
+        asyncio.run(run_server(service, host, port, watch_interval=watch or None))
+    except KeyboardInterrupt:
+        pass
 
 
 @app.command()
-def validate(input: str = "data/ftm/entities.jsonl", min_rows: int = 1):
-    """Validate a JSONL file: parses JSON and enforces min row count."""
+def validate(
+    input: str = "data/ftm/entities.jsonl",
+    min_rows: int = 1,
+    check_fields: bool = typer.Option(
+        False,
+        "--check-fields/--no-check-fields",
+        help="Require id, name and a known schema, with unique ids",
+    ),
+    workers: int = typer.Option(
+        1, "--workers", "-w", help="Processes validating blocks in parallel"
+    ),
+):
+    """Validate a JSONL or Parquet file: records, entity fields and min row count."""
     from .validate import validate_jsonl
 
-    summary = validate_jsonl(input, min_rows=min_rows)
+    with metrics.stage("validate") as st:
+        st.read(input)
+        summary = validate_jsonl(
+            input, min_rows=min_rows, check_fields=check_fields, workers=workers
+        )
+        st.rows = summary["total"]
     typer.echo(f"Valid: {summary['total']} records")
 
 
+@app.command()
+def run(
+    input: str = typer.Option(
+        "data/raw/ofac_sdn.csv", "--input", help="Raw CSV/XLSX list"
+    ),
+    url: str = typer.Option(
+        None, "--url", help="Download the list to --input first (if changed)"
+    ),
+    entities: str = typer.Option(
+        "data/ftm/entities.jsonl", "--entities", help="Simple JSONL entities output"
+    ),
+    screen_input: str = typer.Option(
+        None, "--screen-input", help="CSV file with names to screen"
+    ),
+    output_csv: str = typer.Option(
+        "data/screen/results.csv", "--output-csv", help="Output CSV with matches"
+    ),
+    cache_dir: str = typer.Option(
+        "data/cache", "--cache-dir", help="Stage state and persisted name index"
+    ),
+    match: str = typer.Option(
+        "substring", "--match", "-m", help="Match method: substring or fuzzy"
+    ),
+    threshold: float = typer.Option(
+        None, "--threshold", help="Minimum match score (fuzzy default: 0.8)"
+    ),
+    top_k: int = typer.Option(
+        None, "--top-k", help="Return the best K matches per row, ranked"
+    ),
+    output_mode: str = typer.Option(
+        "rows", "--output-mode", help="With --top-k: rows (one per match) or json"
+    ),
+    min_rows: int = 1,
+    workers: int = typer.Option(
+        1, "--workers", "-w", help="Processes to screen with (splits the input CSV)"
+    ),
+    force: bool = typer.Option(
+        False, "--force", help="Run every stage even if its inputs are unchanged"
+    ),
+):
+    """Extract, transform, validate and screen in one pass, skipping unchanged stages."""
+    from .pipeline import run_pipeline
+
+    try:
+        result = run_pipeline(
+            input,
+            entities,
+            screen_input=screen_input,
+            output_csv=output_csv,
+            cache_dir=cache_dir,
+            url=url,
+            method=match,
+            threshold=threshold,
+            top_k=top_k,
+            output_mode=output_mode,
+            min_rows=min_rows,
+            workers=workers,
+            force=force,
+        )
+    except AssertionError as e:
+        typer.secho(f"Validation failed: {e}", fg=typer.colors.RED)
+        raise typer.Exit(1)
+
+    build = result["build"]
+    typer.echo(f"Build ({build['status']}): {build['entities']} entities -> {entities}")
+    if "screen" in result:
+        screened = result["screen"]
+        typer.echo(
+            f"Screen ({screened['status']}): matched {screened['matched']} rows "
+            f"-> {output_csv}"
+        )
+
+
 @app.callback()
 def main(
-    verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose logging")
+    ctx: typer.Context,
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose logging"),
+    metrics_json: str = typer.Option(
+        None,
+        "--metrics",
+        envvar="SANCTIONS_PIPELINE_METRICS",
+        help="Write per-stage timings and counters as JSON here ('-' for stderr)",
+    ),
+    metrics_prom: str = typer.Option(
+        None,
+        "--metrics-prom",
+        envvar="SANCTIONS_PIPELINE_METRICS_PROM",
+        help="Also write them as a Prometheus textfile (node_exporter collector)",
+    ),
 ):
     level = logging.DEBUG if verbose else logging.INFO
     logging.basicConfig(level=level, format="%(levelname)s: %(message)s")
 
+    if metrics_json or metrics_prom:
+        recorder = metrics.enable(metrics_json, metrics_prom)
+        ctx.call_on_close(recorder.write)
+
 
 if __name__ == "__main__":
     app()
@@ -0,0 +1,426 @@
+from pathlib import Path
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+__all__ = ["download", "download_async", "extract_all", "load_manifest"]
+
+log = logging.getLogger(__name__)
+
+_CONTENT_RANGE = re.compile(r"bytes (\d+)-\d+/(\d+|\*)")
+
+# Responses worth retrying: throttling and transient server errors
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+def _meta_path(out: Path) -> Path:
+    """Sidecar holding the validators of the complete file."""
+    return out.with_name(out.name + ".meta.json")
+
+
+def _part_path(out: Path) -> Path:
+    return out.with_name(out.name + ".part")
+
+
+def _read_json(path: Path) -> Dict[str, Any]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_json(path: Path, data: Dict[str, Any]) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _validators(r: httpx.Response) -> Dict[str, Optional[str]]:
+    return {
+        "etag": r.headers.get("etag"),
+        "last_modified": r.headers.get("last-modified"),
+    }
+
+
+def _if_range(meta: Dict[str, Any]) -> Optional[str]:
+    """Validator for If-Range; weak ETags may not be used there (RFC 9110)."""
+    etag = meta.get("etag")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return meta.get("last_modified")
+
+
+def _retryable(e: Exception) -> bool:
+    if isinstance(e, httpx.TransportError):
+        return True
+    return (
+        isinstance(e, httpx.HTTPStatusError) and e.response.status_code in RETRY_STATUS
+    )
+
+
+class _Restart(Exception):
+    """The part file doesn't fit the source (416, or a 206 elsewhere); start over."""
+
+
+class _Transfer:
+    """
+    Protocol state of one download, shared by the sync and async drivers.
+
+    The drivers only send the request built by `request_headers()`, hand the
+    response to `start()`, feed body chunks to `write()`, and call `finish()`.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        out: str,
+        headers: Optional[Dict[str, str]] = None,
+        force: bool = False,
+        min_bytes: int = 0,
+    ) -> None:
+        self.url = url
+        self.out = Path(out)
+        self.out.parent.mkdir(parents=True, exist_ok=True)
+        self.part = _part_path(self.out)
+        self.part_meta = self.part.with_name(self.part.name + ".json")
+        self.headers = headers or {}
+        self.force = force
+        self.min_bytes = min_bytes
+        self.meta = _read_json(_meta_path(self.out))
+        self.offset = 0
+        self.transferred = 0
+        self.resumed = False
+        self.file = None
+
+    def request_headers(self) -> Dict[str, str]:
+        """Headers for the next attempt: a resume, a conditional GET or neither."""
+        # Byte offsets must refer to the stored bytes, so no content coding
+        req = {"Accept-Encoding": "identity", **self.headers}
+        part_meta = _read_json(self.part_meta)
+        self.offset = self.part.stat().st_size if self.part.exists() else 0
+        validator = _if_range(part_meta) if part_meta.get("url") == self.url else None
+        if self.offset and validator:
+            req["Range"] = f"bytes={self.offset}-"
+            req["If-Range"] = validator
+            return req
+
+        self.offset = 0
+        if self.out.exists() and self.meta.get("url") == self.url and not self.force:
+            if self.meta.get("etag"):
+                req["If-None-Match"] = self.meta["etag"]
+            if self.meta.get("last_modified"):
+                req["If-Modified-Since"] = self.meta["last_modified"]
+        return req
+
+    def start(self, r: httpx.Response) -> Optional[Dict[str, Any]]:
+        """
+        Inspect the response status and open the part file for its body.
+
+        Returns:
+            Optional[Dict[str, Any]]: The final result if there is no body to
+            read (304 Not Modified), else None
+        """
+        if r.status_code == 416 and self.offset:
+            self.part.unlink()
+            raise _Restart()
+        if r.status_code == 304:
+            log.info(f"Not modified: {self.url}")
+            return {
+                "status": "not_modified",
+                "bytes": self.transferred,
+                "size": self.out.stat().st_size,
+            }
+        r.raise_for_status()
+
+        m = _CONTENT_RANGE.match(r.headers.get("content-range", ""))
+        if r.status_code == 206 and not (
+            self.offset and m and int(m.group(1)) == self.offset
+        ):
+            # Writing this body at the resume offset would corrupt the file
+            content_range = r.headers.get("content-range")
+            if not self.offset:
+                raise ValueError(
+                    f"Unexpected partial response for {self.url}: {content_range}"
+                )
+            log.warning(
+                f"{self.url} answered {content_range} to a resume at byte "
+                f"{self.offset}; restarting"
+            )
+            self.part.unlink()
+            self.part_meta.unlink(missing_ok=True)
+            raise _Restart()
+        if r.status_code == 206:
+            mode = "ab"
+            self.resumed = True
+            log.info(f"Resuming {self.url} at byte {self.offset}")
+        else:
+            # Full body: the source changed or the server ignores Range
+            mode = "wb"
+            _write_json(self.part_meta, {"url": self.url, **_validators(r)})
+        self.file = self.part.open(mode)
+        return None
+
+    def write(self, chunk: bytes) -> None:
+        # Chunks are written as they arrive so a dropped connection keeps them
+        self.file.write(chunk)
+        self.transferred += len(chunk)
+
+    def close(self) -> None:
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def finish(self) -> Dict[str, Any]:
+        """Check the part file and move it into place with its validators."""
+        size = self.part.stat().st_size
+        if size < self.min_bytes:
+            self.part.unlink()
+            self.part_meta.unlink(missing_ok=True)
+            raise ValueError(f"Download too small: {size} < {self.min_bytes} bytes")
+
+        validators = _read_json(self.part_meta)
+        os.replace(self.part, self.out)
+        # Record validators only after the file is in place, so a crash in
+        # between causes a re-download rather than a skip
+        _write_json(_meta_path(self.out), {**validators, "url": self.url, "size": size})
+        self.part_meta.unlink(missing_ok=True)
+        return {
+            "status": "resumed" if self.resumed else "downloaded",
+            "bytes": self.transferred,
+            "size": size,
+        }
+
+
+def download(
+    url: str,
+    out: str,
+    client: Optional[httpx.Client] = None,
+    headers: Optional[Dict[str, str]] = None,
+    force: bool = False,
+    retries: int = 3,
+    min_bytes: int = 0,
+    backoff: float = 0.5,
+) -> Dict[str, Any]:
+    """
+    Stream a URL to disk, skipping unchanged sources and resuming partial ones.
+
+    The response is written in chunks to `<out>.part` and renamed over `out`
+    only once complete, so readers never see a half-written file. The ETag
+    and Last-Modified of the saved file are kept in `<out>.meta.json` and
+    sent back as If-None-Match / If-Modified-Since on the next run; a 304
+    leaves the file untouched. If the connection drops, the download resumes
+    from the end of the part file with a Range request guarded by If-Range,
+    both within this call (up to `retries` times) and on a later run.
+
+    Args:
+        url: URL to download
+        out: Output file path
+        client: httpx client to use (one with a 60s timeout is created if None)
+        headers: Extra request headers (e.g. User-Agent)
+        force: Ignore saved validators and download even if unchanged
+        retries: Retries after a dropped connection or a 429/5xx response
+        min_bytes: Reject downloads smaller than this (error pages, truncation)
+        backoff: Seconds before the first retry, doubled for each further one
+
+    Returns:
+        Dict[str, Any]: {"status": "downloaded" | "resumed" | "not_modified",
+        "bytes": bytes transferred by this call, "size": size of `out`}
+
+    Raises:
+        httpx.HTTPStatusError: On an error response
+        httpx.TransportError: If the connection keeps failing after `retries`
+        ValueError: If the result is smaller than `min_bytes`
+    """
+    if client is None:
+        with httpx.Client(timeout=60, follow_redirects=True) as own:
+            return download(url, out, own, headers, force, retries, min_bytes, backoff)
+
+    t = _Transfer(url, out, headers, force, min_bytes)
+    attempt = 0
+    while True:
+        try:
+            with client.stream("GET", url, headers=t.request_headers()) as r:
+                done = t.start(r)
+                if done is not None:
+                    return done
+                for chunk in r.iter_raw():
+                    t.write(chunk)
+            break
+        except _Restart:
+            continue
+        except (httpx.TransportError, httpx.HTTPStatusError) as e:
+            attempt += 1
+            if attempt > retries or not _retryable(e):
+                raise
+            log.warning(f"Download of {url} failed ({e}); retry {attempt}/{retries}")
+            time.sleep(backoff * 2 ** (attempt - 1))
+        finally:
+            t.close()
+    return t.finish()
+
+
+async def download_async(
+    url: str,
+    out: str,
+    client: httpx.AsyncClient,
+    headers: Optional[Dict[str, str]] = None,
+    force: bool = False,
+    retries: int = 3,
+    min_bytes: int = 0,
+    backoff: float = 0.5,
+) -> Dict[str, Any]:
+    """
+    Async counterpart of `download`, for use with a shared AsyncClient.
+
+    Same arguments, caching, resume and retry behaviour as `download`.
+    """
+    t = _Transfer(url, out, headers, force, min_bytes)
+    attempt = 0
+    while True:
+        try:
+            async with client.stream("GET", url, headers=t.request_headers()) as r:
+                done = t.start(r)
+                if done is not None:
+                    return done
+                async for chunk in r.aiter_raw():
+                    t.write(chunk)
+            break
+        except _Restart:
+            continue
+        except (httpx.TransportError, httpx.HTTPStatusError) as e:
+            attempt += 1
+            if attempt > retries or not _retryable(e):
+                raise
+            log.warning(f"Download of {url} failed ({e}); retry {attempt}/{retries}")
+            await asyncio.sleep(backoff * 2 ** (attempt - 1))
+        finally:
+            t.close()
+    return t.finish()
+
+
+def load_manifest(path: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Read a TOML source manifest.
+
+    Each `[sources.<id>]` table needs a `url`; `format` (file extension,
+    default "csv"), `out` (default data/raw/<id>.<format>), `size` (expected
+    bytes) and `sha256` are optional. `size` and `sha256` are verified after
+    every run, so only set them for pinned snapshots.
+
+    Example:
+        [sources.dfat]
+        url = "https://www.dfat.gov.au/.../Australian_Sanctions_Consolidated_List.xlsx"
+        format = "xlsx"
+
+    Args:
+        path: Manifest file
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Source id -> settings, with `out` filled in
+
+    Raises:
+        ValueError: If the manifest has no sources or a source has no url
+    """
+    import tomllib
+
+    with open(path, "rb") as f:
+        data = tomllib.load(f)
+
+    sources = data.get("sources") or {}
+    if not sources:
+        raise ValueError(f"No [sources.<id>] tables in {path}")
+    for source_id, source in sources.items():
+        if not source.get("url"):
+            raise ValueError(f"Source {source_id!r} has no url")
+        source.setdefault("format", "csv")
+        source.setdefault("out", f"data/raw/{source_id}.{source['format']}")
+    return sources
+
+
+def _verify(source: Dict[str, Any]) -> None:
+    """Check a downloaded file against the manifest's size and sha256."""
+    p = Path(source["out"])
+    size = p.stat().st_size
+    if source.get("size") is not None and size != source["size"]:
+        raise ValueError(f"{p}: expected {source['size']} bytes, got {size}")
+    if source.get("sha256"):
+        h = hashlib.sha256()
+        with p.open("rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                h.update(chunk)
+        if h.hexdigest() != source["sha256"].lower():
+            raise ValueError(f"{p}: sha256 mismatch ({h.hexdigest()})")
+
+
+async def extract_all(
+    sources: Dict[str, Dict[str, Any]],
+    per_host: int = 2,
+    max_connections: int = 10,
+    force: bool = False,
+    retries: int = 3,
+    backoff: float = 0.5,
+    headers: Optional[Dict[str, str]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Download every manifest source concurrently over one pooled AsyncClient.
+
+    At most `per_host` downloads run against the same host at once. A failed
+    source doesn't stop the others; its result carries the error instead.
+
+    Args:
+        sources: Output of `load_manifest`
+        per_host: Concurrent downloads per host
+        max_connections: Connection pool size across all hosts
+        force: Download even if unchanged
+        retries: Retries per source (dropped connections, 429/5xx)
+        backoff: Seconds before the first retry, doubled for each further one
+        headers: Extra request headers (e.g. User-Agent)
+
+    Returns:
+        List[Dict[str, Any]]: One result per source, in manifest order, with
+        "id", "out", "seconds" and either the `download` result or "error"
+    """
+    hosts: Dict[str, asyncio.Semaphore] = {}
+
+    async def fetch(client: httpx.AsyncClient, source_id: str, source: Dict) -> Dict:
+        host = urlsplit(source["url"]).netloc
+        limit = hosts.setdefault(host, asyncio.Semaphore(per_host))
+        result: Dict[str, Any] = {"id": source_id, "out": source["out"]}
+        async with limit:
+            t0 = time.perf_counter()
+            try:
+                result.update(
+                    await download_async(
+                        source["url"],
+                        source["out"],
+                        client,
+                        headers=headers,
+                        force=force,
+                        retries=retries,
+                        min_bytes=source.get("min_bytes", 0),
+                        backoff=backoff,
+                    )
+                )
+                await asyncio.to_thread(_verify, source)
+            except Exception as e:
+                log.error(f"{source_id}: {e}")
+                result["status"] = "failed"
+                result["error"] = str(e)
+            result["seconds"] = round(time.perf_counter() - t0, 3)
+        return result
+
+    limits = httpx.Limits(max_connections=max_connections)
+    async with httpx.AsyncClient(
+        timeout=60, limits=limits, follow_redirects=True
+    ) as client:
+        return await asyncio.gather(
+            *(fetch(client, sid, src) for sid, src in sources.items())
+        )
@@ -0,0 +1,457 @@
+from pathlib import Path
+from array import array
+import hashlib
+import heapq
+import json
+import pickle
+import sys
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, NamedTuple
+from typing import Optional, Sequence, Tuple, Union
+
+from .normalize import birth_year, country_code, normalize_name
+from .store import EntityStore, is_store
+from .writers import is_parquet, iter_parquet
+
+__all__ = [
+    "NameIndex",
+    "Filter",
+    "PackedStrings",
+    "build_index",
+    "load_index",
+    "file_digest",
+]
+
+# Bump whenever the pickled layout or key normalization changes
+INDEX_VERSION = 6
+
+# Length of the n-grams kept in the index; shorter queries scan every entity
+MAX_GRAM = 3
+
+# Attribute filters remembered per index (cleared when full)
+FILTER_CACHE_SIZE = 64
+
+# Entity fields read when building an index from a Parquet file
+INDEX_COLUMNS = ("id", "schema", "name", "name_key", "aliases", "birth_date", "country")
+
+
+def file_digest(path: str) -> str:
+    """
+    Compute a SHA-256 hex digest of a file, reading it in blocks.
+
+    Args:
+        path: Path to the file
+
+    Returns:
+        str: Hex digest of the file content
+    """
+    h = hashlib.sha256()
+    with Path(path).open("rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _grams(key: str) -> set:
+    """Return every distinct MAX_GRAM-character n-gram of a key."""
+    return {key[i : i + MAX_GRAM] for i in range(len(key) - MAX_GRAM + 1)}
+
+
+def _iter_jsonl(path: str) -> Iterable[Dict[str, Any]]:
+    """Yield one dict per non-empty line of a JSONL file."""
+    with Path(path).open("r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            yield json.loads(line)
+
+
+def _iter_entities(path: str) -> Iterable[Dict[str, Any]]:
+    """Yield the entities of a JSONL, Parquet or entity store file."""
+    if is_store(path):
+        return EntityStore.open(path).iter_entities()
+    if is_parquet(path):
+        return iter_parquet(path)
+    return _iter_jsonl(path)
+
+
+class PackedStrings(Sequence):
+    """
+    Append-only sequence of strings kept as one UTF-8 buffer plus offsets.
+
+    Costs the encoded bytes plus 8 bytes per value, instead of a ~50-byte str
+    object each; values are decoded on access, like a store column.
+    """
+
+    def __init__(self, values: Iterable[str] = ()) -> None:
+        self.data = bytearray()
+        self.offsets = array("Q", [0])
+        for value in values:
+            self.append(value)
+
+    def append(self, value: str) -> None:
+        self.data += value.encode("utf-8")
+        self.offsets.append(len(self.data))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        return self.data[self.offsets[i] : self.offsets[i + 1]].decode("utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        data, offsets = self.data, self.offsets
+        for i in range(len(offsets) - 1):
+            yield data[offsets[i] : offsets[i + 1]].decode("utf-8")
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, PackedStrings):
+            return self.offsets == other.offsets and self.data == other.data
+        if isinstance(other, Sequence) and not isinstance(other, str):
+            return list(self) == list(other)
+        return NotImplemented
+
+
+class Filter(NamedTuple):
+    """Names whose entity attributes are compatible with a query's."""
+
+    # The query's (schema, birth year, country), "" and 0 where not given
+    spec: Tuple[str, int, str]
+    # Compatible (schema, birth year, country) groups
+    groups: FrozenSet[int]
+    # Ordinals of every name in those groups, ascending
+    ordinals: array
+
+
+class NameIndex:
+    """
+    Inverted index over normalized entity names.
+
+    Every name is indexed by its character n-grams of length MAX_GRAM and by
+    its whitespace tokens. A substring query can only match names that contain
+    all of its n-grams, so looking up the rarest posting list and verifying
+    those candidates gives exactly the same result as scanning every entity.
+    Queries shorter than MAX_GRAM (which match most names anyway) are checked
+    against every entity; 1- and 2-gram lists would filter almost nothing and
+    held more than half of the postings.
+
+    Posting lists hold uint32 ordinals; a token seen once is stored as a bare
+    int (most tokens are rare surnames) and becomes an array on its second use.
+
+    Entities with an empty name are dropped; the remaining ones keep their
+    file order, so ordinals are comparable with the original scan order. An
+    entity's aliases are indexed as extra names right after its own, with the
+    same id and schema, so an ordinal identifies a name rather than an entity.
+
+    Each name also belongs to the compound group of its entity's schema, birth
+    year and ISO country code (0 and "" when unknown or unresolved), and the
+    ordinals of every group
+    are kept, so `filter` narrows candidates by attributes without looking at
+    any name.
+    """
+
+    def __init__(self) -> None:
+        # StoreColumn sequences instead when built from an entity store.
+        # Ids and names are only read for output rows, so they are packed;
+        # keys are compared for every candidate and stay plain strings.
+        self.ids: Sequence[str] = PackedStrings()
+        self.names: Sequence[str] = PackedStrings()
+        # Few distinct values: interned strings are shared, not packed
+        self.schemas: Sequence[str] = []
+        self.keys: Sequence[str] = []
+        self.grams: Dict[str, array] = {}
+        self.tokens: Dict[str, Union[int, array]] = {}
+        # Compound group of every name, and each group's key and names
+        self.groups = array("I")
+        self.group_keys: List[Tuple[str, int, str]] = []
+        self.group_ids: Dict[Tuple[str, int, str], int] = {}
+        self.group_ordinals: List[array] = []
+        self.entities = 0
+        self.source_digest: Optional[str] = None
+        self._filters: Dict[Tuple[str, int, str], Filter] = {}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def add(self, entity: Dict[str, Any]) -> None:
+        """Append one entity and its aliases (ordinals follow insertion order)."""
+        # Keys precomputed at transform time are used as-is
+        key = entity.get("name_key")
+        if key is None:
+            key = normalize_name(entity.get("name"))
+        if not key:
+            return
+
+        entity_id = str(entity.get("id") or "")
+        schema = sys.intern(entity.get("schema") or "")
+        group = self._group(
+            schema,
+            birth_year(entity.get("birth_date")),
+            country_code(entity.get("country")),
+        )
+        self.entities += 1
+        if self._filters:
+            self._filters.clear()
+        self._add_name(entity_id, entity.get("name") or "", schema, key, group)
+
+        seen = {key}
+        for alias in entity.get("aliases") or ():
+            alias_key = normalize_name(alias)
+            if alias_key and alias_key not in seen:
+                seen.add(alias_key)
+                self._add_name(entity_id, alias, schema, alias_key, group)
+
+    def _add_name(
+        self, entity_id: str, name: str, schema: str, key: str, group: int
+    ) -> None:
+        ordinal = len(self.keys)
+        self.ids.append(entity_id)
+        self.names.append(name)
+        self.schemas.append(schema)
+        self.keys.append(key)
+        self.groups.append(group)
+        self.group_ordinals[group].append(ordinal)
+        self._post(ordinal, key)
+
+    def _group(self, schema: str, year: int, country: str) -> int:
+        """Id of a (schema, birth year, country) group, created on first use."""
+        group_key = (schema, year, country)
+        group = self.group_ids.get(group_key)
+        if group is None:
+            group = self.group_ids[group_key] = len(self.group_keys)
+            self.group_keys.append(group_key)
+            self.group_ordinals.append(array("I"))
+        return group
+
+    def attributes(self, ordinal: int) -> Dict[str, str]:
+        """The indexed attributes of a name's entity, as entity fields."""
+        _, year, country = self.group_keys[self.groups[ordinal]]
+        return {"birth_date": str(year) if year else "", "country": country}
+
+    def _post(self, ordinal: int, key: str) -> None:
+        """Add one key's n-grams and tokens to the posting lists."""
+        for gram in _grams(key):
+            self.grams.setdefault(gram, array("I")).append(ordinal)
+        tokens = self.tokens
+        for token in set(key.split()):
+            posting = tokens.get(token)
+            if posting is None:
+                tokens[token] = ordinal
+            elif type(posting) is int:
+                tokens[token] = array("I", (posting, ordinal))
+            else:
+                posting.append(ordinal)
+
+    @classmethod
+    def from_store(cls, store: EntityStore) -> "NameIndex":
+        """
+        Build an index whose entity columns stay in a memory-mapped store.
+
+        Only the posting lists and groups are built in memory; ids, names,
+        schemas and keys are read from the store's pages (shared across
+        processes). Stores with aliases or unnamed entities are indexed in
+        memory instead, since their name ordinals don't line up with rows.
+        """
+        index = cls()
+        keys = store.column("key")
+        if store.header["columns"]["aliases"]["size"] or not all(keys):
+            for entity in store.iter_entities():
+                index.add(entity)
+            return index
+
+        index.ids = store.column("id")
+        index.names = store.column("name")
+        index.schemas = store.column("schema")
+        index.keys = keys
+        index.entities = len(keys)
+        attributes = zip(
+            keys, index.schemas, store.column("birth_date"), store.column("country")
+        )
+        for ordinal, (key, schema, birth_date, country) in enumerate(attributes):
+            group = index._group(
+                sys.intern(schema), birth_year(birth_date), country_code(country)
+            )
+            index.groups.append(group)
+            index.group_ordinals[group].append(ordinal)
+            index._post(ordinal, key)
+        return index
+
+    def filter(
+        self, schema: Optional[str] = None, year: int = 0, country: str = ""
+    ) -> Optional[Filter]:
+        """
+        Select the names whose entity attributes are compatible with a query's.
+
+        An attribute the query or the entity doesn't have never excludes it,
+        so listed people without a known birth date are still screened.
+
+        Args:
+            schema: Required entity schema
+            year: Birth year (0 for any)
+            country: ISO country code, from `country_code` (empty for any)
+
+        Returns:
+            Optional[Filter]: The compatible names, or None if the query has
+            no attributes to filter on
+        """
+        if not (schema or year or country):
+            return None
+        spec = (schema or "", year, country)
+        found = self._filters.get(spec)
+        if found is None:
+            groups = frozenset(
+                g
+                for g, (s, y, c) in enumerate(self.group_keys)
+                if (not schema or s == schema)
+                and (not year or not y or y == year)
+                and (not country or not c or c == country)
+            )
+            ordinals = array(
+                "I", heapq.merge(*(self.group_ordinals[g] for g in sorted(groups)))
+            )
+            if len(self._filters) >= FILTER_CACHE_SIZE:
+                self._filters.clear()
+            found = self._filters[spec] = Filter(spec, groups, ordinals)
+        return found
+
+    def candidates(self, query: str, where: Optional[Filter] = None) -> Sequence[int]:
+        """
+        Return the names every match of `query` (within `where`) must be among.
+
+        Args:
+            query: Normalized query string
+            where: Attribute filter from `filter` (None for every name)
+
+        Returns:
+            Sequence[int]: Ascending name ordinals (a superset of the true
+            matches); every ordinal for queries shorter than MAX_GRAM
+        """
+        posting = self._name_candidates(query)
+        if where is None or not posting:
+            return posting
+        # Whichever is smaller: the filter's names, or the posting list
+        # narrowed to the filter's groups
+        if len(where.ordinals) <= len(posting):
+            return where.ordinals
+        groups, allowed = self.groups, where.groups
+        return array("I", (o for o in posting if groups[o] in allowed))
+
+    def _name_candidates(self, query: str) -> Sequence[int]:
+        """The smallest posting list every match of `query` must be in."""
+        if not query:
+            return array("I")
+        if len(query) < MAX_GRAM:
+            return range(len(self))
+
+        postings = []
+        for gram in _grams(query):
+            posting = self.grams.get(gram)
+            if posting is None:
+                # Some n-gram appears in no name at all: nothing can match
+                return array("I")
+            postings.append(posting)
+
+        # Tokens strictly inside the query are bounded by whitespace on both
+        # sides, so they must also be whole tokens of any matching name
+        for token in query.split()[1:-1]:
+            posting = self.tokens.get(token)
+            if posting is None:
+                return array("I")
+            postings.append(array("I", (posting,)) if type(posting) is int else posting)
+
+        return min(postings, key=len)
+
+    def first_match(self, query: str, where: Optional[Filter] = None) -> Optional[int]:
+        """
+        Find the first name (in file order) that contains `query`.
+
+        Args:
+            query: Normalized query string
+            where: Attribute filter from `filter`
+
+        Returns:
+            Optional[int]: Ordinal of the matching name, or None
+        """
+        keys = self.keys
+        for ordinal in self.candidates(query, where):
+            if query in keys[ordinal]:
+                return ordinal
+        return None
+
+    def save(self, path: str) -> None:
+        """Write the index to disk."""
+        p = Path(path)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        state = {k: v for k, v in self.__dict__.items() if not k.startswith("_")}
+        state["version"] = INDEX_VERSION
+        with p.open("wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["NameIndex"]:
+        """Read an index from disk (None if written by another index version)."""
+        with Path(path).open("rb") as f:
+            state = pickle.load(f)
+        if state.pop("version", None) != INDEX_VERSION:
+            return None
+        index = cls()
+        index.__dict__.update(state)
+        return index
+
+
+def build_index(entities_jsonl: str) -> NameIndex:
+    """
+    Build a NameIndex from a simplified entities JSONL file, a Parquet file or
+    an entity store.
+
+    Args:
+        entities_jsonl: Path to the JSONL (or `--format parquet`/`store`) file
+            produced by `transform`
+
+    Returns:
+        NameIndex: Index over every entity with a non-empty name
+    """
+    if is_store(entities_jsonl):
+        index = NameIndex.from_store(EntityStore.open(entities_jsonl))
+    else:
+        if is_parquet(entities_jsonl):
+            entities = iter_parquet(entities_jsonl, INDEX_COLUMNS)
+        else:
+            entities = _iter_jsonl(entities_jsonl)
+        index = NameIndex()
+        for entity in entities:
+            index.add(entity)
+    index.source_digest = file_digest(entities_jsonl)
+    return index
+
+
+def load_index(entities_jsonl: str, index_path: Optional[str] = None) -> NameIndex:
+    """
+    Load a persisted index, rebuilding it when missing or stale.
+
+    The index file records a digest of the entities file it was built from;
+    if the entities file has changed since, the index is rebuilt and saved.
+
+    Args:
+        entities_jsonl: Path to the entities JSONL file
+        index_path: Where the index is persisted (None keeps it in memory only)
+
+    Returns:
+        NameIndex: Index matching the current content of `entities_jsonl`
+    """
+    if index_path is None:
+        return build_index(entities_jsonl)
+
+    p = Path(index_path)
+    if p.exists():
+        index = NameIndex.load(index_path)
+        if index is not None and index.source_digest == file_digest(entities_jsonl):
+            return index
+
+    index = build_index(entities_jsonl)
+    index.save(index_path)
+    return index
@@ -0,0 +1,267 @@
+from math import ceil
+import heapq
+from typing import Dict, List, Optional, Tuple
+
+from .index import Filter, NameIndex
+from .normalize import sort_tokens
+
+# numpy (installed with pandas; used for vectorized scoring) is imported by
+# the first FuzzyMatcher, so substring screening starts without it
+np = None
+
+__all__ = ["SubstringMatcher", "FuzzyMatcher", "make_matcher", "MATCH_METHODS"]
+
+MATCH_METHODS = ("substring", "fuzzy")
+
+# Minimum Dice similarity for a fuzzy hit unless the caller passes --threshold
+DEFAULT_THRESHOLD = 0.8
+
+
+def _trigrams(key: str) -> set:
+    """
+    Distinct character trigrams of a key, padded so word edges count.
+
+    Tokens are sorted first, so "qaida al" and "al qaida" score as equal.
+    """
+    padded = " " + sort_tokens(key) + " "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class SubstringMatcher:
+    """
+    Case-insensitive substring matching on top of the n-gram index.
+
+    The score of a hit is the share of the entity name covered by the query,
+    so "acme" scores 1.0 against "ACME" and 0.44 against "ACME Corp".
+
+    `queries` and `candidates` count lookups and the entity names compared
+    for them, for instrumentation.
+    """
+
+    def __init__(self, index: NameIndex, threshold: Optional[float] = None) -> None:
+        self.index = index
+        self.threshold = threshold or 0.0
+        self.queries = 0
+        self.candidates = 0
+
+    def best(
+        self, query: str, where: Optional[Filter] = None
+    ) -> Optional[Tuple[int, float]]:
+        """
+        Return the first entity (in file order) containing the query.
+
+        Args:
+            query: Normalized query string
+            where: Attribute filter applied before any name is compared
+
+        Returns:
+            Optional[Tuple[int, float]]: (entity ordinal, score) or None
+        """
+        keys = self.index.keys
+        self.queries += 1
+        examined = 0
+        for examined, ordinal in enumerate(self.index.candidates(query, where), 1):
+            key = keys[ordinal]
+            if query in key:
+                score = len(query) / len(key)
+                if score >= self.threshold:
+                    self.candidates += examined
+                    return ordinal, score
+        self.candidates += examined
+        return None
+
+    def top(
+        self, query: str, k: int, where: Optional[Filter] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Return the k best-covering entities containing the query.
+
+        Candidates stream through a heap of at most k entries, so memory stays
+        flat however many names contain the query.
+
+        Args:
+            query: Normalized query string
+            k: Maximum number of matches
+            where: Attribute filter applied before any name is compared
+
+        Returns:
+            List[Tuple[int, float]]: (ordinal, score) pairs, best first; ties
+            are broken by file order
+        """
+        keys = self.index.keys
+        heap: List[Tuple[float, int]] = []
+        self.queries += 1
+        examined = 0
+        for examined, ordinal in enumerate(self.index.candidates(query, where), 1):
+            key = keys[ordinal]
+            if query not in key:
+                continue
+            score = len(query) / len(key)
+            if score < self.threshold:
+                continue
+            item = (score, -ordinal)
+            if len(heap) < k:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+        self.candidates += examined
+        return [(-o, s) for s, o in sorted(heap, reverse=True)]
+
+
+class FuzzyMatcher:
+    """
+    Typo-tolerant matching with trigram blocking and vectorized Dice scoring.
+
+    Names are indexed by padded character trigrams. For a query with `m`
+    trigrams and threshold `t`, any name scoring at least `t` must share
+    ceil(t*m / (2-t)) trigrams with it, so candidates are drawn only from the
+    rarest posting lists (prefix filtering). Shared-trigram counts for those
+    candidates are then computed for all query trigrams at once with NumPy,
+    and scored as 2*shared / (m + trigrams in name).
+
+    `queries` and `candidates` count lookups and the names scored for them.
+    """
+
+    def __init__(self, index: NameIndex, threshold: Optional[float] = None) -> None:
+        global np
+        if np is None:
+            try:
+                import numpy as np
+            except ImportError:
+                raise RuntimeError(
+                    "numpy required for fuzzy matching. Run: uv add numpy"
+                )
+
+        self.index = index
+        self.threshold = DEFAULT_THRESHOLD if threshold is None else threshold
+        _check_threshold(self.threshold)
+        self.queries = 0
+        self.candidates = 0
+
+        postings: Dict[str, List[int]] = {}
+        sizes = []
+        for ordinal, key in enumerate(index.keys):
+            grams = _trigrams(key)
+            sizes.append(len(grams))
+            for gram in grams:
+                postings.setdefault(gram, []).append(ordinal)
+
+        self.postings = {g: np.array(p, dtype=np.int32) for g, p in postings.items()}
+        self.gram_counts = np.array(sizes, dtype=np.int32)
+        self.groups = np.array(index.groups, dtype=np.int32)
+
+    def scores(
+        self, query: str, where: Optional[Filter] = None
+    ) -> Tuple["np.ndarray", "np.ndarray"]:
+        """
+        Score every candidate that can reach the threshold.
+
+        Args:
+            query: Normalized query string
+            where: Attribute filter applied before any candidate is scored
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Ascending entity ordinals and their
+            scores, restricted to scores >= threshold
+        """
+        empty = (np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float64))
+        self.queries += 1
+        grams = _trigrams(query)
+        postings = sorted(
+            (self.postings[g] for g in grams if g in self.postings), key=len
+        )
+        if not postings:
+            return empty
+
+        size = len(grams)
+        t = self.threshold
+        need = max(1, ceil(t * size / (2 - t) - 1e-9))
+        if need > len(postings):
+            return empty
+
+        # Block: only names in the rarest (present - need + 1) lists can qualify
+        cands = np.unique(np.concatenate(postings[: len(postings) - need + 1]))
+        if where is not None:
+            allowed = np.fromiter(where.groups, dtype=np.int32, count=len(where.groups))
+            cands = cands[np.isin(self.groups[cands], allowed)]
+        self.candidates += len(cands)
+
+        # Count shared trigrams per candidate across every query trigram
+        shared = np.zeros(len(cands), dtype=np.int32)
+        for posting in postings:
+            pos = np.searchsorted(posting, cands)
+            pos[pos == len(posting)] = 0
+            shared += posting[pos] == cands
+
+        scores = 2.0 * shared / (size + self.gram_counts[cands])
+        keep = scores >= t
+        return cands[keep], scores[keep]
+
+    def best(
+        self, query: str, where: Optional[Filter] = None
+    ) -> Optional[Tuple[int, float]]:
+        """
+        Return the highest scoring entity (earliest in file order on ties).
+
+        Args:
+            query: Normalized query string
+            where: Attribute filter applied before any candidate is scored
+
+        Returns:
+            Optional[Tuple[int, float]]: (entity ordinal, score) or None
+        """
+        cands, scores = self.scores(query, where)
+        if not len(cands):
+            return None
+        i = int(np.argmax(scores))
+        return int(cands[i]), float(scores[i])
+
+    def top(
+        self, query: str, k: int, where: Optional[Filter] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Return the k highest scoring entities.
+
+        Args:
+            query: Normalized query string
+            k: Maximum number of matches
+            where: Attribute filter applied before any candidate is scored
+
+        Returns:
+            List[Tuple[int, float]]: (ordinal, score) pairs, best first; ties
+            are broken by file order
+        """
+        cands, scores = self.scores(query, where)
+        best = heapq.nlargest(k, zip(scores.tolist(), (-cands).tolist()))
+        return [(-o, s) for s, o in best]
+
+
+def _check_threshold(threshold: Optional[float]) -> None:
+    """Scores are in [0, 1]; any other threshold is a mistake."""
+    if threshold is not None and not 0 <= threshold <= 1:
+        raise ValueError(f"Threshold must be between 0 and 1, got {threshold}")
+
+
+def make_matcher(
+    index: NameIndex, method: str = "substring", threshold: Optional[float] = None
+):
+    """
+    Create the matcher for a screening method.
+
+    Args:
+        index: Name index to match against
+        method: One of MATCH_METHODS
+        threshold: Minimum score for a hit (method default if None)
+
+    Returns:
+        SubstringMatcher or FuzzyMatcher
+
+    Raises:
+        ValueError: If the method is unknown or the threshold is outside [0, 1]
+    """
+    _check_threshold(threshold)
+    if method == "substring":
+        return SubstringMatcher(index, threshold)
+    if method == "fuzzy":
+        return FuzzyMatcher(index, threshold)
+    raise ValueError(f"Unknown match method: {method} (use {', '.join(MATCH_METHODS)})")
@@ -0,0 +1,223 @@
+from pathlib import Path
+import hashlib
+import heapq
+import json
+import shutil
+import tempfile
+import zlib
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .normalize import normalize_name
+
+__all__ = ["merge_entities", "merged_id", "parse_source"]
+
+# Partition files written by the grouping pass; each is grouped in memory on
+# its own, so peak memory is roughly (total entities / PARTITIONS) groups
+PARTITIONS = 64
+
+
+def parse_source(spec: str) -> Tuple[str, str]:
+    """
+    Split a "label=path" input spec; a bare path is labelled by its file stem.
+
+    Returns:
+        Tuple[str, str]: (label, path)
+    """
+    label, sep, path = spec.partition("=")
+    if sep and label and not Path(spec).exists():
+        return label, path
+    return Path(spec).stem, spec
+
+
+def _entity_name(entity: Dict[str, Any]) -> str:
+    """Name of a simple entity, or the first name of a FollowTheMoney one."""
+    name = entity.get("name")
+    if not name:
+        names = (entity.get("properties") or {}).get("name") or [""]
+        name = names[0]
+    return name or ""
+
+
+def _entity_notes(entity: Dict[str, Any]) -> str:
+    """Notes of a simple entity, or the joined notes of a FollowTheMoney one."""
+    notes = entity.get("notes")
+    if not notes:
+        notes = "; ".join((entity.get("properties") or {}).get("notes") or [])
+    return notes or ""
+
+
+def _entity_attributes(entity: Dict[str, Any]) -> Tuple[List[str], str, str]:
+    """Aliases, birth date and country of a simple or FollowTheMoney entity."""
+    props = entity.get("properties") or {}
+    aliases = entity.get("aliases") or props.get("alias") or []
+    birth_date = entity.get("birth_date") or (props.get("birthDate") or [""])[0]
+    country = (
+        entity.get("country")
+        or (props.get("country") or props.get("nationality") or [""])[0]
+    )
+    return list(aliases), birth_date or "", country or ""
+
+
+def merged_id(schema: str, name_key: str) -> str:
+    """Stable id for a merged entity, derived from what it was grouped by."""
+    digest = hashlib.sha1(f"{schema}\x1f{name_key}".encode("utf-8")).hexdigest()
+    return f"ent-{digest[:16]}"
+
+
+def _iter_input(
+    source_no: int, label: str, path: str
+) -> Iterator[Tuple[Tuple[int, int], str, str, Dict]]:
+    """Yield ((source_no, line_no), name_key, schema, entity) for one input file."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f):
+            line = line.strip()
+            if not line:
+                continue
+            entity = json.loads(line)
+            name = _entity_name(entity)
+            key = entity.get("name_key")
+            if key is None:
+                key = normalize_name(name)
+            schema = entity.get("schema") or ""
+            aliases, birth_date, country = _entity_attributes(entity)
+            record = {
+                "id": entity.get("id"),
+                "name": name,
+                "notes": _entity_notes(entity),
+                "aliases": aliases,
+                "birth_date": birth_date,
+                "country": country,
+                "source": label,
+            }
+            yield (source_no, line_no), key, schema, record
+
+
+def _group_partition(path: Path) -> List[Tuple[Tuple[int, int], Dict]]:
+    """Group one partition's records by (schema, name_key) into merged entities."""
+    groups: Dict[Tuple[str, str], Dict] = {}
+    first: Dict[Tuple[str, str], Tuple[int, int]] = {}
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            pos, key, schema, record = json.loads(line)
+            group_key = (schema, key)
+            merged = groups.get(group_key)
+            if merged is None:
+                merged = groups[group_key] = {
+                    "schema": schema,
+                    "id": merged_id(schema, key),
+                    "name": record["name"],
+                    "name_key": key,
+                    "notes": [],
+                    "aliases": [],
+                    "birth_date": record["birth_date"],
+                    "country": record["country"],
+                    "sources": [],
+                }
+                first[group_key] = tuple(pos)
+            if record["notes"] and record["notes"] not in merged["notes"]:
+                merged["notes"].append(record["notes"])
+            for alias in record["aliases"]:
+                if alias != merged["name"] and alias not in merged["aliases"]:
+                    merged["aliases"].append(alias)
+            # Kept only if every member agrees; a blank disagrees too, since
+            # the attribute filter would otherwise drop that member's matches
+            for attr in ("birth_date", "country"):
+                if record[attr] != merged[attr]:
+                    merged[attr] = ""
+            merged["sources"].append({"source": record["source"], "id": record["id"]})
+
+    out = []
+    for group_key, merged in groups.items():
+        notes = merged.pop("notes")
+        if notes:
+            merged["notes"] = "; ".join(notes)
+        attributes = {
+            attr: merged.pop(attr) for attr in ("aliases", "birth_date", "country")
+        }
+        merged.update({attr: v for attr, v in attributes.items() if v})
+        merged["sources"] = merged.pop("sources")
+        out.append((first[group_key], merged))
+    out.sort(key=lambda item: item[0])
+    return out
+
+
+def merge_entities(
+    inputs: List[str],
+    output: str,
+    partitions: int = PARTITIONS,
+    tmp_dir: Optional[str] = None,
+) -> Dict[str, int]:
+    """
+    Merge transformed JSONL files into one deduplicated entity set.
+
+    Entities are grouped by (schema, normalized name). Every group becomes one
+    entity with a stable `ent-<hash>` id, the name and schema of its first
+    occurrence, the distinct notes and aliases of all members, the birth date
+    and country if every member has the same one, and a `sources` list of
+    {"source", "id"} pairs recording where each member came from.
+
+    Grouping is hash-partitioned: a first pass streams every input into one of
+    `partitions` temporary files by a hash of the group key, then each file is
+    grouped in memory on its own. The grouped partitions are each sorted by
+    first occurrence and k-way merged, so the output keeps input order (first
+    file first) without holding more than one partition in memory.
+
+    Args:
+        inputs: Simple or FollowTheMoney JSONL files, as "label=path" or a
+            bare path (labelled by file stem)
+        output: Merged simple JSONL output
+        partitions: Number of hash partitions
+        tmp_dir: Directory for partition files (defaults to the output's)
+
+    Returns:
+        Dict[str, int]: Counts of "input" entities, "output" entities,
+        "duplicates" merged away and "skipped" (no name) entities
+    """
+    pout = Path(output)
+    pout.parent.mkdir(parents=True, exist_ok=True)
+    counts = {"input": 0, "output": 0, "duplicates": 0, "skipped": 0}
+
+    with tempfile.TemporaryDirectory(dir=tmp_dir or pout.parent) as tmp:
+        parts = [Path(tmp) / f"part{i}.jsonl" for i in range(partitions)]
+        handles = [p.open("w", encoding="utf-8") for p in parts]
+        try:
+            for source_no, spec in enumerate(inputs):
+                label, path = parse_source(spec)
+                for pos, key, schema, record in _iter_input(source_no, label, path):
+                    counts["input"] += 1
+                    if not key:
+                        counts["skipped"] += 1
+                        continue
+                    bucket = zlib.crc32(f"{schema}\x1f{key}".encode("utf-8"))
+                    handles[bucket % partitions].write(
+                        json.dumps([pos, key, schema, record]) + "\n"
+                    )
+        finally:
+            for h in handles:
+                h.close()
+
+        # Group each partition into its own sorted run, then merge the runs
+        runs = []
+        for i, part in enumerate(parts):
+            run = Path(tmp) / f"run{i}.jsonl"
+            with run.open("w", encoding="utf-8") as f:
+                for pos, merged in _group_partition(part):
+                    f.write(json.dumps([pos, merged]) + "\n")
+            part.unlink()
+            runs.append(run)
+
+        tmp_out = Path(tmp) / "merged.jsonl"
+        files = [r.open("r", encoding="utf-8") for r in runs]
+        try:
+            streams = [map(json.loads, f) for f in files]
+            with tmp_out.open("w", encoding="utf-8") as fout:
+                for _, merged in heapq.merge(*streams, key=lambda item: item[0]):
+                    fout.write(json.dumps(merged) + "\n")
+                    counts["output"] += 1
+        finally:
+            for f in files:
+                f.close()
+        shutil.move(str(tmp_out), pout)
+
+    counts["duplicates"] = counts["input"] - counts["skipped"] - counts["output"]
+    return counts
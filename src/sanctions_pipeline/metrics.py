@@ -0,0 +1,236 @@
+from pathlib import Path
+from contextlib import contextmanager
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import resource  # not available on Windows
+except ImportError:
+    resource = None
+
+__all__ = ["Metrics", "Stage", "enable", "disable", "current", "stage", "count"]
+
+# Prefix of every exported Prometheus metric
+PROM_PREFIX = "sanctions_pipeline"
+
+# Process-wide recorder; None (the default) means instrumentation is off
+_CURRENT: Optional["Metrics"] = None
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """
+    Peak resident set size of this process and its finished children.
+
+    This is a high-water mark for the whole process, not just one stage.
+    """
+    if resource is None:
+        return None
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _size(path: Optional[str]) -> int:
+    try:
+        return os.path.getsize(path) if path else 0
+    except OSError:
+        return 0
+
+
+class Stage:
+    """Measurements for one run of a pipeline stage."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.seconds = 0.0
+        self.rows: Optional[int] = None
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.peak_rss_bytes: Optional[int] = None
+        self.counters: Dict[str, float] = {}
+
+    def read(self, path: Optional[str]) -> None:
+        """Count a file consumed by the stage."""
+        self.bytes_read += _size(path)
+
+    def wrote(self, path: Optional[str]) -> None:
+        """Count a file produced by the stage."""
+        self.bytes_written += _size(path)
+
+    def count(self, counters: Dict[str, float]) -> None:
+        """Add to the stage's named counters (e.g. candidates examined)."""
+        for key, value in counters.items():
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def to_dict(self) -> Dict[str, Any]:
+        per_query = None
+        if self.counters.get("queries"):
+            per_query = round(self.counters["candidates"] / self.counters["queries"], 3)
+        return {
+            "stage": self.name,
+            "seconds": round(self.seconds, 6),
+            "rows": self.rows,
+            "rows_per_second": (
+                round(self.rows / self.seconds, 1)
+                if self.rows is not None and self.seconds
+                else None
+            ),
+            "bytes_read": self.bytes_read,
+            "bytes_written": self.bytes_written,
+            "peak_rss_bytes": self.peak_rss_bytes,
+            "counters": dict(self.counters),
+            "candidates_per_query": per_query,
+        }
+
+
+class _NullStage(Stage):
+    """Stand-in used while metrics are off; all recording is dropped."""
+
+    def read(self, path: Optional[str]) -> None:
+        pass
+
+    def wrote(self, path: Optional[str]) -> None:
+        pass
+
+    def count(self, counters: Dict[str, float]) -> None:
+        pass
+
+
+class Metrics:
+    """
+    Collects per-stage timings and counters for one CLI invocation.
+
+    Args:
+        json_path: Where to write the JSON summary ("-" for stderr)
+        prom_path: Optional Prometheus textfile-collector output
+    """
+
+    def __init__(
+        self, json_path: Optional[str] = "-", prom_path: Optional[str] = None
+    ) -> None:
+        self.json_path = json_path
+        self.prom_path = prom_path
+        self.stages: List[Stage] = []
+        # Stages entered but not yet finished, innermost last
+        self.open: List[Stage] = []
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "stages": [s.to_dict() for s in self.stages],
+            "peak_rss_bytes": peak_rss_bytes(),
+        }
+
+    def prometheus(self) -> str:
+        """Render the stages in the Prometheus text exposition format."""
+        gauges = {
+            "seconds": "Wall time of the stage",
+            "rows": "Rows processed by the stage",
+            "rows_per_second": "Stage throughput",
+            "bytes_read": "Bytes read by the stage",
+            "bytes_written": "Bytes written by the stage",
+            "peak_rss_bytes": "Peak resident memory of the process",
+            "candidates_per_query": "Entity names compared per screened name",
+        }
+        lines = []
+        stages = [s.to_dict() for s in self.stages]
+        for field, help_text in gauges.items():
+            name = f"{PROM_PREFIX}_stage_{field}"
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+            for s in stages:
+                if s[field] is not None:
+                    lines.append(f'{name}{{stage="{s["stage"]}"}} {s[field]}')
+
+        counters = sorted({k for s in stages for k in s["counters"]})
+        for key in counters:
+            name = f"{PROM_PREFIX}_{_prom_name(key)}_total"
+            lines += [f"# HELP {name} {key}", f"# TYPE {name} counter"]
+            for s in stages:
+                if key in s["counters"]:
+                    lines.append(f'{name}{{stage="{s["stage"]}"}} {s["counters"][key]}')
+        return "\n".join(lines) + "\n"
+
+    def write(self) -> None:
+        """Write the JSON summary and, if configured, the Prometheus textfile."""
+        if self.json_path:
+            text = json.dumps(self.summary(), indent=2)
+            if self.json_path == "-":
+                print(text, file=sys.stderr)
+            else:
+                Path(self.json_path).parent.mkdir(parents=True, exist_ok=True)
+                Path(self.json_path).write_text(text + "\n", encoding="utf-8")
+        if self.prom_path:
+            # The textfile collector may read at any time: write then rename
+            p = Path(self.prom_path)
+            p.parent.mkdir(parents=True, exist_ok=True)
+            tmp = p.with_name(p.name + ".tmp")
+            tmp.write_text(self.prometheus(), encoding="utf-8")
+            os.replace(tmp, p)
+
+
+def _prom_name(key: str) -> str:
+    return "".join(c if c.isalnum() else "_" for c in key.lower())
+
+
+def enable(json_path: Optional[str] = "-", prom_path: Optional[str] = None) -> Metrics:
+    """Turn metrics on for this process and return the recorder."""
+    global _CURRENT
+    _CURRENT = Metrics(json_path, prom_path)
+    return _CURRENT
+
+
+def disable() -> None:
+    """Turn metrics off again (used by tests)."""
+    global _CURRENT
+    _CURRENT = None
+
+
+def current() -> Optional[Metrics]:
+    """The active recorder, or None when metrics are off."""
+    return _CURRENT
+
+
+@contextmanager
+def stage(name: str) -> Iterator[Stage]:
+    """
+    Time a pipeline stage.
+
+    When metrics are off this yields a stage that drops everything, so the
+    instrumented code costs next to nothing.
+
+    Example:
+        with metrics.stage("transform") as st:
+            st.rows = transform(...)
+            st.read(input); st.wrote(output)
+    """
+    recorder = _CURRENT
+    if recorder is None:
+        yield _NullStage(name)
+        return
+
+    st = Stage(name)
+    recorder.open.append(st)
+    t0 = time.perf_counter()
+    try:
+        yield st
+    finally:
+        st.seconds = time.perf_counter() - t0
+        st.peak_rss_bytes = peak_rss_bytes()
+        recorder.open.remove(st)
+        recorder.stages.append(st)
+
+
+def count(counters: Dict[str, float]) -> None:
+    """
+    Add counters to the innermost running stage (no-op when metrics are off).
+
+    Lets library code such as `screen_names` report what it did without the
+    caller threading a stage object through.
+    """
+    if _CURRENT is not None and _CURRENT.open:
+        _CURRENT.open[-1].count(counters)
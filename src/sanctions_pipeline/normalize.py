@@ -0,0 +1,121 @@
+from functools import lru_cache
+import re
+import unicodedata
+from typing import Dict, Optional
+
+# Transliterating normalizer (installed with followthemoney)
+try:
+    from normality import normalize as _normality_normalize
+except Exception:
+    # Fallback: Unicode folding without transliteration of non-Latin scripts
+    _normality_normalize = None
+
+__all__ = [
+    "normalize_name",
+    "normalize_query",
+    "sort_tokens",
+    "birth_year",
+    "country_code",
+    "query_cache_info",
+    "QUERY_CACHE_SIZE",
+]
+
+# Distinct query strings remembered by normalize_query
+QUERY_CACHE_SIZE = 200_000
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+# A plausible four-digit birth year anywhere in a date ("1964-01-01", "12 Jan 1964")
+_YEAR = re.compile(r"(?<!\d)(1[89]\d\d|20\d\d)(?!\d)")
+
+
+def normalize_name(name: Optional[str]) -> str:
+    """
+    Fold a name to its matching key: ASCII, lowercase, punctuation as spaces.
+
+    "Al-Qaida", "AL QAIDA" and "Аль-Каида" become "al qaida", "al qaida" and
+    "al kaida"; accents are dropped and runs of whitespace collapsed. Token
+    order is kept, so substring matching still works on the key.
+
+    Args:
+        name: Raw name
+
+    Returns:
+        str: Normalized key ("" for empty or punctuation-only names)
+    """
+    if not name:
+        return ""
+    if _normality_normalize is not None:
+        return _normality_normalize(name, lowercase=True, ascii=True) or ""
+
+    text = unicodedata.normalize("NFKD", name)
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return " ".join(_NON_WORD.sub(" ", text.casefold()).split())
+
+
+@lru_cache(maxsize=QUERY_CACHE_SIZE)
+def normalize_query(name: str) -> str:
+    """
+    Memoized `normalize_name` for screening queries.
+
+    Customer files repeat the same names heavily, and transliteration costs
+    far more than a dict lookup, so queries go through a bounded LRU cache.
+    """
+    return normalize_name(name)
+
+
+def query_cache_info() -> Dict[str, float]:
+    """
+    Report the query cache's hits, misses and hit rate for this process.
+
+    Returns:
+        Dict[str, float]: {"hits", "misses", "size", "hit_rate"}
+    """
+    info = normalize_query.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "hit_rate": info.hits / lookups if lookups else 0.0,
+    }
+
+
+def sort_tokens(key: str) -> str:
+    """Order a key's tokens alphabetically (for word-order-insensitive scoring)."""
+    return " ".join(sorted(key.split()))
+
+
+def birth_year(value: Optional[str]) -> int:
+    """
+    Extract the year of a birth date written in any common format.
+
+    Args:
+        value: Date as found in a source or input file
+
+    Returns:
+        int: The first plausible year in the value, or 0 if there is none
+    """
+    m = _YEAR.search(value) if value else None
+    return int(m.group()) if m else 0
+
+
+@lru_cache(maxsize=4096)
+def country_code(value: Optional[str]) -> str:
+    """
+    Resolve a country name or code to its ISO 3166 code.
+
+    "Russia", "RU" and "Russian Federation" all give "ru". followthemoney's
+    country type (slow to import) is only loaded once a country is seen.
+
+    Args:
+        value: Country as found in a source or input file
+
+    Returns:
+        str: Lowercase ISO code, or "" if the value doesn't resolve
+    """
+    if not value:
+        return ""
+    from followthemoney.types import registry
+
+    return registry.country.clean(value) or ""
@@ -0,0 +1,258 @@
+from pathlib import Path
+import hashlib
+import json
+import os
+from typing import Any, Dict, Iterator, List, Optional
+
+from . import metrics
+from .index import NameIndex, file_digest, load_index
+from .match import make_matcher
+from .screen import Screener, _screen_file
+from .transform import _normalize_row, _row_iter, _simple_entity
+from .validate import RecordValidator
+from .writers import JsonlWriter
+
+__all__ = ["run_pipeline", "stage_key", "PIPELINE_VERSION"]
+
+# Bump whenever a stage's output changes for the same inputs and config
+PIPELINE_VERSION = 2
+
+STATE_FILE = "run.json"
+INDEX_FILE = "index.pkl"
+
+
+def stage_key(stage: str, inputs: Dict[str, str], config: Dict[str, Any]) -> str:
+    """
+    Content hash identifying one stage run.
+
+    Args:
+        stage: Stage name
+        inputs: Digest of every input file, by role
+        config: Every option that changes the stage's output
+
+    Returns:
+        str: SHA-256 hex digest of the stage, its inputs and its config
+    """
+    payload = json.dumps(
+        {
+            "stage": stage,
+            "version": PIPELINE_VERSION,
+            "inputs": inputs,
+            "config": config,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _read_state(path: Path) -> Dict[str, Any]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_state(path: Path, state: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(state, indent=2) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _cached(entry: Optional[Dict[str, Any]], key: str, outputs: List[str]) -> bool:
+    """True if a recorded stage run has this key and wrote these outputs, intact."""
+    if not entry or entry.get("key") != key:
+        return False
+    recorded = entry["outputs"]
+    for path in outputs:
+        digest = recorded.get(path)
+        if digest is None or not Path(path).exists() or file_digest(path) != digest:
+            return False
+    return True
+
+
+def _entities(input_path: str) -> Iterator[Dict[str, str]]:
+    """Yield the simple entity of every named input row, as `transform` does."""
+    for idx, row in enumerate(_row_iter(input_path)):
+        entity = _simple_entity(idx, _normalize_row(row))
+        if entity is not None:
+            yield entity
+
+
+def _build(
+    input_path: str,
+    entities_path: str,
+    check_fields: bool,
+    min_rows: int,
+) -> NameIndex:
+    """
+    Transform, validate and index the input in a single pass.
+
+    Each entity is checked and indexed as it is built, and its JSONL line is
+    written to a temporary file that replaces `entities_path` only if every
+    record is valid, so the entities file is never parsed again.
+
+    Raises:
+        AssertionError: If the entities fail validation
+    """
+    validator = RecordValidator(check_fields)
+    index = NameIndex()
+    out = Path(entities_path)
+    tmp = out.with_name(out.name + ".tmp")
+    try:
+        with JsonlWriter(str(tmp)) as writer:
+            for entity in _entities(input_path):
+                validator.check(entity)
+                index.add(entity)
+                writer.write(json.dumps(entity) + "\n")
+        validator.finish(min_rows, str(tmp))
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    os.replace(tmp, out)
+    return index
+
+
+def run_pipeline(
+    input_path: str,
+    entities_path: str,
+    screen_input: Optional[str] = None,
+    output_csv: Optional[str] = None,
+    cache_dir: str = "data/cache",
+    url: Optional[str] = None,
+    method: str = "substring",
+    threshold: Optional[float] = None,
+    top_k: Optional[int] = None,
+    output_mode: str = "rows",
+    check_fields: bool = True,
+    min_rows: int = 1,
+    workers: int = 1,
+    force: bool = False,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Run extract, transform, validate and screen in one process.
+
+    Entities stream from the input rows through normalization and validation
+    into the name index without an intermediate file being re-read; the
+    entities JSONL is identical to `transform`'s. Every stage is keyed by a
+    content hash of its input files and config, recorded in
+    `<cache_dir>/run.json` with digests of its outputs, and a stage whose key
+    and outputs are unchanged is skipped.
+
+    Args:
+        input_path: Raw CSV/XLSX list (the download target when `url` is set)
+        entities_path: Simple JSONL entities written by the build stage
+        screen_input: CSV of names to screen (None stops after the build)
+        output_csv: Screening output CSV (required with `screen_input`)
+        cache_dir: Directory for the stage state and the persisted index
+        url: Download the list from here first (skipped if unchanged upstream)
+        method: Match method, "substring" or "fuzzy"
+        threshold: Minimum match_score for a hit
+        top_k: Return the best k matches per row
+        output_mode: With top_k, "rows" or "json"
+        check_fields: Validate entity fields as well as the row count
+        min_rows: Minimum number of entities
+        workers: Processes to screen with (output is identical)
+        force: Run every stage even if its key is unchanged
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Per stage, its "status" ("ran" or "cached")
+        and counts
+
+    Raises:
+        AssertionError: If the entities fail validation
+        ValueError: If `screen_input` is given without `output_csv`
+    """
+    if screen_input is not None and output_csv is None:
+        raise ValueError("output_csv is required to screen")
+
+    state_path = Path(cache_dir) / STATE_FILE
+    index_path = str(Path(cache_dir) / INDEX_FILE)
+    state = {} if force else _read_state(state_path)
+    result: Dict[str, Dict[str, Any]] = {}
+
+    if url is not None:
+        from .extract import download
+
+        with metrics.stage("extract") as st:
+            got = download(url, input_path, force=force)
+            st.bytes_written += got["bytes"]
+            st.count({"bytes_downloaded": got["bytes"]})
+        result["extract"] = {"status": got["status"], "bytes": got["bytes"]}
+
+    with metrics.stage("build") as st:
+        st.read(input_path)
+        key = stage_key(
+            "build",
+            {"input": file_digest(input_path)},
+            {
+                "check_fields": check_fields,
+                "min_rows": min_rows,
+                "entities": entities_path,
+            },
+        )
+        index = None
+        if _cached(state.get("build"), key, [entities_path, index_path]):
+            status = "cached"
+            entities = state["build"]["entities"]
+            st.count({"cached": 1})
+        else:
+            status = "ran"
+            index = _build(input_path, entities_path, check_fields, min_rows)
+            index.source_digest = file_digest(entities_path)
+            index.save(index_path)
+            entities = index.entities
+            state["build"] = {
+                "key": key,
+                "outputs": {
+                    entities_path: index.source_digest,
+                    index_path: file_digest(index_path),
+                },
+                "entities": entities,
+            }
+            _write_state(state_path, state)
+            st.wrote(entities_path)
+        st.rows = entities
+    result["build"] = {"status": status, "entities": entities}
+
+    if screen_input is None:
+        return result
+
+    with metrics.stage("screen") as st:
+        st.read(screen_input)
+        key = stage_key(
+            "screen",
+            {
+                "entities": state["build"]["outputs"][entities_path],
+                "input": file_digest(screen_input),
+            },
+            {
+                "method": method,
+                "threshold": threshold,
+                "top_k": top_k,
+                "output_mode": output_mode,
+                "output": output_csv,
+            },
+        )
+        if _cached(state.get("screen"), key, [output_csv]):
+            status = "cached"
+            matched = state["screen"]["matched"]
+            st.count({"cached": 1})
+        else:
+            status = "ran"
+            if index is None:
+                index = load_index(entities_path, index_path)
+            screener = Screener(
+                make_matcher(index, method, threshold), top_k, output_mode
+            )
+            matched = _screen_file(screener, screen_input, output_csv, workers)
+            state["screen"] = {
+                "key": key,
+                "outputs": {output_csv: file_digest(output_csv)},
+                "matched": matched,
+            }
+            _write_state(state_path, state)
+            st.rows = st.counters.get("rows")
+            st.wrote(output_csv)
+    result["screen"] = {"status": status, "matched": matched}
+    return result
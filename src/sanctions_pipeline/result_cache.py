@@ -0,0 +1,198 @@
+from pathlib import Path
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .index import INDEX_VERSION
+
+__all__ = ["ResultCache", "config_digest", "MAX_ENTRIES"]
+
+# Bump whenever the table layout or the meaning of stored hits changes
+CACHE_VERSION = 2
+
+# Cached queries kept across runs; the least recently used go first
+MAX_ENTRIES = 5_000_000
+
+# New results and touched rows buffered before each write transaction
+FLUSH_ROWS = 10_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    source TEXT,
+    entities TEXT NOT NULL,
+    config TEXT NOT NULL,
+    query TEXT NOT NULL,
+    hits TEXT NOT NULL,
+    used INTEGER NOT NULL,
+    PRIMARY KEY (entities, config, query)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS results_used ON results (used);
+CREATE INDEX IF NOT EXISTS results_source ON results (source, entities);
+"""
+
+
+def config_digest(**config: Any) -> str:
+    """
+    Digest of the screening options that change results for the same query.
+
+    The index layout version is included, since stored hits are index ordinals.
+
+    Returns:
+        str: Short SHA-256 hex digest of the options
+    """
+    payload = json.dumps({"index": INDEX_VERSION, **config}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class ResultCache:
+    """
+    On-disk cache of screening results across runs, in SQLite (WAL mode).
+
+    Results are keyed by the entities file digest, a digest of the screening
+    options and the normalized query, and stored as the (ordinal, score) hits
+    the matcher returned; the index built from the same file has the same
+    ordinals. Several lists can share one cache file: rows are also tagged
+    with the list's `source`, and on open only rows of the same source with
+    another entities digest (an earlier version of this list) are deleted.
+    When the cache grows past `max_entries`, rows not used for the longest
+    are evicted on close, whichever list they belong to.
+
+    New results and last-used updates are buffered and written in batches.
+    The connection is opened per process, so a cache can be handed to forked
+    screening workers; WAL lets them read while another one writes.
+
+    `hits` and `misses` count lookups, for instrumentation.
+
+    Args:
+        path: SQLite database file (created if missing)
+        entities_digest: Digest of the entities file being screened against
+        config: Digest of the screening options, from `config_digest`
+        max_entries: Most results kept after `close`
+        source: Identifies the list (e.g. its resolved path); None leaves
+            older versions' rows to be evicted as least recently used
+    """
+
+    def __init__(
+        self,
+        path: str,
+        entities_digest: str,
+        config: str,
+        max_entries: int = MAX_ENTRIES,
+        source: Optional[str] = None,
+    ) -> None:
+        self.path = Path(path)
+        self.source = source
+        self.entities_digest = entities_digest
+        self.config = config
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        # Run start; rows used earlier are touched on their first hit
+        self.now = time.time_ns()
+        self._pending: Dict[str, str] = {}
+        self._touched: List[str] = []
+        self._db: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as db:
+            if source is not None:
+                db.execute(
+                    "DELETE FROM results WHERE source = ? AND entities != ?",
+                    (source, self.entities_digest),
+                )
+
+    def _connect(self) -> sqlite3.Connection:
+        """This process's connection (forked workers open their own)."""
+        if self._db is None or self._pid != os.getpid():
+            # A connection inherited across fork must not be used or closed
+            self._pending, self._touched = {}, []
+            db = sqlite3.connect(self.path, timeout=60)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            if db.execute("PRAGMA user_version").fetchone()[0] != CACHE_VERSION:
+                db.execute("DROP TABLE IF EXISTS results")
+                db.execute(f"PRAGMA user_version={CACHE_VERSION}")
+            db.executescript(_SCHEMA)
+            self._db, self._pid = db, os.getpid()
+        return self._db
+
+    def get(self, query: str) -> Optional[List[Tuple[int, float]]]:
+        """
+        Look a query up.
+
+        Args:
+            query: Normalized query (plus any attribute filter) as a key
+
+        Returns:
+            Optional[List[Tuple[int, float]]]: The cached hits, or None
+        """
+        hits = self._pending.get(query)
+        if hits is None:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT hits, used FROM results "
+                    "WHERE entities = ? AND config = ? AND query = ?",
+                    (self.entities_digest, self.config, query),
+                )
+                .fetchone()
+            )
+            if row is None:
+                self.misses += 1
+                return None
+            hits, used = row
+            if used < self.now:
+                self._touched.append(query)
+                if len(self._touched) >= FLUSH_ROWS:
+                    self.flush()
+        self.hits += 1
+        return [(o, s) for o, s in json.loads(hits)]
+
+    def put(self, query: str, hits: List[Tuple[int, float]]) -> None:
+        """Remember a query's hits (written with the next flush)."""
+        self._pending[query] = json.dumps(hits)
+        if len(self._pending) >= FLUSH_ROWS:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered results and last-used times in one transaction."""
+        if not (self._pending or self._touched):
+            return
+        key = (self.entities_digest, self.config)
+        with self._connect() as db:
+            db.executemany(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                [(self.source, *key, q, h, self.now) for q, h in self._pending.items()],
+            )
+            db.executemany(
+                "UPDATE results SET used = ? "
+                "WHERE entities = ? AND config = ? AND query = ?",
+                [(self.now, *key, q) for q in self._touched],
+            )
+        self._pending.clear()
+        self._touched.clear()
+
+    def close(self) -> None:
+        """Flush, evict least recently used rows beyond `max_entries`, close."""
+        self.flush()
+        with self._connect() as db:
+            (count,) = db.execute("SELECT COUNT(*) FROM results").fetchone()
+            if count > self.max_entries:
+                db.execute(
+                    "DELETE FROM results WHERE (entities, config, query) IN "
+                    "(SELECT entities, config, query FROM results "
+                    "ORDER BY used LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+        self._db.close()
+        self._db = None
+
+    def __enter__(self) -> "ResultCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
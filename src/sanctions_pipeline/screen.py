@@ -1,9 +1,399 @@
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 import csv
 import json
+import logging
+import multiprocessing
+import os
+import shutil
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
+from . import metrics
+from .index import Filter, NameIndex, _iter_entities, _iter_jsonl, load_index
+from .match import make_matcher
+from .normalize import birth_year, country_code, normalize_name
+from .normalize import normalize_query, query_cache_info
+from .result_cache import MAX_ENTRIES, ResultCache, config_digest
+from .transform import FIELD_COLUMNS
 
-def screen_names(input_csv: str, entities_jsonl: str, output_csv: str) -> int:
+log = logging.getLogger(__name__)
+
+MATCH_FIELDS = ["match_name", "match_schema", "match_score", "match_id"]
+
+# Output layouts for --top-k: one CSV row per match, or all matches packed as JSON
+OUTPUT_MODES = ("rows", "json")
+
+# Output rows buffered before each csv writerows() call
+WRITE_BATCH = 1024
+
+# Input fields that narrow candidates, read from the same columns as a list's
+FILTER_FIELDS = ("sdn_type", "birth_date", "country")
+
+# Input type values (normalized) naming an entity schema; any other value
+# leaves the schema unfiltered rather than risk excluding a listed entity
+SCHEMA_SYNONYMS = {
+    "person": "Person",
+    "individual": "Person",
+    "natural person": "Person",
+    "organization": "Organization",
+    "organisation": "Organization",
+    "company": "Organization",
+    "entity": "Organization",
+    "legal entity": "Organization",
+}
+
+# Screener shared by pool workers; set once per process by _init_worker
+_WORKER_SCREENER = None
+
+
+def filter_columns(fieldnames: Iterable[str]) -> Dict[str, str]:
+    """
+    Find the input columns holding a type, birth date or country.
+
+    Headers are matched like a list's are by `transform` ("Date of Birth",
+    "dob", "Citizenship", "nationality", ...).
+
+    Args:
+        fieldnames: Input CSV header
+
+    Returns:
+        Dict[str, str]: Column name per field of FILTER_FIELDS found
+    """
+    columns = {str(f).strip().lower(): f for f in fieldnames}
+    found = {}
+    for field in FILTER_FIELDS:
+        column = next((c for c in FIELD_COLUMNS[field] if c in columns), None)
+        if column is not None:
+            found[field] = columns[column]
+    return found
+
+
+class Screener:
+    """
+    Turns input rows into output rows for one screening configuration.
+
+    Without `top_k` each row gets the single match the matcher picks. With
+    `top_k`, the best k matches are returned either as one output row per
+    match (with a `match_rank` column) or packed into a `matches` JSON column.
+
+    With `attributes`, rows that carry a type, birth date or country are only
+    matched against entities compatible with them (see `NameIndex.filter`).
+
+    With a `cache`, hits are looked up there first and matched only on a miss.
+    """
+
+    def __init__(
+        self,
+        matcher,
+        top_k: Optional[int] = None,
+        output_mode: str = "rows",
+        attributes: bool = True,
+        cache: Optional[ResultCache] = None,
+    ) -> None:
+        if output_mode not in OUTPUT_MODES:
+            raise ValueError(
+                f"Unknown output mode: {output_mode} (use {', '.join(OUTPUT_MODES)})"
+            )
+        if top_k is not None and top_k < 1:
+            raise ValueError(f"top_k must be at least 1, got {top_k}")
+        self.matcher = matcher
+        self.top_k = top_k
+        self.output_mode = output_mode
+        self.attributes = attributes
+        self.cache = cache
+        # Rows screened so far, for instrumentation
+        self.rows = 0
+
+    def fieldnames(self, input_fields: List[str]) -> List[str]:
+        """Output CSV columns for the given input columns."""
+        if self.top_k is None:
+            return input_fields + MATCH_FIELDS
+        if self.output_mode == "json":
+            return input_fields + ["matches"]
+        return input_fields + ["match_rank"] + MATCH_FIELDS
+
+    def _match(self, ordinal: int, score: float) -> Dict:
+        index = self.matcher.index
+        return {
+            "match_name": index.names[ordinal],
+            "match_schema": index.schemas[ordinal],
+            "match_score": round(score, 4),
+            "match_id": index.ids[ordinal],
+        }
+
+    def where(self, row: Dict, columns: Dict[str, str]) -> Optional[Filter]:
+        """
+        Build the attribute filter for one input row.
+
+        Args:
+            row: Input row
+            columns: Its filter columns, from `filter_columns`
+
+        Returns:
+            Optional[Filter]: None if filtering is off or the row has no
+            values that resolve (unknown types and countries don't filter)
+        """
+        if not (self.attributes and columns):
+            return None
+        values = {f: (row.get(c) or "").strip() for f, c in columns.items()}
+        return self.matcher.index.filter(
+            SCHEMA_SYNONYMS.get(normalize_name(values.get("sdn_type"))),
+            birth_year(values.get("birth_date")),
+            country_code(values.get("country")),
+        )
+
+    def hits(
+        self, name: Optional[str], where: Optional[Filter] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Look a single name up and return its (ordinal, score) matches, best first.
+
+        Args:
+            name: Raw name as it appears in the input
+            where: Attribute filter from `where`
+
+        Returns:
+            List[Tuple[int, float]]: At most one hit, or up to `top_k` hits
+        """
+        q = normalize_query(name) if name else ""
+        if not q:
+            return []
+        if self.cache is None:
+            return self._lookup(q, where)
+
+        key = q if where is None else "\x1f".join((q, *map(str, where.spec)))
+        hits = self.cache.get(key)
+        if hits is None:
+            hits = self._lookup(q, where)
+            self.cache.put(key, hits)
+        return hits
+
+    def _lookup(self, q: str, where: Optional[Filter]) -> List[Tuple[int, float]]:
+        # Only candidate entities from the index are compared
+        if self.top_k is None:
+            hit = self.matcher.best(q, where)
+            return [hit] if hit is not None else []
+        return self.matcher.top(q, self.top_k, where)
+
+    def matches(
+        self, name: Optional[str], where: Optional[Filter] = None
+    ) -> List[Dict]:
+        """Like `hits`, but with each match as a dict of the match columns."""
+        return [self._match(o, s) for o, s in self.hits(name, where)]
+
+    def screen(self, rows: Iterable[Dict], writer: csv.DictWriter) -> int:
+        """
+        Match each row and write it out with the match columns.
+
+        Args:
+            rows: Input rows (dicts with a "name" column)
+            writer: Writer whose fieldnames come from `fieldnames()`
+
+        Returns:
+            int: Number of input rows that matched at least one entity
+        """
+        empty = dict.fromkeys(MATCH_FIELDS, "")
+        matched = 0
+        columns = filter_columns(writer.fieldnames)
+        # Output rows are buffered and written in batches
+        out: List[Dict] = []
+        for row in rows:
+            self.rows += 1
+            hits = self.hits(row.get("name"), self.where(row, columns))
+            if hits:
+                matched += 1
+
+            if self.top_k is None:
+                row.update(self._match(*hits[0]) if hits else empty)
+                out.append(row)
+            elif self.output_mode == "json":
+                row["matches"] = json.dumps(
+                    [self._match(o, s) for o, s in hits], ensure_ascii=False
+                )
+                out.append(row)
+            elif not hits:
+                out.append({**row, "match_rank": "", **empty})
+            else:
+                for rank, (ordinal, score) in enumerate(hits, 1):
+                    out.append(
+                        {**row, "match_rank": rank, **self._match(ordinal, score)}
+                    )
+
+            if len(out) >= WRITE_BATCH:
+                writer.writerows(out)
+                out.clear()
+        writer.writerows(out)
+        if self.cache is not None:
+            self.cache.flush()
+        return matched
+
+
+def _byte_ranges(path: Path, chunks: int) -> Tuple[List[str], List[Tuple[int, int]]]:
+    """
+    Read the CSV header and split the body into record-aligned byte ranges.
+
+    A newline ends a record only outside quotes: CSV escapes a quote as `""`,
+    so an odd number of quotes on a line leaves a field open across the
+    newline. Boundaries are placed on the first record end past each target
+    offset, so a multi-line quoted field is never cut between chunks.
+
+    Args:
+        path: Input CSV file
+        chunks: Desired number of ranges (fewer are returned for small files)
+
+    Returns:
+        Tuple[List[str], List[Tuple[int, int]]]: Header fields and (start, end) offsets
+    """
+    size = path.stat().st_size
+    with path.open("rb") as f:
+        header = f.readline()
+        body_start = f.tell()
+
+        bounds = [body_start]
+        pos, quoted = body_start, False
+        target = body_start + (size - body_start) // chunks
+        for line in f:
+            pos += len(line)
+            if line.count(b'"') % 2:
+                quoted = not quoted
+            if not quoted and target <= pos < size:
+                bounds.append(pos)
+                if len(bounds) == chunks:
+                    break
+                target = body_start + (size - body_start) * len(bounds) // chunks
+        bounds.append(size)
+
+    fieldnames = next(csv.reader([header.decode("utf-8")]), [])
+    return fieldnames, list(zip(bounds[:-1], bounds[1:]))
+
+
+def _iter_lines(path: Path, start: int, end: int) -> Iterator[str]:
+    """Yield the decoded lines between two record-aligned byte offsets."""
+    with path.open("rb") as f:
+        f.seek(start)
+        pos = start
+        while pos < end:
+            line = f.readline()
+            if not line:
+                break
+            pos += len(line)
+            yield line.decode("utf-8")
+
+
+def _init_worker(screener: Screener) -> None:
+    """Pool initializer: keep the screener in a module global for the worker."""
+    global _WORKER_SCREENER
+    _WORKER_SCREENER = screener
+
+
+def _counters(screener: Screener) -> Dict[str, int]:
+    """Running totals of the matcher and of this process's query cache."""
+    info = query_cache_info()
+    cache = screener.cache
+    return {
+        "rows": screener.rows,
+        "queries": screener.matcher.queries,
+        "candidates": screener.matcher.candidates,
+        "query_cache_hits": info["hits"],
+        "query_cache_misses": info["misses"],
+        "result_cache_hits": cache.hits if cache is not None else 0,
+        "result_cache_misses": cache.misses if cache is not None else 0,
+    }
+
+
+def _since(before: Dict[str, int], screener: Screener) -> Dict[str, int]:
+    after = _counters(screener)
+    return {k: after[k] - before[k] for k in after}
+
+
+def _report(counters: Dict[str, int]) -> None:
+    """Log the query cache hit rate and hand the counters to metrics."""
+    hits, misses = counters["query_cache_hits"], counters["query_cache_misses"]
+    rate = hits / (hits + misses) if hits + misses else 0.0
+    log.info(f"Query cache: {hits} hits, {misses} misses ({rate:.1%} hit rate)")
+    hits, misses = counters["result_cache_hits"], counters["result_cache_misses"]
+    if hits + misses:
+        rate = hits / (hits + misses)
+        log.info(f"Result cache: {hits} hits, {misses} misses ({rate:.1%} hit rate)")
+    metrics.count(counters)
+
+
+def _screen_range(
+    input_csv: str, fieldnames: List[str], start: int, end: int, part_path: str
+) -> Tuple[int, Dict[str, int]]:
+    """
+    Screen one byte range of the input CSV into a headerless part file.
+
+    Returns:
+        Tuple[int, Dict[str, int]]: Matched rows and this range's counters
+    """
+    before = _counters(_WORKER_SCREENER)
+    with open(part_path, "w", encoding="utf-8", newline="") as fout:
+        reader = csv.DictReader(
+            _iter_lines(Path(input_csv), start, end), fieldnames=fieldnames
+        )
+        writer = csv.DictWriter(fout, _WORKER_SCREENER.fieldnames(fieldnames))
+        matched = _WORKER_SCREENER.screen(reader, writer)
+    return matched, _since(before, _WORKER_SCREENER)
+
+
+def _screen_parallel(screener: Screener, pin: Path, pout: Path, workers: int) -> int:
+    """
+    Screen the input CSV in byte-range chunks on a process pool.
+
+    Each chunk is written to its own part file; the parts are then appended to
+    the output in chunk order, so rows keep their input order.
+    """
+    # Several chunks per worker so a slow chunk doesn't leave cores idle
+    fieldnames, ranges = _byte_ranges(pin, workers * 4)
+    parts = [f"{pout}.part{i}" for i in range(len(ranges))]
+
+    # fork shares the already-built screener with workers copy-on-write
+    methods = multiprocessing.get_all_start_methods()
+    ctx = multiprocessing.get_context("fork" if "fork" in methods else None)
+
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=ctx,
+            initializer=_init_worker,
+            initargs=(screener,),
+        ) as pool:
+            futures = [
+                pool.submit(_screen_range, str(pin), fieldnames, start, end, part)
+                for (start, end), part in zip(ranges, parts)
+            ]
+            results = [f.result() for f in futures]
+        matched = sum(m for m, _ in results)
+        _report({k: sum(c[k] for _, c in results) for k in results[0][1]})
+
+        with pout.open("w", encoding="utf-8", newline="") as fout:
+            csv.DictWriter(fout, screener.fieldnames(fieldnames)).writeheader()
+            for part in parts:
+                with open(part, "r", encoding="utf-8", newline="") as fpart:
+                    shutil.copyfileobj(fpart, fout)
+    finally:
+        for part in parts:
+            if os.path.exists(part):
+                os.remove(part)
+
+    return matched
+
+
+def screen_names(
+    input_csv: str,
+    entities_jsonl: str,
+    output_csv: str,
+    index_path: Optional[str] = None,
+    workers: int = 1,
+    method: str = "substring",
+    threshold: Optional[float] = None,
+    top_k: Optional[int] = None,
+    output_mode: str = "rows",
+    attributes: bool = True,
+    result_cache: Optional[str] = None,
+    result_cache_size: int = MAX_ENTRIES,
+) -> int:
     """
     Process CSV rows against JSONL entities file to match names.
 
@@ -11,56 +401,240 @@ def screen_names(input_csv: str, entities_jsonl: str, output_csv: str) -> int:
         input_csv: Path to input CSV file containing names to match
         entities_jsonl: Path to JSONL file containing entity definitions
         output_csv: Path to output CSV file with matched results
+        index_path: Optional path of a persisted name index (built if missing or stale)
+        workers: Number of processes to screen with (1 screens in-process)
+        method: "substring" (first entity containing the name) or "fuzzy"
+            (best trigram similarity)
+        threshold: Minimum match_score for a hit (fuzzy defaults to 0.8)
+        top_k: Return the best k matches per row instead of a single match
+        output_mode: With top_k, "rows" (one row per match) or "json"
+            (a packed `matches` column)
+        attributes: Narrow candidates by the input's type, birth date and
+            country columns, where present
+        result_cache: SQLite file caching results across runs (this list's
+            entries are dropped when its entities file changes)
+        result_cache_size: Most queries kept in the result cache
 
     Returns:
-        int: Number of successful matches found
+        int: Number of input rows with at least one match
     """
-    # Load entities from JSONL file
-    ents = []
-    p = Path(entities_jsonl)
-    with p.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            ents.append(json.loads(line))
+    # Load (or build) the inverted name index for the entities file
+    index = load_index(entities_jsonl, index_path)
+    matcher = make_matcher(index, method, threshold)
+    if result_cache is None:
+        screener = Screener(matcher, top_k, output_mode, attributes)
+        return _screen_file(screener, input_csv, output_csv, workers)
 
-    # Precompute lowercase names for matching efficiency
-    names = [((e.get("name") or "").strip().lower(), e) for e in ents]
+    config = config_digest(method=method, threshold=threshold, top_k=top_k)
+    with ResultCache(
+        result_cache,
+        index.source_digest,
+        config,
+        result_cache_size,
+        source=str(Path(entities_jsonl).resolve()),
+    ) as cache:
+        screener = Screener(matcher, top_k, output_mode, attributes, cache)
+        return _screen_file(screener, input_csv, output_csv, workers)
 
-    matched = 0
 
+def _screen_file(
+    screener: Screener, input_csv: str, output_csv: str, workers: int = 1
+) -> int:
+    """Screen a CSV file with a ready screener; returns the matched row count."""
     # Set up input and output paths
     pin = Path(input_csv)
     pout = Path(output_csv)
     pout.parent.mkdir(parents=True, exist_ok=True)
 
+    if workers > 1:
+        return _screen_parallel(screener, pin, pout, workers)
+
     # Process CSV files
     with (
         pin.open("r", encoding="utf-8", newline="") as fin,
         pout.open("w", encoding="utf-8", newline="") as fout,
     ):
         reader = csv.DictReader(fin)
-        fieldnames = list(reader.fieldnames or []) + ["match_name", "match_schema"]
-        writer = csv.DictWriter(fout, fieldnames=fieldnames)
+        writer = csv.DictWriter(
+            fout, screener.fieldnames(list(reader.fieldnames or []))
+        )
         writer.writeheader()
+        before = _counters(screener)
+        matched = screener.screen(reader, writer)
 
-        # Process each row and match names
-        for row in reader:
-            q = (row.get("name") or "").strip().lower()
-            hit = None
+    _report(_since(before, screener))
+    return matched
 
-            if q:
-                for n, ent in names:
-                    if q and n and q in n:  # case-insensitive substring match
-                        hit = ent
-                        break
 
-            row["match_name"] = hit.get("name", "") if hit else ""
-            row["match_schema"] = hit.get("schema", "") if hit else ""
+def _entity_changes(
+    entities_jsonl: str,
+    delta_jsonl: Optional[str] = None,
+    old_entities_jsonl: Optional[str] = None,
+) -> Tuple[set, set]:
+    """
+    Work out which entity ids were added/updated and which were deleted.
+
+    Args:
+        entities_jsonl: The new entities file
+        delta_jsonl: A delta written by `transform --incremental`
+        old_entities_jsonl: The previous entities file (diffed against the new one)
+
+    Returns:
+        Tuple[set, set]: (added or updated ids, deleted ids)
+    """
+    changed: set = set()
+    deleted: set = set()
+
+    if delta_jsonl is not None:
+        for op in _iter_jsonl(delta_jsonl):
+            if op["op"] == "delete":
+                changed.discard(op["id"])
+                deleted.add(op["id"])
+            else:
+                deleted.discard(op["id"])
+                changed.add(op["id"])
+        return changed, deleted
 
+    if old_entities_jsonl is None:
+        raise ValueError("Pass either a delta file or the previous entities file")
+
+    # Compare entities by id on the fields screening reads
+    def fields(path: str) -> Dict[str, Tuple]:
+        return {
+            str(e.get("id")): (
+                e.get("name"),
+                e.get("schema"),
+                tuple(e.get("aliases") or ()),
+                e.get("birth_date"),
+                e.get("country"),
+            )
+            for e in _iter_entities(path)
+        }
+
+    old, new = fields(old_entities_jsonl), fields(entities_jsonl)
+    changed = {i for i, f in new.items() if old.get(i) != f}
+    deleted = set(old) - set(new)
+    return changed, deleted
+
+
+def rescreen_names(
+    input_csv: str,
+    previous_csv: str,
+    entities_jsonl: str,
+    output_csv: str,
+    delta_jsonl: Optional[str] = None,
+    old_entities_jsonl: Optional[str] = None,
+    index_path: Optional[str] = None,
+    method: str = "substring",
+    threshold: Optional[float] = None,
+) -> Dict[str, int]:
+    """
+    Update a previous screening result after an entity list update.
+
+    Customer rows are screened only against added and updated entities, and
+    the hit is merged with the row's previous match: the earlier entity in
+    file order wins for substring matching, the higher score for fuzzy. Rows
+    whose previous match was updated or deleted, and rows that differ from
+    the previous run's input, are screened against the full new list. The
+    result equals a full `screen_names` run with the same method/threshold,
+    provided entities keep their relative order (as `row-{idx}` ids do).
+
+    Args:
+        input_csv: Customer CSV (the same file that produced previous_csv)
+        previous_csv: Single-match results of the previous screen run
+        entities_jsonl: The new entities file
+        output_csv: Where to write the merged results
+        delta_jsonl: Delta from `transform --incremental` describing the update
+        old_entities_jsonl: Previous entities file (alternative to delta_jsonl)
+        index_path: Optional persisted index for the new entities file
+        method: Match method used for the previous run
+        threshold: Match threshold used for the previous run
+
+    Returns:
+        Dict[str, int]: Counts of rows, matched rows, fully rescreened rows,
+        and changed/deleted entities
+    """
+    changed, deleted = _entity_changes(entities_jsonl, delta_jsonl, old_entities_jsonl)
+
+    index = load_index(entities_jsonl, index_path)
+    full = Screener(make_matcher(index, method, threshold))
+    # Names, not entities: an alias has the id of its entity
+    ordinal_of = {name: i for i, name in enumerate(zip(index.ids, index.names))}
+
+    # Small index over just the changed names, in new-file order
+    delta_index = NameIndex()
+    delta_ordinals = []
+    for i, entity_id in enumerate(index.ids):
+        if entity_id in changed:
+            delta_index.add(
+                {
+                    "id": entity_id,
+                    "name": index.names[i],
+                    "schema": index.schemas[i],
+                    **index.attributes(i),
+                }
+            )
+            delta_ordinals.append(i)
+    delta = Screener(make_matcher(delta_index, method, threshold))
+
+    def rank(hit: Tuple[int, float]) -> Tuple:
+        # Previous scores come back from the CSV rounded, so compare rounded
+        ordinal, score = hit
+        return (ordinal,) if method == "substring" else (-round(score, 4), ordinal)
+
+    stats = {"rows": 0, "matched": 0, "rescreened": 0}
+    stats.update(changed_entities=len(changed), deleted_entities=len(deleted))
+
+    pout = Path(output_csv)
+    pout.parent.mkdir(parents=True, exist_ok=True)
+    with (
+        open(input_csv, "r", encoding="utf-8", newline="") as fin,
+        open(previous_csv, "r", encoding="utf-8", newline="") as fprev,
+        pout.open("w", encoding="utf-8", newline="") as fout,
+    ):
+        reader = csv.DictReader(fin)
+        prev_reader = csv.DictReader(fprev)
+        fields = list(reader.fieldnames or [])
+        if not set(MATCH_FIELDS) <= set(prev_reader.fieldnames or []):
+            raise ValueError(
+                f"{previous_csv} is not a single-match screen result "
+                f"(needs columns {', '.join(MATCH_FIELDS)})"
+            )
+
+        writer = csv.DictWriter(fout, full.fieldnames(fields))
+        writer.writeheader()
+        empty = dict.fromkeys(MATCH_FIELDS, "")
+        columns = filter_columns(fields)
+
+        previous_rows = iter(prev_reader)
+        for row in reader:
+            stats["rows"] += 1
+            prev = next(previous_rows, None)
+            prev_id = prev["match_id"] if prev is not None else ""
+            prev_name = (prev_id, prev["match_name"]) if prev is not None else None
+
+            stale = (
+                prev is None
+                or any(prev.get(f) != row.get(f) for f in fields)
+                or (prev_id and (prev_id in changed or prev_name not in ordinal_of))
+            )
+            if stale:
+                # Previous result can't be reused: screen against everything
+                hits = full.hits(row.get("name"), full.where(row, columns))
+                stats["rescreened"] += 1
+            else:
+                where = delta.where(row, columns)
+                hits = [
+                    (delta_ordinals[o], s)
+                    for o, s in delta.hits(row.get("name"), where)
+                ]
+                if prev_id:
+                    hits.append((ordinal_of[prev_name], float(prev["match_score"])))
+                hits = sorted(hits, key=rank)[:1]
+
+            row.update(full._match(*hits[0]) if hits else empty)
             writer.writerow(row)
-            if hit:
-                matched += 1
+            if hits:
+                stats["matched"] += 1
 
-    return matched
+    return stats
@@ -0,0 +1,286 @@
+from pathlib import Path
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+import asyncio
+import json
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+from .index import file_digest, load_index
+from .match import make_matcher
+from .screen import Screener
+
+__all__ = ["ScreeningService", "serve"]
+
+log = logging.getLogger(__name__)
+
+# Largest request body accepted (batch requests of ~100k names fit comfortably)
+MAX_BODY = 16 * 1024 * 1024
+
+
+class HTTPError(Exception):
+    """An error that is reported to the client as a JSON response."""
+
+    def __init__(self, status: HTTPStatus, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class ScreeningService:
+    """
+    Screens names against an entity index that is loaded once and kept in memory.
+
+    The current index lives behind a single attribute. Reloads build a new
+    Screener off the event loop and then swap that attribute, so requests
+    already running finish against the old index and no request ever sees a
+    half-built one.
+    """
+
+    def __init__(
+        self,
+        entities_jsonl: str,
+        index_path: Optional[str] = None,
+        method: str = "substring",
+        threshold: Optional[float] = None,
+        top_k: Optional[int] = None,
+    ) -> None:
+        self.entities_jsonl = entities_jsonl
+        self.index_path = index_path
+        self.method = method
+        self.threshold = threshold
+        self.top_k = top_k
+        self._reload_lock = asyncio.Lock()
+        self.version, self.screener = self._load()
+
+    def _load(self) -> Tuple[str, Screener]:
+        """Build a Screener for the current entities file (blocking)."""
+        index = load_index(self.entities_jsonl, self.index_path)
+        matcher = make_matcher(index, self.method, self.threshold)
+        return index.source_digest, Screener(matcher, self.top_k)
+
+    async def reload(self, force: bool = False) -> bool:
+        """
+        Rebuild the index if the entities file changed, then swap it in.
+
+        Args:
+            force: Rebuild even if the file digest is unchanged
+
+        Returns:
+            bool: True if a new index was swapped in
+        """
+        async with self._reload_lock:
+            digest = await asyncio.to_thread(file_digest, self.entities_jsonl)
+            if digest == self.version and not force:
+                return False
+            version, screener = await asyncio.to_thread(self._load)
+            self.version, self.screener = version, screener
+            log.info(
+                f"Reloaded {screener.matcher.index.entities} entities ({version[:12]})"
+            )
+            return True
+
+    async def watch(self, interval: float = 5.0) -> None:
+        """
+        Poll the entities file and reload when it changes.
+
+        A change is only picked up once the file's size and mtime have been
+        stable for a full interval, so a file still being written is skipped,
+        and differ from those of the last successful reload, so an unchanged
+        file is not re-hashed on every poll. A reload that fails (e.g. a
+        truncated file) keeps the current index and is retried.
+        """
+        p = Path(self.entities_jsonl)
+        last = loaded = None
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                continue
+            current = (st.st_size, st.st_mtime_ns)
+            if current == last and current != loaded:
+                try:
+                    await self.reload()
+                    loaded = current
+                except Exception as e:
+                    log.error(f"Reload failed, keeping current index: {e}")
+            last = current
+
+    def screen_one(self, name: Any) -> Dict[str, Any]:
+        """Screen one name and return it with its matches."""
+        if not isinstance(name, str):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "'name' must be a string")
+        return {"name": name, "matches": self.screener.matches(name)}
+
+    async def route(self, method: str, target: str, body: bytes) -> Dict[str, Any]:
+        """
+        Dispatch one request to its endpoint.
+
+        Endpoints:
+            GET  /health                  -> index size and version
+            GET  /screen?name=...         -> matches for one name
+            POST /screen {"name": ...}    -> matches for one name
+            POST /screen/batch {"names": [...]} -> matches for each name
+            POST /reload                  -> reload now if the file changed
+        """
+        url = urlsplit(target)
+
+        if url.path == "/reload" and method == "POST":
+            reloaded = await self.reload()
+            return {"reloaded": reloaded, "version": self.version}
+
+        if url.path == "/health" and method == "GET":
+            return {
+                "status": "ok",
+                "entities": self.screener.matcher.index.entities,
+                "version": self.version,
+            }
+
+        if url.path == "/screen" and method == "GET":
+            names = parse_qs(url.query).get("name")
+            if not names:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "missing ?name=")
+            return self.screen_one(names[0])
+
+        if url.path in ("/screen", "/screen/batch") and method == "POST":
+            try:
+                payload = json.loads(body or b"{}")
+            except ValueError:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "body is not valid JSON")
+            if not isinstance(payload, dict):
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "body must be a JSON object")
+            if url.path == "/screen":
+                return self.screen_one(payload.get("name"))
+
+            names = payload.get("names")
+            if not isinstance(names, list):
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "'names' must be a list")
+            if not all(isinstance(name, str) for name in names):
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "names must be strings")
+            # Batch against one index snapshot, even if a reload lands meanwhile,
+            # in a thread so a large batch doesn't stall other connections
+            screener = self.screener
+            results = await asyncio.to_thread(
+                lambda: [{"name": n, "matches": screener.matches(n)} for n in names]
+            )
+            return {"results": results}
+
+        if url.path in ("/health", "/screen", "/screen/batch", "/reload"):
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, f"{method} not allowed")
+        raise HTTPError(HTTPStatus.NOT_FOUND, f"no such endpoint: {url.path}")
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve HTTP/1.1 requests on one connection (keep-alive aware)."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await _respond(
+                        writer, HTTPStatus.BAD_REQUEST, {"error": "bad request"}
+                    )
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+
+                try:
+                    length = int(headers.get("content-length") or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await _respond(
+                        writer,
+                        HTTPStatus.BAD_REQUEST,
+                        {"error": "bad Content-Length"},
+                    )
+                    break
+                if length > MAX_BODY:
+                    await _respond(
+                        writer,
+                        HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                        {"error": "too large"},
+                    )
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                try:
+                    status = HTTPStatus.OK
+                    payload = await self.route(method, target, body)
+                except HTTPError as e:
+                    status, payload = e.status, {"error": e.message}
+                except Exception:
+                    log.exception(f"Error serving {method} {target}")
+                    status = HTTPStatus.INTERNAL_SERVER_ERROR
+                    payload = {"error": "internal error"}
+
+                keep_alive = headers.get("connection", "").lower() != "close" and (
+                    version == "HTTP/1.1"
+                )
+                await _respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            # Client went away mid-request
+            pass
+        finally:
+            writer.close()
+
+
+async def _respond(
+    writer: asyncio.StreamWriter,
+    status: HTTPStatus,
+    payload: Dict[str, Any],
+    keep_alive: bool = False,
+) -> None:
+    """Write one JSON response."""
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+        "Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    writer.write(head.encode("latin-1") + body)
+    await writer.drain()
+
+
+async def serve(
+    service: ScreeningService,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    watch_interval: Optional[float] = 5.0,
+) -> None:
+    """
+    Run the screening HTTP server until cancelled.
+
+    Args:
+        service: Loaded ScreeningService
+        host: Interface to bind
+        port: Port to bind
+        watch_interval: Seconds between entities-file checks (None disables hot-reload)
+    """
+    server = await asyncio.start_server(service.handle, host, port)
+    watcher = None
+    if watch_interval:
+        watcher = asyncio.create_task(service.watch(watch_interval))
+
+    for sock in server.sockets:
+        log.info(f"Serving on http://{sock.getsockname()[0]}:{sock.getsockname()[1]}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        if watcher is not None:
+            watcher.cancel()
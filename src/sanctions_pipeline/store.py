@@ -0,0 +1,202 @@
+from pathlib import Path
+from array import array
+import json
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+from typing import Any, Dict, Iterable, Iterator, Sequence
+
+__all__ = ["EntityStore", "write_store", "is_store", "STORE_COLUMNS"]
+
+MAGIC = b"SPSTORE\x01"
+
+# Bump whenever the columns or their encoding change
+STORE_VERSION = 2
+
+# Columns kept per entity; "key" is the normalized name used for matching
+STORE_COLUMNS = ("id", "name", "schema", "key", "aliases", "birth_date", "country")
+
+# Columns left out of `iter_entities` dicts when empty, as in simple entities
+OPTIONAL_COLUMNS = ("aliases", "birth_date", "country")
+
+# Separates the values of a list column (aliases) within one entity's value
+LIST_SEP = "\x1f"
+
+# Open stores, one mapping per file version per process (shared by its columns)
+_OPEN: Dict[tuple, "EntityStore"] = {}
+
+
+def is_store(path: str) -> bool:
+    """Return True if the file starts with the entity store magic bytes."""
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def write_store(entities: Iterable[Dict[str, Any]], path: str) -> int:
+    """
+    Write entities to a columnar, offset-indexed binary store.
+
+    Layout: magic, a length-prefixed JSON header, then (8-byte aligned) per
+    column an array of count+1 uint64 offsets followed by the UTF-8 values
+    packed back to back. Values are streamed to temporary files while
+    writing, so only the offsets (8 bytes per entity per column) stay in
+    memory. A list value (aliases) is stored joined by LIST_SEP.
+
+    Args:
+        entities: Dicts with "id", "name", "schema" and "key" values, plus
+            optional "aliases", "birth_date" and "country"
+        path: Output file path
+
+    Returns:
+        int: Number of entities written
+    """
+    out = Path(path)
+    out.parent.mkdir(parents=True, exist_ok=True)
+
+    offsets = {c: array("Q", [0]) for c in STORE_COLUMNS}
+    with tempfile.TemporaryDirectory(dir=out.parent) as tmp:
+        blobs = {c: open(os.path.join(tmp, c), "w+b") for c in STORE_COLUMNS}
+        try:
+            count = 0
+            for entity in entities:
+                for c in STORE_COLUMNS:
+                    value = entity.get(c) or ""
+                    if isinstance(value, list):
+                        value = LIST_SEP.join(value)
+                    data = str(value).encode("utf-8")
+                    blobs[c].write(data)
+                    offsets[c].append(offsets[c][-1] + len(data))
+                count += 1
+
+            # Section positions are relative to the 8-byte aligned body start
+            header: Dict[str, Any] = {
+                "version": STORE_VERSION,
+                "count": count,
+                "columns": {},
+            }
+            pos = 0
+            for c in STORE_COLUMNS:
+                header["columns"][c] = {
+                    "offsets": pos,
+                    "data": pos + 8 * (count + 1),
+                    "size": offsets[c][-1],
+                }
+                pos = _align(pos + 8 * (count + 1) + offsets[c][-1])
+            head = json.dumps(header).encode("utf-8")
+            head = MAGIC + struct.pack("<Q", len(head)) + head
+
+            tmp_out = Path(tmp) / "store"
+            with tmp_out.open("wb") as f:
+                body = _align(len(head))
+                f.write(head)
+                for c in STORE_COLUMNS:
+                    f.write(b"\0" * (body + header["columns"][c]["offsets"] - f.tell()))
+                    f.write(offsets[c].tobytes())
+                    blobs[c].seek(0)
+                    shutil.copyfileobj(blobs[c], f)
+        finally:
+            for blob in blobs.values():
+                blob.close()
+        os.replace(tmp_out, out)
+    return count
+
+
+def _align(pos: int) -> int:
+    return (pos + 7) & ~7
+
+
+class StoreColumn(Sequence):
+    """
+    A read-only sequence of strings backed by a memory-mapped store column.
+
+    Values are decoded on access, so nothing but the mapping is resident and
+    its pages are shared by every process that maps the same file.
+    """
+
+    def __init__(self, store: "EntityStore", name: str) -> None:
+        meta = store.header["columns"][name]
+        start = store.body + meta["offsets"]
+        self.store = store
+        self.name = name
+        self.offsets = store.view[start : start + 8 * (store.count + 1)].cast("Q")
+        self.data = store.body + meta["data"]
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return str(self.store.view[self.data + start : self.data + end], "utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        view, data, offsets = self.store.view, self.data, self.offsets
+        for i in range(len(offsets) - 1):
+            yield str(view[data + offsets[i] : data + offsets[i + 1]], "utf-8")
+
+    def __reduce__(self):
+        # Re-map the file on unpickle (e.g. in a spawned worker or a saved index)
+        return (_open_column, (self.store.path, self.name))
+
+
+def _open_column(path: str, name: str) -> StoreColumn:
+    return EntityStore.open(path).column(name)
+
+
+class EntityStore:
+    """Memory-mapped reader for a store written by `write_store`."""
+
+    def __init__(self, path: str) -> None:
+        self.path = str(path)
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self._mmap)
+        if self.view[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"Not an entity store: {path}")
+        (header_len,) = struct.unpack_from("<Q", self._mmap, len(MAGIC))
+        start = len(MAGIC) + 8
+        self.header = json.loads(bytes(self.view[start : start + header_len]))
+        if self.header.get("version") != STORE_VERSION:
+            raise ValueError(
+                f"Entity store {path} has an older format; "
+                "rebuild it with transform --format store"
+            )
+        self.count = self.header["count"]
+        self.body = _align(start + header_len)
+
+    @classmethod
+    def open(cls, path: str) -> "EntityStore":
+        """Open a store, reusing this process's mapping of the same file."""
+        st = os.stat(path)
+        key = (os.path.realpath(path), st.st_ino, st.st_mtime_ns)
+        store = _OPEN.get(key)
+        if store is None:
+            store = _OPEN[key] = cls(path)
+        return store
+
+    def __len__(self) -> int:
+        return self.count
+
+    def column(self, name: str) -> StoreColumn:
+        """Return one column as a lazily decoded sequence of strings."""
+        return StoreColumn(self, name)
+
+    def iter_entities(self) -> Iterator[Dict[str, Any]]:
+        """Yield every entity as a dict of its stored (non-empty optional) columns."""
+        columns = [self.column(c) for c in STORE_COLUMNS]
+        for values in zip(*columns):
+            entity: Dict[str, Any] = dict(zip(STORE_COLUMNS, values))
+            for c in OPTIONAL_COLUMNS:
+                if not entity[c]:
+                    del entity[c]
+            if "aliases" in entity:
+                entity["aliases"] = entity["aliases"].split(LIST_SEP)
+            yield entity
@@ -0,0 +1,303 @@
+from pathlib import Path
+from bisect import bisect_right
+import csv
+import pickle
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import metrics
+from .index import PackedStrings, _iter_entities, file_digest
+from .normalize import normalize_name, normalize_query
+
+try:
+    import ahocorasick  # pyahocorasick: C multi-pattern string matching
+except ImportError:
+    ahocorasick = None
+
+__all__ = ["TextAutomaton", "build_automaton", "load_automaton", "screen_text"]
+
+# Bump whenever the pickled layout or key normalization changes
+AUTOMATON_VERSION = 2
+
+# Shortest entity key compiled into the automaton; shorter ones hit everywhere
+MIN_LENGTH = 3
+
+TEXT_FIELDS = [
+    "match_name",
+    "match_schema",
+    "match_id",
+    "match_text",
+    "match_start",
+    "match_end",
+]
+
+# Output rows buffered before each csv writerows() call
+WRITE_BATCH = 1024
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+def _normalize_text(text: str) -> Tuple[str, List[int], List[Tuple[int, int]]]:
+    """
+    Normalize free text word by word, keeping a map back to the original.
+
+    Every word is folded with the (cached) query normalizer and the results
+    are joined with single spaces, which for space-separated scripts is what
+    `normalize_name` gives for the whole text. Memos repeat the same words
+    heavily, so the per-word cache makes this cheap.
+
+    Returns:
+        Tuple[str, List[int], List[Tuple[int, int]]]: The normalized text, the
+        start of each word in it, and each word's (start, end) in `text`
+    """
+    parts: List[str] = []
+    starts: List[int] = []
+    spans: List[Tuple[int, int]] = []
+    pos = 0
+    for m in _WORD.finditer(text):
+        word = normalize_query(m.group())
+        if not word:
+            continue
+        parts.append(word)
+        starts.append(pos)
+        spans.append(m.span())
+        pos += len(word) + 1
+    return " ".join(parts), starts, spans
+
+
+class TextAutomaton:
+    """
+    Aho-Corasick automaton over every entity's normalized names and aliases.
+
+    A text is scanned once, however many names are compiled in; hits are
+    kept only where they start and end on word boundaries, so "ali" does not
+    fire inside "alibaba". Entities sharing a key share one pattern, and an
+    alias hit reports the entity it belongs to.
+    """
+
+    def __init__(self, min_length: int = MIN_LENGTH) -> None:
+        if ahocorasick is None:
+            raise RuntimeError(
+                "pyahocorasick required for text screening. Run: uv sync --extra text"
+            )
+        self.min_length = min_length
+        self.automaton = ahocorasick.Automaton()
+        self.ids = PackedStrings()
+        self.names = PackedStrings()
+        self.schemas: List[str] = []
+        self.source_digest: Optional[str] = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(self, entity: Dict[str, Any]) -> None:
+        """Compile one entity's names in (call `finish` after the last one)."""
+        key = entity.get("name_key") or entity.get("key")
+        if key is None:
+            key = normalize_name(entity.get("name"))
+        keys = [key]
+        for alias in entity.get("aliases") or ():
+            alias_key = normalize_name(alias)
+            if alias_key not in keys:
+                keys.append(alias_key)
+        keys = [k for k in keys if len(k) >= self.min_length]
+        if not keys:
+            return
+
+        ordinal = len(self.ids)
+        self.ids.append(str(entity.get("id") or ""))
+        self.names.append(entity.get("name") or "")
+        self.schemas.append(entity.get("schema") or "")
+        for key in keys:
+            # Value: (key length, ordinals of every entity with this key)
+            _, ordinals = self.automaton.get(key, (len(key), ()))
+            self.automaton.add_word(key, (len(key), ordinals + (ordinal,)))
+
+    def finish(self) -> None:
+        """Build the automaton's failure links; no names can be added after."""
+        self.automaton.make_automaton()
+
+    def scan(self, text: Optional[str]) -> List[Tuple[int, int, int]]:
+        """
+        Find every entity whose name appears in the text.
+
+        Args:
+            text: Raw free text (a payment memo, an address, ...)
+
+        Returns:
+            List[Tuple[int, int, int]]: (entity ordinal, start, end) per hit,
+            with `text[start:end]` the matched words; ordered by end position
+        """
+        if not text or not len(self):
+            return []
+        norm, starts, spans = _normalize_text(text)
+        hits = []
+        for last, (length, ordinals) in self.automaton.iter(norm):
+            first = last - length + 1
+            if first > 0 and norm[first - 1] != " ":
+                continue
+            if last + 1 < len(norm) and norm[last + 1] != " ":
+                continue
+            start = spans[bisect_right(starts, first) - 1][0]
+            end = spans[bisect_right(starts, last) - 1][1]
+            hits.extend((ordinal, start, end) for ordinal in ordinals)
+        return hits
+
+    def save(self, path: str) -> None:
+        """Write the compiled automaton to disk."""
+        p = Path(path)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        state = {"version": AUTOMATON_VERSION, **self.__dict__}
+        tmp = p.with_name(p.name + ".tmp")
+        with tmp.open("wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp.replace(p)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["TextAutomaton"]:
+        """Read an automaton from disk (None if written by another version)."""
+        with Path(path).open("rb") as f:
+            state = pickle.load(f)
+        if state.pop("version", None) != AUTOMATON_VERSION:
+            return None
+        automaton = cls.__new__(cls)
+        automaton.__dict__.update(state)
+        return automaton
+
+
+def build_automaton(entities_jsonl: str, min_length: int = MIN_LENGTH) -> TextAutomaton:
+    """
+    Compile the names of an entities file (JSONL, Parquet or store).
+
+    Args:
+        entities_jsonl: Entities file produced by `transform`
+        min_length: Shortest normalized name compiled in
+
+    Returns:
+        TextAutomaton: Automaton over every name of at least `min_length`
+    """
+    automaton = TextAutomaton(min_length)
+    for entity in _iter_entities(entities_jsonl):
+        automaton.add(entity)
+    automaton.finish()
+    automaton.source_digest = file_digest(entities_jsonl)
+    return automaton
+
+
+def load_automaton(
+    entities_jsonl: str,
+    automaton_path: Optional[str] = None,
+    min_length: int = MIN_LENGTH,
+) -> TextAutomaton:
+    """
+    Load a cached automaton, recompiling it when missing or stale.
+
+    Like `load_index`, the cache records a digest of the entities file it was
+    compiled from and is rebuilt (and saved) when that file changes.
+
+    Args:
+        entities_jsonl: Entities file
+        automaton_path: Where the automaton is cached (None keeps it in memory only)
+        min_length: Shortest normalized name compiled in
+
+    Returns:
+        TextAutomaton: Automaton matching the current entities file
+    """
+    if automaton_path is None:
+        return build_automaton(entities_jsonl, min_length)
+
+    p = Path(automaton_path)
+    if p.exists():
+        automaton = TextAutomaton.load(automaton_path)
+        if (
+            automaton is not None
+            and automaton.min_length == min_length
+            and automaton.source_digest == file_digest(entities_jsonl)
+        ):
+            return automaton
+
+    automaton = build_automaton(entities_jsonl, min_length)
+    automaton.save(automaton_path)
+    return automaton
+
+
+def _hit_rows(automaton: TextAutomaton, row: Dict, column: str) -> List[Dict]:
+    """One output row per hit in the row's text column."""
+    text = row.get(column) or ""
+    return [
+        {
+            **row,
+            "match_name": automaton.names[ordinal],
+            "match_schema": automaton.schemas[ordinal],
+            "match_id": automaton.ids[ordinal],
+            "match_text": text[start:end],
+            "match_start": start,
+            "match_end": end,
+        }
+        for ordinal, start, end in automaton.scan(text)
+    ]
+
+
+def screen_text(
+    input_csv: str,
+    entities_jsonl: str,
+    output_csv: str,
+    column: str = "text",
+    automaton_path: Optional[str] = None,
+    min_length: int = MIN_LENGTH,
+) -> Dict[str, int]:
+    """
+    Find listed names inside a free-text column of a CSV.
+
+    Each text is normalized like entity names and scanned once by an
+    Aho-Corasick automaton over all of them. Every hit becomes one output row:
+    the input columns plus the entity, the matched text and its character
+    offsets (`match_start`/`match_end`) in the original field. Rows without
+    hits are not written.
+
+    Args:
+        input_csv: CSV file with a free-text column
+        entities_jsonl: Entities file (JSONL, Parquet or store)
+        output_csv: Output CSV with one row per hit
+        column: Name of the free-text column
+        automaton_path: Optional on-disk cache of the compiled automaton
+        min_length: Shortest normalized name compiled in
+
+    Returns:
+        Dict[str, int]: Counts of "rows" read, "matched" rows and "hits"
+
+    Raises:
+        ValueError: If the input has no such column
+    """
+    automaton = load_automaton(entities_jsonl, automaton_path, min_length)
+
+    pout = Path(output_csv)
+    pout.parent.mkdir(parents=True, exist_ok=True)
+    counts = {"rows": 0, "matched": 0, "hits": 0}
+
+    with (
+        open(input_csv, "r", encoding="utf-8", newline="") as fin,
+        pout.open("w", encoding="utf-8", newline="") as fout,
+    ):
+        reader = csv.DictReader(fin)
+        fields = list(reader.fieldnames or [])
+        if column not in fields:
+            raise ValueError(f"No column {column!r} in {input_csv}")
+        writer = csv.DictWriter(fout, fields + TEXT_FIELDS)
+        writer.writeheader()
+
+        out: List[Dict] = []
+        for row in reader:
+            counts["rows"] += 1
+            hits = _hit_rows(automaton, row, column)
+            if hits:
+                counts["matched"] += 1
+                counts["hits"] += len(hits)
+                out.extend(hits)
+            if len(out) >= WRITE_BATCH:
+                writer.writerows(out)
+                out.clear()
+        writer.writerows(out)
+
+    metrics.count(counts)
+    return counts
@@ -1,37 +1,93 @@
 from pathlib import Path
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice
 import csv
+import hashlib
 import json
-from typing import Dict, Iterable, Any
-from followthemoney import model
-
-# Try to import JSONEncoder from the most common location
-try:
-    from followthemoney.export.json import JSONEncoder
-except Exception:
-    # Fallback to alternate location for different FTM versions
+import os
+import re
+from typing import Dict, Iterable, Iterator, Any, Callable, List, Optional, Tuple
+from typing import TYPE_CHECKING
+
+from .index import file_digest
+from .normalize import normalize_name
+from .store import write_store
+from .writers import EntityWriter, JsonlWriter, ParquetWriter
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# followthemoney, openpyxl and pandas take most of a second to import between
+# them, so each is imported on first use by the paths that need it (FTM
+# output, .xlsx input, .xls/columnar) rather than by every CLI run.
+
+
+def _make_id(*parts):
+    """Fallback implementation for deterministic ID generation."""
+    return "id-" + "-".join(str(p) for p in parts if p is not None)
+
+
+@lru_cache(maxsize=None)
+def _ftm() -> Tuple[Any, Any, Callable[..., str]]:
+    """
+    Import FollowTheMoney for FTM output.
+
+    Returns:
+        Tuple: (model, JSONEncoder or None, make_id)
+    """
+    from followthemoney import model
+
+    # Try to import JSONEncoder from the most common location
+    try:
+        from followthemoney.export.json import JSONEncoder
+    except Exception:
+        # Fallback to alternate location for different FTM versions
+        try:
+            from followthemoney.export.jsonv2 import JSONEncoder
+        except Exception:
+            # Handle missing import gracefully
+            JSONEncoder = None
+
+    # Deterministic ID helper (use FollowTheMoney's make_id if available)
     try:
-        from followthemoney.export.jsonv2 import JSONEncoder
+        from followthemoney.helpers import make_id
     except Exception:
-        # Handle missing import gracefully
-        JSONEncoder = None
+        make_id = _make_id
+
+    return model, JSONEncoder, make_id
+
+
+def _openpyxl():
+    """Import openpyxl (streaming .xlsx reader) on first use."""
+    try:
+        import openpyxl
+    except ImportError:
+        raise RuntimeError("openpyxl required for .xlsx. Run: uv add openpyxl")
+    return openpyxl
 
 
-# Deterministic ID helper (use FollowTheMoney's make_id if available)
-try:
-    # Attempt to use FollowTheMoney's built-in ID generator
-    from followthemoney.helpers import make_id
-except Exception:
-    # Fallback implementation for deterministic ID generation
-    def make_id(*parts):
-        return "id-" + "-".join(str(p) for p in parts if p is not None)
+def _pandas(message: str):
+    """Import pandas on first use, raising RuntimeError(message) without it."""
+    try:
+        import pandas as pd
+    except ImportError:
+        raise RuntimeError(message)
+    return pd
 
 
-try:
-    import pandas as pd  # for .xlsx support
-except ImportError:
-    pd = None
+__all__ = [
+    "transform_to_simple_jsonl",
+    "transform_csv_to_ftm",
+    "transform_to_store",
+    "transform_to_parquet",
+    "transform_incremental",
+    "transform_columnar",
+]
 
-__all__ = ["transform_to_simple_jsonl", "transform_csv_to_ftm"]
+# Rows per batch handed to a worker process in parallel mode
+BATCH_SIZE = 2000
 
 
 def _iter_rows_from_csv(path: Path) -> Iterable[Dict[str, Any]]:
@@ -50,9 +106,81 @@ def _iter_rows_from_csv(path: Path) -> Iterable[Dict[str, Any]]:
             yield row
 
 
+def _excel_header(cells: Iterable[Any]) -> List[Any]:
+    """Name header cells the way pandas does: blanks and duplicates get unique names."""
+    header: List[Any] = []
+    seen: Dict[Any, int] = {}
+    for i, cell in enumerate(cells):
+        name = f"Unnamed: {i}" if cell is None else cell
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        header.append(name)
+    return header
+
+
+def _excel_cell(value: Any) -> str:
+    """Format a cell value the way pandas' openpyxl reader does with dtype=str."""
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        # pandas turns integral numeric cells into ints ("1e+20" -> "100...0")
+        value = int(value)
+    return str(value)
+
+
+def _iter_rows_from_xlsx(path: Path) -> Iterable[Dict[str, Any]]:
+    """
+    Stream rows from the first sheet of an .xlsx file with bounded memory.
+
+    Uses openpyxl's read-only mode, which parses the sheet XML incrementally
+    instead of loading the workbook. Rows come out like the pandas reader's:
+    every value as a string formatted the same way ("" for empty cells,
+    integral numbers without a fraction, booleans as "True"/"False"), blank
+    rows in the middle kept and trailing blank rows dropped, so `row-{idx}`
+    ids don't shift.
+
+    Args:
+        path: Path to the .xlsx file
+
+    Yields:
+        Dict[str, Any]: Dictionary representing each row in the sheet
+
+    Raises:
+        RuntimeError: If openpyxl is not installed
+    """
+    openpyxl = _openpyxl()
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb.worksheets[0].iter_rows(values_only=True)
+        header = _excel_header(next(rows, ()))
+        width = len(header)
+        blank = {k: "" for k in header}
+        pending_blank = 0
+
+        for cells in rows:
+            values = [_excel_cell(v) for v in cells[:width]]
+            if not any(values):
+                # Only emitted once a non-blank row follows (pandas drops trailing ones)
+                pending_blank += 1
+                continue
+            for _ in range(pending_blank):
+                yield dict(blank)
+            pending_blank = 0
+            values += [""] * (width - len(values))
+            yield dict(zip(header, values))
+    finally:
+        wb.close()
+
+
 def _iter_rows_from_excel(path: Path) -> Iterable[Dict[str, Any]]:
     """
-    Iterate over rows in an Excel file, yielding each row as a dictionary.
+    Iterate over rows in an Excel file via pandas, yielding each row as a dictionary.
+
+    Loads the whole sheet into memory; used for legacy .xls files, which the
+    streaming .xlsx reader cannot open.
 
     Args:
         path: Path to the Excel file
@@ -63,10 +191,7 @@ def _iter_rows_from_excel(path: Path) -> Iterable[Dict[str, Any]]:
     Raises:
         RuntimeError: If pandas is not installed
     """
-    if pd is None:
-        raise RuntimeError(
-            "pandas/openpyxl required for Excel. Run: uv add pandas openpyxl"
-        )
+    pd = _pandas("pandas/openpyxl required for Excel. Run: uv add pandas openpyxl")
     df = pd.read_excel(path, dtype=str).fillna("")
     for _, row in df.iterrows():
         yield {k: str(v) for k, v in row.items()}
@@ -87,11 +212,47 @@ def _row_iter(input_path: str) -> Iterable[Dict[str, Any]]:
     """
     inp = Path(input_path)
     ext = inp.suffix.lower()
-    if ext in (".xlsx", ".xls"):
+    if ext == ".xlsx":
+        return _iter_rows_from_xlsx(inp)
+    if ext == ".xls":
         return _iter_rows_from_excel(inp)
     return _iter_rows_from_csv(inp)
 
 
+# Source columns (lowercased) for each normalized field, in order of preference
+FIELD_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "name": (
+        "name",
+        "listed_name",
+        "entity_name",
+        "full_name",
+        "individual_name",
+        "name of individual or entity",
+    ),
+    "sdn_type": ("sdntype", "type", "entity_type", "individual"),
+    "program": (
+        "program",
+        "regime",
+        "listing_program",
+        "sanctions_regime",
+        "committees",
+    ),
+    "remarks": (
+        "remarks",
+        "comments",
+        "reason",
+        "additional_information",
+        "listing information",
+    ),
+    "aliases": ("aliases", "alias", "aka", "a.k.a.", "alternative names"),
+    "birth_date": ("date of birth", "date_of_birth", "dob", "birth_date", "birthdate"),
+    "country": ("citizenship", "nationality", "country"),
+}
+
+# Separators between the values of a multi-valued cell (aliases)
+_MULTI_VALUE = re.compile(r"\s*[;|]\s*")
+
+
 def _normalize_row(row: Dict[str, Any]) -> Dict[str, str]:
     """Normalize a row of data by cleaning and standardizing field names."""
     r = {
@@ -99,54 +260,235 @@ def _normalize_row(row: Dict[str, Any]) -> Dict[str, str]:
         for k, v in row.items()
     }
 
-    name = (
-        r.get("name")
-        or r.get("listed_name")
-        or r.get("entity_name")
-        or r.get("full_name")
-        or r.get("individual_name")
-        or r.get("name of individual or entity")
-        or ""
-    )
-    sdn_type = (
-        r.get("sdntype")
-        or r.get("type")
-        or r.get("entity_type")
-        or r.get("individual")
-        or ""
-    )
-    program = (
-        r.get("program")
-        or r.get("regime")
-        or r.get("listing_program")
-        or r.get("sanctions_regime")
-        or r.get("committees")
-        or ""
-    )
-    remarks = (
-        r.get("remarks")
-        or r.get("comments")
-        or r.get("reason")
-        or r.get("additional_information")
-        or r.get("listing information")
-        or ""
-    )
-
+    # First non-empty source column per field
     return {
+        field: next((r[c] for c in columns if r.get(c)), "")
+        for field, columns in FIELD_COLUMNS.items()
+    }
+
+
+def _schema_for(r: Dict[str, str]) -> str:
+    """Pick the entity schema from a normalized row's type."""
+    return "Person" if "individual" in (r["sdn_type"] or "").lower() else "Organization"
+
+
+def _notes_for(r: Dict[str, str]) -> List[str]:
+    """Collect program and remarks of a normalized row as note strings."""
+    notes = []
+    if r["program"]:
+        notes.append(f"Program: {r['program']}")
+    if r["remarks"]:
+        notes.append(r["remarks"])
+    return notes
+
+
+def _aliases_for(r: Dict[str, str]) -> List[str]:
+    """Split a normalized row's aliases, without blanks or repeats of the name."""
+    aliases: List[str] = []
+    for alias in _MULTI_VALUE.split(r["aliases"]):
+        if alias and alias != r["name"] and alias not in aliases:
+            aliases.append(alias)
+    return aliases
+
+
+def _attributes_for(r: Dict[str, str]) -> Dict[str, Any]:
+    """The aliases, birth date and country of a normalized row, where present."""
+    attributes: Dict[str, Any] = {}
+    aliases = _aliases_for(r)
+    if aliases:
+        attributes["aliases"] = aliases
+    birth_date = r["birth_date"]
+    if birth_date:
+        # Excel dates come back as datetimes; keep just the date
+        attributes["birth_date"] = birth_date.removesuffix(" 00:00:00")
+    if r["country"]:
+        attributes["country"] = r["country"]
+    return attributes
+
+
+def _simple_entity(idx: int, r: Dict[str, str]) -> Optional[Dict[str, str]]:
+    """Build the simple entity dict for one normalized row (None if it has no name)."""
+    name = r["name"]
+    if not name:
+        return None
+
+    # Create entity
+    entity = {
+        "schema": _schema_for(r),
+        "id": f"row-{idx}",
         "name": name,
-        "sdn_type": sdn_type,
-        "program": program,
-        "remarks": remarks,
+        # Matching key, computed once here rather than on every index build
+        "name_key": normalize_name(name),
     }
 
+    # Add notes if available
+    notes = _notes_for(r)
+    if notes:
+        entity["notes"] = "; ".join(notes)
+
+    entity.update(_attributes_for(r))
+    return entity
+
+
+def _simple_line(idx: int, r: Dict[str, str]) -> Optional[Tuple[str, str]]:
+    """Build (id, simple JSONL line) for one normalized row (None if it has no name)."""
+    entity = _simple_entity(idx, r)
+    if entity is None:
+        return None
+    return entity["id"], json.dumps(entity) + "\n"
+
+
+def _simple_record(idx: int, r: Dict[str, str]) -> Optional[Tuple[str, Dict[str, str]]]:
+    """Build (id, simple entity dict) for one normalized row (None if it has no name)."""
+    entity = _simple_entity(idx, r)
+    if entity is None:
+        return None
+    return entity["id"], entity
+
+
+def _store_record(idx: int, r: Dict[str, str]) -> Optional[Tuple[str, Dict[str, str]]]:
+    """Build (id, entity store record) for one normalized row (None if it has no name)."""
+    entity = _simple_entity(idx, r)
+    if entity is None:
+        return None
+    entity["key"] = entity.pop("name_key")
+    return entity["id"], entity
+
+
+def _ftm_line(idx: int, r: Dict[str, str]) -> Optional[Tuple[str, str]]:
+    """Build (id, FollowTheMoney JSONL line) for one normalized row (None if no name)."""
+    name = r["name"]
+    if not name:
+        return None
 
-def transform_to_simple_jsonl(input_path: str, output_path: str) -> int:
+    schema = _schema_for(r)
+    model, JSONEncoder, make_id = _ftm()
+
+    # Create FTM entity
+    # Create entity using appropriate method
+    try:
+        # Attempt to create entity using modern FTM API
+        ent = model.make_entity(schema)
+    except Exception:
+        # Fallback to EntityProxy for older FTM versions
+        from followthemoney.proxy import EntityProxy
+
+        ent = EntityProxy(model.get(schema))
+
+    # Set a deterministic id (same input -> same id)
+    ent.id = make_id("row", idx, name)
+
+    # Add name property
+    ent.add("name", name)
+
+    # Add notes if any were found
+    notes = _notes_for(r)
+    if notes:
+        ent.add("notes", "; ".join(notes))
+
+    # Multi-valued: every alias is its own value
+    attributes = _attributes_for(r)
+    for alias in attributes.get("aliases", ()):
+        ent.add("alias", alias)
+    if schema == "Person":
+        ent.add("birthDate", attributes.get("birth_date"))
+        ent.add("nationality", attributes.get("country"))
+    else:
+        ent.add("country", attributes.get("country"))
+
+    if JSONEncoder is not None:
+        # Use FollowTheMoney JSON encoder if available
+        return ent.id, JSONEncoder.to_line(ent)
+    # Fallback to basic JSON representation
+    return ent.id, json.dumps(ent.to_dict()) + "\n"
+
+
+# Builds (entity id, output line or record) from (row index, normalized row)
+LineBuilder = Callable[[int, Dict[str, str]], Optional[Tuple[str, Any]]]
+
+
+def _build_batch(
+    make_line: LineBuilder, batch: List[Tuple[int, Dict[str, Any]]]
+) -> List[str]:
+    """Build the output lines for a batch of (idx, row) pairs."""
+    lines = []
+    for idx, row in batch:
+        built = make_line(idx, _normalize_row(row))
+        if built is not None:
+            lines.append(built[1])
+    return lines
+
+
+def _batches(
+    rows: Iterable[Dict[str, Any]], size: int
+) -> Iterator[List[Tuple[int, Dict[str, Any]]]]:
+    """Group enumerated rows into lists of at most `size` (idx, row) pairs."""
+    it = enumerate(rows)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _iter_lines(
+    input_path: str,
+    make_line: LineBuilder,
+    workers: int = 1,
+) -> Iterator[str]:
+    """
+    Yield output lines for every named row, in input order.
+
+    With several workers, row batches are built on a process pool. At most a
+    few batches per worker are in flight and results are consumed in
+    submission order, so memory stays bounded and the output is identical to
+    the serial run (ids depend only on the row index).
+    """
+    rows = _row_iter(input_path)
+    if workers <= 1:
+        for idx, row in enumerate(rows):
+            built = make_line(idx, _normalize_row(row))
+            if built is not None:
+                yield built[1]
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: deque = deque()
+        for batch in _batches(rows, BATCH_SIZE):
+            pending.append(pool.submit(_build_batch, make_line, batch))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def _write_entities(
+    input_path: str,
+    make_line: LineBuilder,
+    open_writer: Callable[[], EntityWriter],
+    workers: int = 1,
+) -> int:
+    """Feed every built entity to a writer, in input order; return the count."""
+    try:
+        with open_writer() as writer:
+            for item in _iter_lines(input_path, make_line, workers):
+                writer.write(item)
+        return writer.count
+
+    except Exception as e:
+        raise Exception(f"Error during transformation: {str(e)}")
+
+
+def transform_to_simple_jsonl(
+    input_path: str, output_path: str, workers: int = 1
+) -> int:
     """
     Transform input CSV/Excel file to simple JSONL format.
 
     Args:
         input_path: Path to input CSV/Excel file
         output_path: Path where output JSONL file will be written
+        workers: Number of processes building entities (output is identical)
 
     Returns:
         int: Number of entities written
@@ -154,57 +496,77 @@ def transform_to_simple_jsonl(input_path: str, output_path: str) -> int:
     Raises:
         Exception: If any error occurs during transformation
     """
-    out = Path(output_path)
-    out.parent.mkdir(parents=True, exist_ok=True)
-    count = 0
+    return _write_entities(
+        input_path, _simple_line, lambda: JsonlWriter(output_path), workers
+    )
 
-    try:
-        with out.open("w", encoding="utf-8") as jsonl:
-            for idx, row in enumerate(_row_iter(input_path)):
-                r = _normalize_row(row)
-                name = r["name"]
-                if not name:
-                    continue
 
-                # Determine schema type
-                schema = (
-                    "Person"
-                    if "individual" in (r["sdn_type"] or "").lower()
-                    else "Organization"
-                )
-
-                # Create entity
-                entity = {
-                    "schema": schema,
-                    "id": f"row-{idx}",
-                    "name": name,
-                }
-
-                # Add notes if available
-                notes = []
-                if r["program"]:
-                    notes.append(f"Program: {r['program']}")
-                if r["remarks"]:
-                    notes.append(r["remarks"])
-                if notes:
-                    entity["notes"] = "; ".join(notes)
-
-                # Write to JSONL
-                jsonl.write(json.dumps(entity) + "\n")
-                count += 1
-        return count
+def transform_to_parquet(
+    input_path: str,
+    output_path: str,
+    workers: int = 1,
+    row_group_size: Optional[int] = None,
+) -> int:
+    """
+    Transform input CSV/Excel file to a Parquet file of simple entities.
+
+    Holds the same entities as the simple JSONL output, one string column per
+    field (id, schema, name, name_key, notes), written in row groups of
+    `row_group_size` entities. `screen`, `index` and `validate` read it in
+    place of a JSONL file.
+
+    Args:
+        input_path: Path to input CSV/Excel file
+        output_path: Path where the Parquet file will be written
+        workers: Number of processes building entities (output is identical)
+        row_group_size: Entities per row group (defaults to the writer's)
 
+    Returns:
+        int: Number of entities written
+
+    Raises:
+        Exception: If any error occurs during transformation (including
+            missing pyarrow)
+    """
+    opts = {} if row_group_size is None else {"row_group_size": row_group_size}
+    return _write_entities(
+        input_path, _simple_record, lambda: ParquetWriter(output_path, **opts), workers
+    )
+
+
+def transform_to_store(input_path: str, output_path: str, workers: int = 1) -> int:
+    """
+    Transform input CSV/Excel file to a memory-mappable entity store.
+
+    The store holds the same entities as the simple JSONL output (id, name,
+    schema, plus the normalized match key) in columnar form; `screen` and
+    `index` accept it in place of a JSONL file and skip JSON parsing.
+
+    Args:
+        input_path: Path to input CSV/Excel file
+        output_path: Path where the store will be written
+        workers: Number of processes building entities (output is identical)
+
+    Returns:
+        int: Number of entities written
+
+    Raises:
+        Exception: If any error occurs during transformation
+    """
+    try:
+        return write_store(_iter_lines(input_path, _store_record, workers), output_path)
     except Exception as e:
         raise Exception(f"Error during transformation: {str(e)}")
 
 
-def transform_csv_to_ftm(input_path: str, output_path: str) -> int:
+def transform_csv_to_ftm(input_path: str, output_path: str, workers: int = 1) -> int:
     """
     Transform input CSV/Excel file to FollowTheMoney JSONL format.
 
     Args:
         input_path: Path to input CSV/Excel file
         output_path: Path where output JSONL file will be written
+        workers: Number of processes building entities (output is identical)
 
     Returns:
         int: Number of entities written
@@ -212,66 +574,294 @@ def transform_csv_to_ftm(input_path: str, output_path: str) -> int:
     Raises:
         Exception: If any error occurs during transformation
     """
+    # Import once here, so forked workers don't each import it again
+    _ftm()
+    return _write_entities(
+        input_path, _ftm_line, lambda: JsonlWriter(output_path), workers
+    )
+
+
+# Rows per pandas chunk in columnar mode
+COLUMNAR_CHUNK_ROWS = 100_000
+
+
+def _column_plan(header: List[str]) -> Dict[str, List[int]]:
+    """
+    Resolve, once per file, which column positions feed each normalized field.
+
+    Mirrors `_normalize_row`: headers are compared stripped and lowercased,
+    and when two headers collide the later column wins.
+    """
+    position = {str(h).strip().lower(): i for i, h in enumerate(header)}
+    return {
+        field: [position[c] for c in columns if c in position]
+        for field, columns in FIELD_COLUMNS.items()
+    }
+
+
+def _first_non_empty(chunk: "pd.DataFrame", positions: List[int]) -> "pd.Series":
+    """Per row, the first non-empty (stripped) value among the given columns."""
+    if not positions:
+        import pandas as pd  # already loaded by transform_columnar
+
+        return pd.Series("", index=chunk.index, dtype=object)
+    out = chunk[positions[0]].str.strip()
+    for pos in positions[1:]:
+        out = out.where(out != "", chunk[pos].str.strip())
+    return out
+
+
+def _columnar_lines(chunk: "pd.DataFrame", plan: Dict[str, List[int]], start: int):
+    """Build the simple JSONL lines for one chunk of raw CSV columns."""
+    from json.encoder import encode_basestring_ascii as enc
+
+    chunk = chunk.fillna("")
+    name = _first_non_empty(chunk, plan["name"])
+    sdn_type = _first_non_empty(chunk, plan["sdn_type"])
+    program = _first_non_empty(chunk, plan["program"])
+    remarks = _first_non_empty(chunk, plan["remarks"])
+
+    schema = sdn_type.str.lower().str.contains("individual", regex=False)
+    schema = schema.map({True: "Person", False: "Organization"})
+    program = ("Program: " + program).where(program != "", "")
+    notes = (program + "; " + remarks).where((program != "") & (remarks != ""))
+    notes = notes.fillna(program + remarks)
+
+    aliases = _first_non_empty(chunk, plan["aliases"])
+    birth_date = _first_non_empty(chunk, plan["birth_date"])
+    country = _first_non_empty(chunk, plan["country"])
+    has_attributes = (aliases != "") | (birth_date != "") | (country != "")
+
+    # Plain lists iterate far faster than Series
+    keep = (name != "").tolist()
+    idx = range(start, start + len(chunk))
+    columns = (schema.tolist(), name.tolist(), notes.tolist())
+    attrs = zip(
+        has_attributes.tolist(), *(c.tolist() for c in (aliases, birth_date, country))
+    )
+    for ok, i, sc, nm, nt, (has, al, bd, co) in zip(keep, idx, *columns, attrs):
+        if not ok:
+            continue
+        extra = f', "notes": {enc(nt)}' if nt else ""
+        if has:
+            # Alias splitting and date cleanup are shared with the per-row path
+            r = {"name": nm, "aliases": al, "birth_date": bd, "country": co}
+            attributes = _attributes_for(r)
+            if attributes:
+                extra += ", " + json.dumps(attributes)[1:-1]
+        yield (
+            f'{{"schema": "{sc}", "id": "row-{i}", "name": {enc(nm)}, '
+            f'"name_key": {enc(normalize_name(nm))}{extra}}}\n'
+        )
+
+
+def transform_columnar(
+    input_path: str, output_path: str, chunk_rows: int = COLUMNAR_CHUNK_ROWS
+) -> int:
+    """
+    Transform a CSV file to simple JSONL with column operations per chunk.
+
+    The header-to-field mapping is resolved once per file. Each chunk of
+    `chunk_rows` rows is read by pandas as string columns, and field
+    fallbacks, Person/Organization classification and notes are computed as
+    column operations; only serialization (and the name key) runs per row.
+    The output is byte-identical to `transform_to_simple_jsonl`, which a file
+    with ragged rows pandas can't read this way is handed to instead.
+
+    Args:
+        input_path: Path to input CSV file
+        output_path: Path where output JSONL file will be written
+        chunk_rows: Rows per chunk (bounds memory)
+
+    Returns:
+        int: Number of entities written
+
+    Raises:
+        Exception: If any error occurs during transformation (including a
+            non-CSV input or missing pandas)
+    """
     out = Path(output_path)
     out.parent.mkdir(parents=True, exist_ok=True)
     count = 0
 
     try:
-        with out.open("w", encoding="utf-8") as jsonl:
+        pd = _pandas("pandas required for columnar mode. Run: uv add pandas")
+        if Path(input_path).suffix.lower() != ".csv":
+            raise ValueError(f"Columnar mode reads CSV only, got {input_path}")
+
+        with open(input_path, "r", newline="", encoding="utf-8") as f:
+            header = next(csv.reader(f), [])
+        plan = _column_plan(header)
+
+        chunks = pd.read_csv(
+            input_path,
+            header=None,
+            skiprows=1,
+            names=range(len(header)),
+            usecols=sorted({p for positions in plan.values() for p in positions}),
+            dtype=str,
+            keep_default_na=False,
+            na_filter=False,
+            encoding="utf-8",
+            chunksize=chunk_rows,
+        )
+        start = 0
+        try:
+            with out.open("w", encoding="utf-8") as jsonl:
+                for chunk in chunks:
+                    for line in _columnar_lines(chunk, plan, start):
+                        jsonl.write(line)
+                        count += 1
+                    start += len(chunk)
+        except pd.errors.ParserError:
+            # A chunk of only short (ragged) rows can't be read with usecols;
+            # the row path pads them like csv.DictReader
+            return transform_to_simple_jsonl(input_path, output_path)
+        return count
+
+    except Exception as e:
+        raise Exception(f"Error during transformation: {str(e)}")
+
+
+# Bump when entity building changes, so every row is re-emitted once
+STATE_VERSION = 2
+
+_LINE_BUILDERS: Dict[str, LineBuilder] = {"jsonl": _simple_line, "ftm": _ftm_line}
+
+
+def _fingerprint(r: Dict[str, str]) -> str:
+    """Stable short hash of a normalized row."""
+    payload = json.dumps(r, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha1(payload).hexdigest()[:16]
+
+
+def _load_state(state_path: Path, snapshot: Path, fmt: str) -> List[List[Any]]:
+    """
+    Read the previous run's per-entity state, or [] if it can't be reused.
+
+    State rows are [row index, fingerprint, entity id], one per line of the
+    previous snapshot and in the same order. The state also records the
+    snapshot's digest: a snapshot edited, replaced or restored since (so the
+    rows no longer line up with it) makes this a cold start.
+    """
+    if not (state_path.exists() and snapshot.exists()):
+        return []
+    state = json.loads(state_path.read_text(encoding="utf-8"))
+    if state.get("version") != STATE_VERSION or state.get("format") != fmt:
+        return []
+    if state.get("digest") != file_digest(str(snapshot)):
+        return []
+    return state["rows"]
+
+
+def _delta_line(op: str, entity_id: str, line: Optional[str] = None) -> str:
+    """One delta record; the entity JSON is spliced in without re-parsing."""
+    head = f'{{"op": "{op}", "id": {json.dumps(entity_id)}'
+    if line is None:
+        return head + "}\n"
+    return f'{head}, "entity": {line.rstrip()}}}\n'
+
+
+def transform_incremental(
+    input_path: str, output_path: str, format: str = "jsonl"
+) -> Dict[str, int]:
+    """
+    Transform an input file, rebuilding only entities whose source rows changed.
+
+    Each named row is fingerprinted from its `_normalize_row` output and the
+    fingerprints are kept in a state file next to the snapshot
+    (`entities.state.json`). On the next run, rows with an unchanged
+    fingerprint reuse their line from the previous snapshot instead of being
+    rebuilt, and a delta (`entities.delta.jsonl`) lists the added, updated and
+    deleted entities. Like the ids, rows are matched by their row index.
+
+    Args:
+        input_path: Path to input CSV/Excel file
+        output_path: Path of the full JSONL snapshot (rewritten every run)
+        format: Output format ('jsonl' or 'ftm')
+
+    Returns:
+        Dict[str, int]: Counts of total, added, updated, deleted and unchanged entities
+
+    Raises:
+        Exception: If any error occurs during transformation
+    """
+    make_line = _LINE_BUILDERS.get(format.lower())
+    if make_line is None:
+        raise ValueError(f"Unknown format: {format} (use jsonl or ftm)")
+
+    out = Path(output_path)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    state_path = out.with_suffix(".state.json")
+    delta_path = out.with_suffix(".delta.jsonl")
+    tmp_out = out.with_name(out.name + ".tmp")
+
+    prev_rows = _load_state(state_path, out, format.lower())
+    counts = {"total": 0, "added": 0, "updated": 0, "deleted": 0, "unchanged": 0}
+    new_rows: List[List[Any]] = []
+
+    try:
+        with (
+            tmp_out.open("w", encoding="utf-8") as jsonl,
+            delta_path.open("w", encoding="utf-8") as delta,
+            out.open("r", encoding="utf-8") if prev_rows else open(os.devnull) as old,
+        ):
+            # Previous state and snapshot are both in row order: walk them in step
+            prev = iter(zip(prev_rows, old))
+            pending = next(prev, None)
+
             for idx, row in enumerate(_row_iter(input_path)):
+                previous = None
+                if pending is not None and pending[0][0] == idx:
+                    previous, pending = pending, next(prev, None)
+                (_, prev_fp, prev_id), prev_line = previous or ((None,) * 3, None)
+
                 r = _normalize_row(row)
-                name = r["name"]
-                if not name:
+                if not r["name"]:
+                    if previous is not None:
+                        delta.write(_delta_line("delete", prev_id))
+                        counts["deleted"] += 1
                     continue
 
-                # Determine schema type
-                schema = (
-                    "Person"
-                    if "individual" in (r["sdn_type"] or "").lower()
-                    else "Organization"
-                )
-
-                # Create FTM entity
-                # Create entity using appropriate method
-                try:
-                    # Attempt to create entity using modern FTM API
-                    ent = model.make_entity(schema)
-                except Exception:
-                    # Fallback to EntityProxy for older FTM versions
-                    from followthemoney.proxy import EntityProxy
-
-                    ent = EntityProxy(model.get(schema))
-
-                # Set a deterministic id (same input -> same id)
-                ent.id = make_id("row", idx, name)
-
-                # Add name property
-                ent.add("name", name)
-
-                # Prepare notes if available
-                notes = []
-                if r["program"]:
-                    notes.append(f"Program: {r['program']}")
-                if r["remarks"]:
-                    notes.append(r["remarks"])
-
-                # Add notes if any were found
-                if notes:
-                    ent.add("notes", "; ".join(notes))
-
-                # Write entity to JSONL
-                if JSONEncoder is not None:
-                    # Use FollowTheMoney JSON encoder if available
-                    jsonl.write(JSONEncoder.to_line(ent))
+                fp = _fingerprint(r)
+                if previous is not None and prev_fp == fp:
+                    entity_id, line = prev_id, prev_line
+                    counts["unchanged"] += 1
                 else:
-                    # Fallback to basic JSON representation
-                    import json as _json
-
-                    jsonl.write(_json.dumps(ent.to_dict()) + "\n")
-
-                # Increment counter
-                count += 1
-        return count
+                    entity_id, line = make_line(idx, r)
+                    if previous is None:
+                        delta.write(_delta_line("add", entity_id, line))
+                        counts["added"] += 1
+                    elif prev_id != entity_id:
+                        # The id itself changed (FTM ids hash the name)
+                        delta.write(_delta_line("delete", prev_id))
+                        delta.write(_delta_line("add", entity_id, line))
+                        counts["updated"] += 1
+                    else:
+                        delta.write(_delta_line("update", entity_id, line))
+                        counts["updated"] += 1
+
+                jsonl.write(line)
+                new_rows.append([idx, fp, entity_id])
+                counts["total"] += 1
+
+            # Rows past the end of the new input were removed
+            while pending is not None:
+                delta.write(_delta_line("delete", pending[0][2]))
+                counts["deleted"] += 1
+                pending = next(prev, None)
+
+        os.replace(tmp_out, out)
+        state = {
+            "version": STATE_VERSION,
+            "format": format.lower(),
+            "digest": file_digest(str(out)),
+            "rows": new_rows,
+        }
+        state_path.write_text(json.dumps(state), encoding="utf-8")
+        return counts
 
     except Exception as e:
+        if tmp_out.exists():
+            tmp_out.unlink()
         raise Exception(f"Error during transformation: {str(e)}")
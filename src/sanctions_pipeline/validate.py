@@ -1,35 +1,460 @@
 from pathlib import Path
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import importlib.util
 import json
+import multiprocessing
+from typing import Any, Callable, Dict, FrozenSet, Iterator, List, Optional, Set, Tuple
 
-__all__ = ["validate_jsonl"]
+try:
+    import orjson  # optional, several times faster than json.loads
 
+    _loads = orjson.loads
+    _JSON_ERRORS: Tuple[type, ...] = (orjson.JSONDecodeError, ValueError)
+except ImportError:
+    orjson = None
+    _loads = json.loads
+    _JSON_ERRORS = (ValueError,)
 
-def validate_jsonl(path: str, min_rows: int = 1) -> dict:
-    """Validates a JSONL file containing one JSON object per line."""
+from .writers import _pyarrow, is_parquet
+
+__all__ = ["validate_jsonl", "RecordValidator", "ERROR_TYPES"]
+
+# Bytes per block handed to a worker; blocks end on a line boundary
+BLOCK_SIZE = 64 * 1024 * 1024
+
+# Ids from which duplicates are found by sorting with numpy rather than a set
+NUMPY_MIN_IDS = 100_000
+
+# Line numbers kept per error type for the report
+MAX_ERROR_LINES = 20
+
+ERROR_TYPES = (
+    "bad_json",
+    "not_object",
+    "missing_id",
+    "missing_name",
+    "missing_schema",
+    "unknown_schema",
+    "duplicate_id",
+)
+
+
+def _schema_names() -> FrozenSet[str]:
+    """
+    Names of all FollowTheMoney schemata.
+
+    FollowTheMoney ships one `schema/<Name>.yaml` file per schema; listing
+    them avoids importing the package (most of a second) just for the names.
+    """
+    spec = importlib.util.find_spec("followthemoney")
+    for location in (spec.submodule_search_locations or []) if spec else []:
+        names = frozenset(p.stem for p in Path(location, "schema").glob("*.yaml"))
+        if names:
+            return names
+
+    from followthemoney import model
+
+    return frozenset(model.schemata)
+
+
+def _blocks(path: Path, block_size: int) -> List[Tuple[int, int]]:
+    """Split a file into (start, end) byte ranges that end on a newline."""
+    size = path.stat().st_size
+    bounds = [0]
+    with path.open("rb") as f:
+        while bounds[-1] + block_size < size:
+            f.seek(bounds[-1] + block_size)
+            f.readline()
+            bounds.append(f.tell())
+    if bounds[-1] < size or size == 0:
+        bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _id_hash(entity_id: str) -> int:
+    # 8 bytes per id instead of the id string keeps huge files in memory
+    digest = hashlib.blake2b(entity_id.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def _validate_block(
+    path: str, start: int, end: int, schemas: Optional[FrozenSet[str]]
+) -> Dict:
+    """
+    Validate the lines in one byte range.
+
+    Args:
+        path: JSONL file
+        start: First byte (start of a line)
+        end: Byte after the last line
+        schemas: Allowed schema names; None skips the field checks
+
+    Returns:
+        Dict: "lines" in the block, "total" parsed records, "errors" as
+        {type: [block-relative line numbers]}, and the record ids as parallel
+        "id_hashes"/"id_lines" arrays for the duplicate check
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+
+    lines = data.split(b"\n")
+    if lines and not lines[-1]:
+        lines.pop()
+
+    total = 0
+    errors: Dict[str, List[int]] = {}
+    id_hashes = array("Q")
+    id_lines = array("Q")
+    for i, line in enumerate(lines):
+        if not line.strip():
+            continue
+        try:
+            record = _loads(line)
+        except _JSON_ERRORS:
+            errors.setdefault("bad_json", []).append(i)
+            continue
+        total += 1
+        if schemas is None:
+            continue
+        _check_record(record, i, schemas, errors, id_hashes, id_lines)
+
+    return {
+        "lines": len(lines),
+        "total": total,
+        "errors": errors,
+        "id_hashes": id_hashes,
+        "id_lines": id_lines,
+    }
+
+
+def _check_record(
+    record,
+    i: int,
+    schemas: FrozenSet[str],
+    errors: Dict[str, List[int]],
+    id_hashes: array,
+    id_lines: array,
+) -> None:
+    """Record the field errors of one parsed record found at (relative) line i."""
+    if not isinstance(record, dict):
+        errors.setdefault("not_object", []).append(i)
+        return
+    entity_id = record.get("id")
+    if not entity_id or not isinstance(entity_id, str):
+        errors.setdefault("missing_id", []).append(i)
+    else:
+        id_hashes.append(_id_hash(entity_id))
+        id_lines.append(i)
+    name = record.get("name")
+    if not name and isinstance(record.get("properties"), dict):
+        # FollowTheMoney entities keep names in properties
+        name = (record["properties"].get("name") or [None])[0]
+    if not name or not isinstance(name, str):
+        errors.setdefault("missing_name", []).append(i)
+    schema = record.get("schema")
+    if not schema:
+        errors.setdefault("missing_schema", []).append(i)
+    elif schema not in schemas:
+        errors.setdefault("unknown_schema", []).append(i)
+
+
+def _validate_parquet(path: str, schemas: Optional[FrozenSet[str]]) -> Iterator[Dict]:
+    """Validate a Parquet entity file; one block result per row group."""
+    _, pq = _pyarrow()
+    pf = pq.ParquetFile(path)
+    columns = [c for c in ("id", "schema", "name") if c in pf.schema_arrow.names]
+    for g in range(pf.num_row_groups):
+        table = pf.read_row_group(g, columns=columns)
+        errors: Dict[str, List[int]] = {}
+        id_hashes = array("Q")
+        id_lines = array("Q")
+        if schemas is not None:
+            values = [table.column(c).to_pylist() for c in columns]
+            for i, row in enumerate(zip(*values)):
+                record = dict(zip(columns, row))
+                _check_record(record, i, schemas, errors, id_hashes, id_lines)
+        yield {
+            "lines": table.num_rows,
+            "total": table.num_rows,
+            "errors": errors,
+            "id_hashes": id_hashes,
+            "id_lines": id_lines,
+        }
+
+
+def _jsonl_ids(path: str, lines: Set[int]) -> Dict[int, Any]:
+    """The ids on the given (1-based) lines of a JSONL file."""
+    ids: Dict[int, Any] = {}
+    with open(path, "rb") as f:
+        for line_no, line in enumerate(f, 1):
+            if line_no in lines:
+                record = _loads(line)
+                ids[line_no] = record.get("id")
+                if len(ids) == len(lines):
+                    break
+    return ids
+
+
+def _parquet_ids(path: str, lines: Set[int]) -> Dict[int, Any]:
+    """The ids on the given (1-based) rows of a Parquet entity file."""
+    _, pq = _pyarrow()
+    pf = pq.ParquetFile(path)
+    ids: Dict[int, Any] = {}
+    offset = 0
+    for g in range(pf.num_row_groups):
+        size = pf.metadata.row_group(g).num_rows
+        wanted = [n for n in lines if offset < n <= offset + size]
+        if wanted:
+            column = pf.read_row_group(g, columns=["id"]).column("id")
+            for n in wanted:
+                ids[n] = column[n - offset - 1].as_py()
+        offset += size
+    return ids
+
+
+def _format_errors(counts: Dict[str, int], lines: Dict[str, List[int]]) -> str:
+    return ", ".join(
+        f"{kind}={counts[kind]} (lines {', '.join(map(str, lines[kind][:5]))})"
+        for kind in ERROR_TYPES
+        if counts.get(kind)
+    )
+
+
+def validate_jsonl(
+    path: str,
+    min_rows: int = 1,
+    check_fields: bool = False,
+    workers: int = 1,
+    block_size: int = BLOCK_SIZE,
+) -> dict:
+    """
+    Validates a JSONL file containing one JSON object per line.
+
+    Parquet files written by `transform --format parquet` are accepted too:
+    each row counts as a record (and row numbers as line numbers).
+
+    The file is read in large blocks that are validated independently (on a
+    process pool when workers > 1), using orjson when it is installed. With
+    `check_fields`, every record must also be an object with a non-empty
+    `id`, `name` (or FollowTheMoney `properties.name`) and a known
+    FollowTheMoney `schema`, and ids must be unique across the file.
+
+    Args:
+        path: JSONL (or Parquet) file
+        min_rows: Minimum number of records
+        check_fields: Also check the fields screening relies on
+        workers: Processes validating blocks in parallel
+        block_size: Bytes per block
+
+    Returns:
+        dict: "total" records, "errors" as {type: count} and "error_lines"
+        as {type: [first line numbers (1-based)]}
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        AssertionError: On bad JSON lines, invalid records (with
+            check_fields) or fewer than min_rows records
+    """
 
     p = Path(path)
     if not p.exists():
         raise FileNotFoundError(f"File not found: {path}")
 
-    total = 0
-    bad_json = 0
+    schemas = _schema_names() if check_fields else None
+    blocks = None if is_parquet(path) else _blocks(p, block_size)
+    ids_at = _parquet_ids if blocks is None else _jsonl_ids
 
-    with p.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
+    def id_lookup(lines: Set[int]) -> Dict[int, Any]:
+        return ids_at(str(p), lines)
 
-            try:
-                json.loads(line)
-                total += 1
-            except Exception:
-                bad_json += 1
+    if blocks is None:
+        summary = _combine(_validate_parquet(str(p), schemas), id_lookup)
+    elif workers > 1 and len(blocks) > 1:
+        methods = multiprocessing.get_all_start_methods()
+        ctx = multiprocessing.get_context("fork" if "fork" in methods else None)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+            results = pool.map(
+                _validate_block,
+                [str(p)] * len(blocks),
+                [s for s, _ in blocks],
+                [e for _, e in blocks],
+                [schemas] * len(blocks),
+            )
+            summary = _combine(results, id_lookup)
+    else:
+        summary = _combine(
+            (_validate_block(str(p), s, e, schemas) for s, e in blocks), id_lookup
+        )
 
-    if bad_json > 0:
-        raise AssertionError(f"Bad JSON lines: {bad_json}")
+    _raise_for(summary, min_rows, check_fields)
+    return summary
 
+
+def _raise_for(summary: dict, min_rows: int, check_fields: bool) -> None:
+    """Raise AssertionError for a combined summary that fails validation."""
+    counts, lines = summary["errors"], summary["error_lines"]
+    if counts.get("bad_json", 0) > 0:
+        raise AssertionError(
+            f"Bad JSON lines: {counts['bad_json']} "
+            f"(lines {', '.join(map(str, lines['bad_json'][:5]))})"
+        )
+
+    if check_fields and any(counts.values()):
+        raise AssertionError(f"Invalid records: {_format_errors(counts, lines)}")
+
+    total = summary["total"]
     if total < min_rows:
         raise AssertionError(f"Too few records: {total} < {min_rows}")
 
-    return {"total": total}
+
+class RecordValidator:
+    """
+    Validates records one at a time, as a pipeline produces them.
+
+    Applies the same checks as `validate_jsonl` to records that were never
+    serialized, so a file doesn't have to be written and parsed again just to
+    be validated. Record numbers stand in for line numbers in errors.
+
+    Args:
+        check_fields: Also check the fields screening relies on
+    """
+
+    def __init__(self, check_fields: bool = True) -> None:
+        self.check_fields = check_fields
+        self.schemas = _schema_names() if check_fields else None
+        self.errors: Dict[str, List[int]] = {}
+        self.id_hashes = array("Q")
+        self.id_lines = array("Q")
+        self.total = 0
+
+    def check(self, record: dict) -> None:
+        """Check one record (errors are collected, not raised)."""
+        if self.schemas is not None:
+            _check_record(
+                record,
+                self.total,
+                self.schemas,
+                self.errors,
+                self.id_hashes,
+                self.id_lines,
+            )
+        self.total += 1
+
+    def finish(self, min_rows: int = 1, path: Optional[str] = None) -> dict:
+        """
+        Return the summary of every record checked.
+
+        Args:
+            min_rows: Minimum number of records
+            path: JSONL file the records were written to, one per line and in
+                order; re-read to tell duplicate ids from id hash collisions
+                (without it, records with the same id hash are duplicates)
+
+        Returns:
+            dict: Same shape as `validate_jsonl`'s summary
+
+        Raises:
+            AssertionError: On invalid records or fewer than min_rows records
+        """
+        summary = _combine(
+            [
+                {
+                    "lines": self.total,
+                    "total": self.total,
+                    "errors": self.errors,
+                    "id_hashes": self.id_hashes,
+                    "id_lines": self.id_lines,
+                }
+            ],
+            None if path is None else lambda lines: _jsonl_ids(path, lines),
+        )
+        _raise_for(summary, min_rows, self.check_fields)
+        return summary
+
+
+def _combine(
+    results, ids_at: Optional[Callable[[Set[int]], Dict[int, Any]]] = None
+) -> dict:
+    """
+    Fold block results (in file order) into totals with absolute line numbers.
+
+    `ids_at` returns the ids on a set of lines, to confirm duplicate ids.
+    """
+    total = 0
+    offset = 0
+    counts: Dict[str, int] = {}
+    lines: Dict[str, List[int]] = {}
+    id_hashes = array("Q")
+    id_lines = array("Q")
+    for r in results:
+        total += r["total"]
+        for kind, rel in r["errors"].items():
+            counts[kind] = counts.get(kind, 0) + len(rel)
+            kept = lines.setdefault(kind, [])
+            kept.extend(offset + i + 1 for i in rel[: MAX_ERROR_LINES - len(kept)])
+        id_hashes.extend(r["id_hashes"])
+        id_lines.extend(offset + i + 1 for i in r["id_lines"])
+        offset += r["lines"]
+
+    duplicates = _duplicate_lines(id_hashes, id_lines, ids_at)
+    if duplicates:
+        counts["duplicate_id"] = len(duplicates)
+        lines["duplicate_id"] = duplicates[:MAX_ERROR_LINES]
+    return {"total": total, "errors": counts, "error_lines": lines}
+
+
+def _duplicate_lines(
+    id_hashes: array,
+    id_lines: array,
+    ids_at: Optional[Callable[[Set[int]], Dict[int, Any]]] = None,
+) -> List[int]:
+    """
+    Line numbers of every id already seen on an earlier line, ascending.
+
+    Ids are compared by their 64-bit hash. With `ids_at`, the ids on the few
+    lines that share a hash are read back, so a hash collision between two
+    different ids is not reported as a duplicate.
+    """
+    shared = _shared_hash_lines(id_hashes, id_lines)
+    ids = ids_at({line for line, _ in shared}) if shared and ids_at else {}
+    seen: set = set()
+    dupes = []
+    for line, h in shared:
+        key = (h, ids.get(line))
+        if key in seen:
+            dupes.append(line)
+        seen.add(key)
+    return dupes
+
+
+def _shared_hash_lines(id_hashes: array, id_lines: array) -> List[Tuple[int, int]]:
+    """(line, hash) of every id whose hash occurs more than once, by line."""
+    np = None
+    if len(id_hashes) >= NUMPY_MIN_IDS:
+        # Below that a set is quicker than importing numpy at all
+        try:
+            import numpy as np  # installed with pandas
+        except ImportError:
+            pass
+    if np is None:
+        seen: set = set()
+        repeated = set()
+        for h in id_hashes:
+            if h in seen:
+                repeated.add(h)
+            seen.add(h)
+        return [(line, h) for h, line in zip(id_hashes, id_lines) if h in repeated]
+
+    # Sort by hash; a hash equal to either neighbour's is shared
+    hashes = np.frombuffer(id_hashes, dtype=np.uint64)
+    order = np.argsort(hashes, kind="stable")
+    ordered = hashes[order]
+    equal = ordered[1:] == ordered[:-1]
+    shared = np.zeros(len(ordered), dtype=bool)
+    shared[1:] |= equal
+    shared[:-1] |= equal
+    line_nos = np.frombuffer(id_lines, dtype=np.uint64)[order][shared]
+    return sorted(zip(line_nos.tolist(), ordered[shared].tolist()))
@@ -0,0 +1,200 @@
+from pathlib import Path
+import os
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+__all__ = [
+    "EntityWriter",
+    "JsonlWriter",
+    "ParquetWriter",
+    "PARQUET_COLUMNS",
+    "is_parquet",
+    "iter_parquet",
+]
+
+PARQUET_MAGIC = b"PAR1"
+
+# Columns of a Parquet entity file, in order (the simple entity fields)
+PARQUET_COLUMNS = (
+    "id",
+    "schema",
+    "name",
+    "name_key",
+    "notes",
+    "aliases",
+    "birth_date",
+    "country",
+)
+
+# Multi-valued columns, stored as lists of strings
+PARQUET_LIST_COLUMNS = ("aliases",)
+
+# Entities buffered per Parquet row group
+ROW_GROUP_SIZE = 64 * 1024
+
+
+def _pyarrow() -> Tuple[Any, Any]:
+    """
+    Import pyarrow (optional) on first use.
+
+    It is imported here rather than at module level because it adds tens of
+    megabytes to every process, and only Parquet files need it.
+
+    Returns:
+        Tuple[Any, Any]: The pyarrow and pyarrow.parquet modules
+
+    Raises:
+        RuntimeError: If pyarrow is not installed
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("pyarrow required for Parquet. Run: uv sync --extra parquet")
+    return pa, pq
+
+
+def is_parquet(path: str) -> bool:
+    """Return True if the file starts with the Parquet magic bytes."""
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(PARQUET_MAGIC)) == PARQUET_MAGIC
+    except OSError:
+        return False
+
+
+def iter_parquet(
+    path: str, columns: Optional[Sequence[str]] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the rows of a Parquet entity file as dicts, one row group at a time.
+
+    Args:
+        path: Parquet file written by `ParquetWriter`
+        columns: Columns to read (defaults to all); missing ones are skipped
+
+    Yields:
+        Dict[str, Any]: One entity; null values are left out
+
+    Raises:
+        RuntimeError: If pyarrow is not installed
+    """
+    _, pq = _pyarrow()
+    pf = pq.ParquetFile(path)
+    if columns is not None:
+        present = set(pf.schema_arrow.names)
+        columns = [c for c in columns if c in present]
+    for i in range(pf.num_row_groups):
+        table = pf.read_row_group(i, columns=columns)
+        names = table.column_names
+        for values in zip(*(table.column(c).to_pylist() for c in names)):
+            yield {k: v for k, v in zip(names, values) if v is not None}
+
+
+class EntityWriter:
+    """
+    Base class for transform output writers.
+
+    A writer receives the items built for each named row, in input order, and
+    is used as a context manager; `count` is the number of items written.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.count = 0
+
+    def write(self, item: Any) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "EntityWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class JsonlWriter(EntityWriter):
+    """Writes pre-serialized lines (simple or FollowTheMoney JSONL)."""
+
+    def __init__(self, path: str) -> None:
+        super().__init__(path)
+        self._f = self.path.open("w", encoding="utf-8")
+
+    def write(self, item: str) -> None:
+        self._f.write(item)
+        self.count += 1
+
+    def close(self) -> None:
+        self._f.close()
+
+
+class ParquetWriter(EntityWriter):
+    """
+    Writes simple entity dicts to a Parquet file with PARQUET_COLUMNS.
+
+    Entities are buffered column by column and flushed as one row group every
+    `row_group_size` entities, so memory is bounded by the row group. The file
+    is written under a temporary name and renamed when closed, so readers
+    never see a file without its footer.
+
+    Raises:
+        RuntimeError: If pyarrow is not installed
+    """
+
+    def __init__(self, path: str, row_group_size: int = ROW_GROUP_SIZE) -> None:
+        pa, pq = _pyarrow()
+        super().__init__(path)
+        self._pa = pa
+        self.row_group_size = row_group_size
+        self.types = {
+            c: pa.list_(pa.string()) if c in PARQUET_LIST_COLUMNS else pa.string()
+            for c in PARQUET_COLUMNS
+        }
+        self.schema = pa.schema(list(self.types.items()))
+        self._tmp = self.path.with_name(self.path.name + ".tmp")
+        self._writer = pq.ParquetWriter(str(self._tmp), self.schema)
+        self._columns: Dict[str, List[Any]] = {c: [] for c in PARQUET_COLUMNS}
+        self._buffered = 0
+
+    def write(self, item: Dict[str, Any]) -> None:
+        for c, values in self._columns.items():
+            values.append(item.get(c))
+        self._buffered += 1
+        self.count += 1
+        if self._buffered >= self.row_group_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._buffered:
+            return
+        pa = self._pa
+        arrays = [pa.array(self._columns[c], self.types[c]) for c in PARQUET_COLUMNS]
+        self._writer.write_table(
+            pa.Table.from_arrays(arrays, schema=self.schema),
+            row_group_size=self._buffered,
+        )
+        for values in self._columns.values():
+            values.clear()
+        self._buffered = 0
+
+    def close(self) -> None:
+        if self._writer is None:
+            return
+        try:
+            self._flush()
+        finally:
+            self._writer.close()
+            self._writer = None
+        os.replace(self._tmp, self.path)
+
+    def __exit__(self, exc_type, *exc) -> None:
+        if exc_type is None:
+            self.close()
+            return
+        # Don't leave a half-written file behind on errors
+        self._writer.close()
+        self._writer = None
+        self._tmp.unlink(missing_ok=True)
@@ -0,0 +1,97 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+
+@pytest.fixture
+def http_source():
+    """
+    Local stand-in for a list publisher's server.
+
+    Serves `source.body` at any path with an ETag and Last-Modified, answers
+    conditional requests with 304 and Range/If-Range requests with 206. Set
+    `source.cut_after` to drop the connection after that many body bytes
+    (once), set `source.range_from` to answer the next Range request from
+    that byte instead, or queue status codes in `source.errors` to answer
+    with them first. Request headers are recorded in `source.requests`.
+    """
+    source = SimpleNamespace(
+        body=b"",
+        etag='"v1"',
+        last_modified="Wed, 01 Jan 2025 00:00:00 GMT",
+        cut_after=None,
+        range_from=None,
+        errors=[],
+        requests=[],
+    )
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            headers = {k.lower(): v for k, v in self.headers.items()}
+            source.requests.append(headers)
+
+            if source.errors:
+                self.send_response(source.errors.pop(0))
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+            if headers.get("if-none-match") == source.etag:
+                self.send_response(304)
+                self.end_headers()
+                return
+
+            body, start = source.body, 0
+            rng = headers.get("range", "")
+            if rng.startswith("bytes=") and headers.get("if-range") == source.etag:
+                start = int(rng[len("bytes=") :].split("-")[0])
+                if source.range_from is not None:
+                    start, source.range_from = source.range_from, None
+                self.send_response(206)
+                self.send_header(
+                    "Content-Range", f"bytes {start}-{len(body) - 1}/{len(body)}"
+                )
+            else:
+                self.send_response(200)
+            self.send_header("ETag", source.etag)
+            self.send_header("Last-Modified", source.last_modified)
+            self.send_header("Content-Length", str(len(body) - start))
+            self.end_headers()
+
+            if source.cut_after is not None:
+                self.wfile.write(body[start : start + source.cut_after])
+                source.cut_after = None
+                self.close_connection = True
+                return
+            self.wfile.write(body[start:])
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    source.url = f"http://127.0.0.1:{server.server_address[1]}/list.xlsx"
+    try:
+        yield source
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def write_entities():
+    """Write one simple JSONL entity per name, with ids row-0, row-1, ..."""
+
+    def write(path, names, schema="Person"):
+        path.write_text(
+            "".join(
+                json.dumps({"schema": schema, "id": f"row-{i}", "name": n}) + "\n"
+                for i, n in enumerate(names)
+            )
+        )
+
+    return write
@@ -0,0 +1,109 @@
+import json
+
+from sanctions_pipeline.extract import download
+
+
+def test_download_then_skip_unchanged(tmp_path, http_source):
+    http_source.body = b"a" * 10_000
+    out = tmp_path / "raw" / "list.xlsx"
+
+    first = download(http_source.url, str(out))
+    assert first == {"status": "downloaded", "bytes": 10_000, "size": 10_000}
+    assert out.read_bytes() == http_source.body
+    meta = json.loads((tmp_path / "raw" / "list.xlsx.meta.json").read_text())
+    assert meta["etag"] == '"v1"'
+
+    second = download(http_source.url, str(out))
+    assert second["status"] == "not_modified"
+    assert second["bytes"] == 0
+    assert http_source.requests[-1]["if-none-match"] == '"v1"'
+
+    # A new version upstream is downloaded again
+    http_source.body, http_source.etag = b"b" * 5000, '"v2"'
+    third = download(http_source.url, str(out))
+    assert third["status"] == "downloaded"
+    assert out.read_bytes() == b"b" * 5000
+
+
+def test_download_resumes_after_dropped_connection(tmp_path, http_source):
+    http_source.body = bytes(range(256)) * 100
+    http_source.cut_after = 6000
+    out = tmp_path / "list.xlsx"
+
+    result = download(http_source.url, str(out), backoff=0)
+
+    assert result["status"] == "resumed"
+    assert out.read_bytes() == http_source.body
+    assert http_source.requests[-1]["range"] == "bytes=6000-"
+    assert not (tmp_path / "list.xlsx.part").exists()
+
+
+def test_download_restarts_when_source_changed_mid_download(tmp_path, http_source):
+    http_source.body = b"a" * 8000
+    http_source.cut_after = 3000
+    out = tmp_path / "list.xlsx"
+
+    try:
+        download(http_source.url, str(out), retries=0, backoff=0)
+    except Exception:
+        pass
+    assert (tmp_path / "list.xlsx.part").stat().st_size == 3000
+    assert not out.exists()
+
+    # If-Range no longer matches, so the server sends the full new body
+    http_source.body, http_source.etag = b"c" * 8000, '"v2"'
+    result = download(http_source.url, str(out))
+    assert result["status"] == "downloaded"
+    assert out.read_bytes() == b"c" * 8000
+
+
+def test_extract_all_manifest(tmp_path, http_source):
+    import asyncio
+    import hashlib
+
+    from sanctions_pipeline.extract import extract_all, load_manifest
+
+    http_source.body = b"z" * 4000
+    http_source.errors = [503]  # first request is throttled, then retried
+    good = hashlib.sha256(http_source.body).hexdigest()
+    manifest = tmp_path / "sources.toml"
+    manifest.write_text(f"""
+[sources.a]
+url = "{http_source.url}?a"
+out = "{tmp_path / 'a.csv'}"
+sha256 = "{good}"
+
+[sources.b]
+url = "{http_source.url}?b"
+format = "xlsx"
+out = "{tmp_path / 'b.xlsx'}"
+sha256 = "{'0' * 64}"
+""")
+    sources = load_manifest(str(manifest))
+
+    results = asyncio.run(extract_all(sources, per_host=1, backoff=0))
+
+    assert [r["id"] for r in results] == ["a", "b"]
+    assert results[0]["status"] == "downloaded"
+    assert (tmp_path / "a.csv").read_bytes() == http_source.body
+    # b downloads fine but fails checksum verification without stopping a
+    assert results[1]["status"] == "failed"
+    assert "sha256 mismatch" in results[1]["error"]
+
+    again = asyncio.run(extract_all(sources, backoff=0))
+    assert again[0]["status"] == "not_modified"
+
+
+def test_download_restarts_on_range_from_wrong_offset(tmp_path, http_source):
+    http_source.body = bytes(range(256)) * 100
+    http_source.cut_after = 6000
+    # The resume at byte 6000 is answered with a 206 from byte 1000
+    http_source.range_from = 1000
+    out = tmp_path / "list.xlsx"
+
+    result = download(http_source.url, str(out), backoff=0)
+
+    assert result["status"] == "downloaded"
+    assert out.read_bytes() == http_source.body
+    assert http_source.requests[1]["range"] == "bytes=6000-"
+    assert "range" not in http_source.requests[-1]
@@ -0,0 +1,78 @@
+import json  # For writing entity fixtures
+import subprocess  # Imports are measured in a fresh interpreter
+import sys
+import pytest
+
+# Each module below imports in ~0.1s here; eagerly importing followthemoney
+# alone took ~0.8s, so this catches a heavy import slipping back in
+STARTUP_BUDGET_S = 0.5
+
+HEAVY = ("followthemoney", "httpx", "numpy", "openpyxl", "pandas", "pyarrow")
+
+
+def _import_seconds(module):
+    """Cumulative import time of a module (and its package) per -X importtime."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    wanted = {module, module.rpartition(".")[0]}
+    total = 0
+    for line in result.stderr.splitlines():
+        _, _, rest = line.partition("import time:")
+        parts = rest.split("|")
+        if len(parts) == 3 and parts[2].strip() in wanted:
+            total += int(parts[1])
+    return total / 1e6
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "sanctions_pipeline.cli",
+        "sanctions_pipeline.transform",
+        "sanctions_pipeline.screen",
+        "sanctions_pipeline.validate",
+    ],
+)
+def test_import_within_startup_budget(module):
+    assert _import_seconds(module) < STARTUP_BUDGET_S
+
+
+def test_small_runs_import_nothing_heavy(tmp_path):
+    csv_in = tmp_path / "input.csv"
+    csv_in.write_text("name,type\nJohn Doe,Individual\n")
+    people = tmp_path / "people.csv"
+    people.write_text("name\njohn\n")
+    entities = tmp_path / "entities.jsonl"
+    entities.write_text(json.dumps({"id": "1", "schema": "Person", "name": "X"}))
+
+    commands = [
+        ["transform", "--input", str(csv_in), "--output", str(tmp_path / "o.jsonl")],
+        ["validate", "--input", str(entities)],
+        [
+            "screen",
+            "--input-csv",
+            str(people),
+            "--entities",
+            str(entities),
+            "--output-csv",
+            str(tmp_path / "m.csv"),
+        ],
+    ]
+    code = (
+        "import sys\n"
+        "from sanctions_pipeline.cli import app\n"
+        "app(sys.argv[1:], standalone_mode=False)\n"
+        f"print(sorted({{m.split('.')[0] for m in sys.modules}} & {set(HEAVY)!r}))\n"
+    )
+    for args in commands:
+        result = subprocess.run(
+            [sys.executable, "-c", code, *args],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        assert result.stdout.splitlines()[-1] == "[]", args
@@ -0,0 +1,91 @@
+import json  # For writing entity fixtures
+import random  # For generating names to compare against the naive scan
+from sanctions_pipeline.index import NameIndex, PackedStrings, build_index, load_index
+
+
+def _naive_first_match(keys, q):
+    """The original O(N) scan: first key containing the query."""
+    for i, n in enumerate(keys):
+        if q and n and q in n:
+            return i
+    return None
+
+
+def test_first_match_agrees_with_linear_scan():
+    rng = random.Random(7)
+    alphabet = "abc de"  # Small alphabet so substrings collide often
+    index = NameIndex()
+    for i in range(300):
+        name = "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 12)))
+        index.add({"id": f"row-{i}", "schema": "Person", "name": name})
+
+    for _ in range(500):
+        q = "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 6))).strip()
+        assert index.first_match(q) == _naive_first_match(index.keys, q)
+
+
+def test_empty_names_are_skipped():
+    index = NameIndex()
+    index.add({"id": "a", "name": "  "})
+    index.add({"id": "b", "name": "ACME Corp"})
+    assert len(index) == 1
+    assert index.ids[index.first_match("acme")] == "b"
+
+
+def test_load_index_rebuilds_when_entities_change(tmp_path):
+    entities = tmp_path / "entities.jsonl"
+    entities.write_text(json.dumps({"id": "1", "name": "John Doe"}) + "\n")
+    idx_path = tmp_path / "entities.idx"
+
+    first = load_index(str(entities), str(idx_path))
+    assert idx_path.exists()
+    assert first.first_match("doe") == 0
+
+    # Same content -> persisted index is reused as-is
+    assert load_index(str(entities), str(idx_path)).keys == first.keys
+
+    entities.write_text(json.dumps({"id": "2", "name": "Jane Roe"}) + "\n")
+    rebuilt = load_index(str(entities), str(idx_path))
+    assert rebuilt.ids == ["2"]
+    assert build_index(str(entities)).keys == rebuilt.keys
+
+
+def test_packed_strings_round_trip():
+    values = ["row-0", "", "Müller", "李小龍"]
+    packed = PackedStrings(values)
+    assert len(packed) == 4
+    assert packed[2] == "Müller" and packed[-1] == "李小龍"
+    assert list(packed) == values == packed
+    assert packed[1:3] == ["", "Müller"]
+
+
+def test_aliases_and_attribute_filter():
+    index = NameIndex()
+    index.add(
+        {
+            "id": "a",
+            "schema": "Person",
+            "name": "John Doe",
+            "aliases": ["Johnny D", "JOHN DOE"],
+            "birth_date": "1964-01-01",
+            "country": "Libya",
+        }
+    )
+    index.add({"id": "b", "schema": "Person", "name": "John Smith"})
+    index.add({"id": "c", "schema": "Organization", "name": "Johnson Ltd"})
+    index.add({"id": "d", "schema": "Person", "name": "John Roe", "country": "Iran"})
+
+    # One name per distinct alias key, right after its entity's name
+    assert len(index) == 5 and index.entities == 4
+    assert index.ids[index.first_match("johnny")] == "a"
+
+    def matches(query, **attributes):
+        where = index.filter(**attributes)
+        return [index.ids[o] for o in index.candidates(query, where)]
+
+    assert index.filter() is None
+    # Unknown birth dates and countries never exclude an entity
+    assert matches("john", schema="Person", year=1964) == ["a", "a", "b", "d"]
+    assert matches("john", schema="Person", year=1970) == ["b", "d"]
+    assert matches("john", country="ir") == ["b", "c", "d"]
+    assert matches("jo", schema="Organization") == ["c"]
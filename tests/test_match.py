@@ -0,0 +1,68 @@
+import pytest
+from sanctions_pipeline.index import NameIndex
+from sanctions_pipeline.match import (
+    FuzzyMatcher,
+    SubstringMatcher,
+    _trigrams,
+    make_matcher,
+)
+
+
+def _index(names):
+    index = NameIndex()
+    for i, n in enumerate(names):
+        index.add({"id": f"row-{i}", "schema": "Person", "name": n})
+    return index
+
+
+def _dice(a, b):
+    """Reference Dice similarity over padded trigram sets."""
+    ga, gb = _trigrams(a), _trigrams(b)
+    return 2 * len(ga & gb) / (len(ga) + len(gb))
+
+
+def test_fuzzy_scores_match_brute_force():
+    names = ["john smith", "jon smyth", "joan smithers", "acme corp", "smith john"]
+    matcher = FuzzyMatcher(_index(names), threshold=0.3)
+
+    cands, scores = matcher.scores("john smith")
+    expected = {i: _dice("john smith", n) for i, n in enumerate(names)}
+    expected = {i: s for i, s in expected.items() if s >= 0.3}
+
+    assert dict(zip(cands.tolist(), scores.tolist())) == expected
+
+
+def test_fuzzy_best_prefers_exact_name():
+    matcher = FuzzyMatcher(_index(["Jon Smyth", "John Smith"]), threshold=0.5)
+    assert matcher.best("john smith") == (1, 1.0)
+    assert matcher.best("zzzz") is None
+
+
+def test_substring_score_and_threshold():
+    index = _index(["ACME Corporation", "Acme"])
+    assert SubstringMatcher(index).best("acme") == (0, 0.25)
+    # With a threshold, the first sufficiently covering name wins
+    assert SubstringMatcher(index, threshold=0.5).best("acme") == (1, 1.0)
+
+
+def test_top_k_is_ranked_and_bounded():
+    index = _index(["acme holdings", "acme", "acme co", "acme corp"])
+    assert SubstringMatcher(index).top("acme", 2) == [(1, 1.0), (2, 4 / 7)]
+
+    fuzzy = FuzzyMatcher(index, threshold=0.1)
+    ranked = fuzzy.top("acme co", 3)
+    assert ranked[0] == (2, 1.0)
+    assert len(ranked) == 3
+    assert [s for _, s in ranked] == sorted((s for _, s in ranked), reverse=True)
+
+
+@pytest.mark.parametrize("threshold", [-0.1, 1.5, 2.0])
+def test_threshold_outside_unit_range_is_rejected(threshold):
+    index = _index(["John Smith"])
+    for method in ("substring", "fuzzy"):
+        with pytest.raises(ValueError, match="between 0 and 1"):
+            make_matcher(index, method, threshold)
+    with pytest.raises(ValueError, match="between 0 and 1"):
+        FuzzyMatcher(index, threshold)
+    # The bounds themselves are valid
+    assert make_matcher(index, "fuzzy", 1.0).best("john smith") == (0, 1.0)
@@ -0,0 +1,145 @@
+import json
+
+from sanctions_pipeline.merge import merge_entities, merged_id
+
+
+def _write(path, entities):
+    path.write_text("".join(json.dumps(e) + "\n" for e in entities))
+
+
+def test_merge_entities_dedupes_across_sources(tmp_path):
+    ofac = tmp_path / "ofac.jsonl"
+    _write(
+        ofac,
+        [
+            {
+                "schema": "Organization",
+                "id": "row-0",
+                "name": "Al-Qaida",
+                "notes": "SDGT",
+            },
+            {"schema": "Person", "id": "row-1", "name": "John Doe"},
+            {"schema": "Person", "id": "row-2", "name": ""},
+        ],
+    )
+    dfat = tmp_path / "dfat.jsonl"
+    _write(
+        dfat,
+        [
+            {"schema": "Person", "id": "row-0", "name": "Jane Roe"},
+            {
+                "schema": "Organization",
+                "id": "row-1",
+                "name": "AL QAIDA",
+                "notes": "1267",
+            },
+            # Same name, different schema: kept apart
+            {"schema": "Person", "id": "row-2", "name": "Al Qaida"},
+        ],
+    )
+    out = tmp_path / "merged.jsonl"
+
+    counts = merge_entities([str(ofac), f"au={dfat}"], str(out), partitions=4)
+
+    assert counts == {"input": 6, "output": 4, "duplicates": 1, "skipped": 1}
+    merged = [json.loads(line) for line in out.read_text().splitlines()]
+    # Ordered by first occurrence: all of ofac, then dfat's new entities
+    assert [e["name"] for e in merged] == [
+        "Al-Qaida",
+        "John Doe",
+        "Jane Roe",
+        "Al Qaida",
+    ]
+
+    qaida = merged[0]
+    assert qaida["id"] == merged_id("Organization", "al qaida")
+    assert qaida["notes"] == "SDGT; 1267"
+    assert qaida["sources"] == [
+        {"source": "ofac", "id": "row-0"},
+        {"source": "au", "id": "row-1"},
+    ]
+
+    # Ids are stable across runs and partition counts
+    merge_entities([str(ofac), f"au={dfat}"], str(tmp_path / "again.jsonl"))
+    assert (tmp_path / "again.jsonl").read_text() == out.read_text()
+
+
+def test_merge_entities_carries_attributes(tmp_path):
+    ofac = tmp_path / "ofac.jsonl"
+    _write(
+        ofac,
+        [
+            {
+                "schema": "Person",
+                "id": "row-0",
+                "name": "John Doe",
+                "aliases": ["Johnny Doe", "J. Doe"],
+                "birth_date": "1970-01-01",
+                "country": "Iran",
+            },
+            {
+                "schema": "Person",
+                "id": "row-1",
+                "name": "Jane Roe",
+                "birth_date": "1980",
+                "country": "Syria",
+            },
+        ],
+    )
+    dfat = tmp_path / "dfat.jsonl"
+    _write(
+        dfat,
+        [
+            {
+                "schema": "Person",
+                "id": "row-0",
+                "name": "JOHN DOE",
+                "aliases": ["J. Doe", "Jon Doe"],
+                "birth_date": "1970-01-01",
+                "country": "Iran",
+            },
+            # Disagrees on birth date and has no country
+            {
+                "schema": "Person",
+                "id": "row-1",
+                "name": "Jane Roe",
+                "birth_date": "1981",
+            },
+        ],
+    )
+    out = tmp_path / "merged.jsonl"
+
+    merge_entities([str(ofac), str(dfat)], str(out), partitions=2)
+
+    john, jane = [json.loads(line) for line in out.read_text().splitlines()]
+    assert john["aliases"] == ["Johnny Doe", "J. Doe", "Jon Doe"]
+    assert (john["birth_date"], john["country"]) == ("1970-01-01", "Iran")
+    assert list(john)[-1] == "sources"
+    assert "aliases" not in jane
+    assert "birth_date" not in jane
+    assert "country" not in jane
+
+
+def test_merge_entities_reads_followthemoney_notes(tmp_path):
+    ofac = tmp_path / "ofac.jsonl"
+    _write(
+        ofac,
+        [{"schema": "Person", "id": "row-0", "name": "John Doe", "notes": "SDGT"}],
+    )
+    ftm = tmp_path / "ftm.jsonl"
+    _write(
+        ftm,
+        [
+            {
+                "schema": "Person",
+                "id": "row-0",
+                "properties": {"name": ["JOHN DOE"], "notes": ["1267", "Al-Qaida"]},
+            }
+        ],
+    )
+    out = tmp_path / "merged.jsonl"
+
+    merge_entities([str(ofac), str(ftm)], str(out))
+
+    (john,) = [json.loads(line) for line in out.read_text().splitlines()]
+    assert john["notes"] == "SDGT; 1267; Al-Qaida"
@@ -0,0 +1,60 @@
+import json
+
+from typer.testing import CliRunner
+
+from sanctions_pipeline import metrics
+from sanctions_pipeline.cli import app
+
+runner = CliRunner()
+
+
+def test_cli_metrics_json_and_prometheus(tmp_path, write_entities):
+    entities = tmp_path / "entities.jsonl"
+    write_entities(entities, ["ACME Corp", "John Doe"])
+    people = tmp_path / "people.csv"
+    people.write_text("name\nacme\nJane Roe\nacme\n")
+    out_json = tmp_path / "metrics.json"
+    out_prom = tmp_path / "metrics.prom"
+
+    try:
+        res = runner.invoke(
+            app,
+            [
+                "--metrics",
+                str(out_json),
+                "--metrics-prom",
+                str(out_prom),
+                "screen",
+                "--input-csv",
+                str(people),
+                "--entities",
+                str(entities),
+                "--output-csv",
+                str(tmp_path / "out.csv"),
+            ],
+        )
+    finally:
+        metrics.disable()
+
+    assert res.exit_code == 0, res.output
+    (stage,) = json.loads(out_json.read_text())["stages"]
+    assert stage["stage"] == "screen"
+    assert stage["rows"] == 3
+    assert stage["bytes_read"] == people.stat().st_size
+    assert stage["bytes_written"] > 0
+    assert stage["counters"]["queries"] == 3
+    assert stage["counters"]["query_cache_hits"] >= 1
+    assert stage["candidates_per_query"] is not None
+
+    prom = out_prom.read_text()
+    assert 'sanctions_pipeline_stage_rows{stage="screen"} 3' in prom
+    assert "# TYPE sanctions_pipeline_candidates_total counter" in prom
+
+
+def test_stage_records_nothing_when_disabled():
+    assert metrics.current() is None
+    with metrics.stage("transform") as st:
+        st.rows = 10
+        st.count({"candidates": 5})
+        metrics.count({"candidates": 5})
+    assert st.counters == {}
@@ -0,0 +1,26 @@
+from sanctions_pipeline.normalize import (
+    normalize_name,
+    normalize_query,
+    query_cache_info,
+    sort_tokens,
+)
+
+
+def test_normalize_name_folds_case_punctuation_and_script():
+    assert normalize_name("Al-Qaida") == "al qaida"
+    assert normalize_name("  AL   QAIDA ") == "al qaida"
+    assert normalize_name("Аль-Каида") == "al kaida"
+    assert normalize_name("Müller, José") == "muller jose"
+    assert normalize_name("") == ""
+    assert normalize_name(None) == ""
+    assert sort_tokens("qaida al") == "al qaida"
+
+
+def test_normalize_query_is_cached():
+    before = query_cache_info()
+    for _ in range(3):
+        assert normalize_query("Osama BIN-Laden") == "osama bin laden"
+    after = query_cache_info()
+
+    assert after["hits"] - before["hits"] >= 2
+    assert 0.0 < after["hit_rate"] <= 1.0
@@ -0,0 +1,109 @@
+import pytest
+from sanctions_pipeline.pipeline import run_pipeline
+from sanctions_pipeline.screen import screen_names
+from sanctions_pipeline.transform import transform_to_simple_jsonl
+
+
+def _write_inputs(tmp_path):
+    """Write a small raw list and a CSV of names to screen."""
+    raw = tmp_path / "raw.csv"
+    raw.write_text(
+        "name,type,program\n"
+        "John Doe,Individual,SDGT\n"
+        "ACME Corp,Entity,IRAN\n"
+        ",Entity,IRAN\n"
+    )
+    people = tmp_path / "people.csv"
+    people.write_text("name\njohn\nacme\nnobody\n")
+    return raw, people
+
+
+def test_run_matches_separate_stages_and_caches(tmp_path):
+    raw, people = _write_inputs(tmp_path)
+    entities = tmp_path / "out" / "entities.jsonl"
+    results = tmp_path / "out" / "results.csv"
+    args = (str(raw), str(entities), str(people), str(results))
+    cache = str(tmp_path / "cache")
+
+    first = run_pipeline(*args, cache_dir=cache)
+    assert first == {
+        "build": {"status": "ran", "entities": 2},
+        "screen": {"status": "ran", "matched": 2},
+    }
+
+    # Same output as transform followed by screen
+    transform_to_simple_jsonl(str(raw), str(tmp_path / "e.jsonl"))
+    screen_names(str(people), str(tmp_path / "e.jsonl"), str(tmp_path / "r.csv"))
+    assert entities.read_text() == (tmp_path / "e.jsonl").read_text()
+    assert results.read_text() == (tmp_path / "r.csv").read_text()
+
+    second = run_pipeline(*args, cache_dir=cache)
+    assert {s: r["status"] for s, r in second.items()} == {
+        "build": "cached",
+        "screen": "cached",
+    }
+    assert second["screen"]["matched"] == 2
+
+    # A new screening config reruns only the screen stage
+    third = run_pipeline(*args, cache_dir=cache, method="fuzzy")
+    assert third["build"]["status"] == "cached"
+    assert third["screen"]["status"] == "ran"
+
+    # Changed input reruns everything; a deleted output is rebuilt
+    raw.write_text(raw.read_text() + "Jane Roe,Individual,SDGT\n")
+    results.unlink()
+    fourth = run_pipeline(*args, cache_dir=cache)
+    assert fourth["build"] == {"status": "ran", "entities": 3}
+    assert fourth["screen"]["status"] == "ran"
+    assert results.exists()
+
+
+def test_run_keeps_entities_when_validation_fails(tmp_path):
+    raw, _ = _write_inputs(tmp_path)
+    entities = tmp_path / "entities.jsonl"
+    entities.write_text("previous\n")
+
+    with pytest.raises(AssertionError, match="Too few records"):
+        run_pipeline(
+            str(raw), str(entities), cache_dir=str(tmp_path / "cache"), min_rows=10
+        )
+    assert entities.read_text() == "previous\n"
+    assert not (tmp_path / "entities.jsonl.tmp").exists()
+
+
+def test_run_reruns_stages_for_new_output_paths(tmp_path):
+    raw, people = _write_inputs(tmp_path)
+    cache = str(tmp_path / "cache")
+    run_pipeline(
+        str(raw),
+        str(tmp_path / "a.jsonl"),
+        str(people),
+        str(tmp_path / "a.csv"),
+        cache_dir=cache,
+    )
+
+    second = run_pipeline(
+        str(raw),
+        str(tmp_path / "b.jsonl"),
+        str(people),
+        str(tmp_path / "b.csv"),
+        cache_dir=cache,
+    )
+    assert {s: r["status"] for s, r in second.items()} == {
+        "build": "ran",
+        "screen": "ran",
+    }
+    assert (tmp_path / "b.jsonl").read_bytes() == (tmp_path / "a.jsonl").read_bytes()
+    assert (tmp_path / "b.csv").read_bytes() == (tmp_path / "a.csv").read_bytes()
+
+    # A new screening output alone reruns only the screen stage
+    third = run_pipeline(
+        str(raw),
+        str(tmp_path / "b.jsonl"),
+        str(people),
+        str(tmp_path / "c.csv"),
+        cache_dir=cache,
+    )
+    assert third["build"]["status"] == "cached"
+    assert third["screen"]["status"] == "ran"
+    assert (tmp_path / "c.csv").exists()
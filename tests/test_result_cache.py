@@ -0,0 +1,87 @@
+from sanctions_pipeline.index import load_index
+from sanctions_pipeline.match import make_matcher
+from sanctions_pipeline.result_cache import ResultCache, config_digest
+from sanctions_pipeline.screen import Screener, screen_names
+
+
+def _cache_counts(entities, cache_path, names):
+    """Screen names through a cache; return its (hits, misses)."""
+    index = load_index(str(entities))
+    config = config_digest(method="substring", threshold=None, top_k=None)
+    with ResultCache(cache_path, index.source_digest, config) as cache:
+        screener = Screener(make_matcher(index), cache=cache)
+        for name in names:
+            screener.hits(name)
+        return cache.hits, cache.misses
+
+
+def test_results_are_reused_until_entities_change(tmp_path, write_entities):
+    entities = tmp_path / "entities.jsonl"
+    write_entities(entities, ["ACME Corp", "John Doe"])
+    people = tmp_path / "people.csv"
+    people.write_text("name\nacme\nJOHN\nAcme\nnobody\n")
+    cache = str(tmp_path / "results.sqlite")
+
+    def run(name, **kwargs):
+        out = tmp_path / name
+        screen_names(str(people), str(entities), str(out), **kwargs)
+        return out.read_bytes()
+
+    expected = run("plain.csv")
+    assert run("first.csv", result_cache=cache) == expected
+    assert run("second.csv", result_cache=cache) == expected
+    # Every distinct normalized query was cached, including "no match"
+    assert _cache_counts(entities, cache, ["acme", "john", "nobody", "jane"]) == (3, 1)
+
+    # A list update invalidates everything cached for the old list
+    write_entities(entities, ["John Doe", "Acme Holdings"])
+    assert _cache_counts(entities, cache, ["acme"]) == (0, 1)
+    expected = run("plain2.csv")
+    assert run("third.csv", result_cache=cache) == expected
+    assert run("fourth.csv", result_cache=cache, workers=2) == expected
+
+
+def test_least_recently_used_results_are_evicted(tmp_path):
+    path = str(tmp_path / "results.sqlite")
+    with ResultCache(path, "list", "cfg", max_entries=2) as cache:
+        cache.put("old", [])
+        cache.put("kept", [(0, 1.0)])
+    with ResultCache(path, "list", "cfg", max_entries=2) as cache:
+        assert cache.get("kept") == [(0, 1.0)]
+        cache.put("new", [(1, 0.5)])
+
+    with ResultCache(path, "list", "cfg") as cache:
+        assert cache.get("old") is None
+        assert cache.get("kept") == [(0, 1.0)]
+        assert cache.get("new") == [(1, 0.5)]
+
+
+def test_lists_sharing_a_cache_keep_their_results(tmp_path, write_entities):
+    path = str(tmp_path / "results.sqlite")
+    with ResultCache(path, "ofac-v1", "cfg", source="ofac") as cache:
+        cache.put("acme", [(0, 1.0)])
+    with ResultCache(path, "dfat-v1", "cfg", source="dfat") as cache:
+        cache.put("acme", [(3, 1.0)])
+
+    # Opening another list (or a new version of one) keeps the other list's rows
+    with ResultCache(path, "ofac-v1", "cfg", source="ofac") as cache:
+        assert cache.get("acme") == [(0, 1.0)]
+    with ResultCache(path, "dfat-v2", "cfg", source="dfat") as cache:
+        assert cache.get("acme") is None
+    with ResultCache(path, "ofac-v1", "cfg", source="ofac") as cache:
+        assert cache.get("acme") == [(0, 1.0)]
+    with ResultCache(path, "dfat-v1", "cfg", source="dfat") as cache:
+        assert cache.get("acme") is None
+
+    # Through screen_names, two entities files share one cache file
+    ofac, dfat = tmp_path / "ofac.jsonl", tmp_path / "dfat.jsonl"
+    write_entities(ofac, ["ACME Corp"])
+    write_entities(dfat, ["Globex"])
+    people = tmp_path / "people.csv"
+    people.write_text("name\nacme\nglobex\n")
+    for entities in (ofac, dfat, ofac):
+        screen_names(
+            str(people), str(entities), str(tmp_path / "out.csv"), result_cache=path
+        )
+    assert _cache_counts(ofac, path, ["acme", "globex"]) == (2, 0)
+    assert _cache_counts(dfat, path, ["acme", "globex"]) == (2, 0)
@@ -0,0 +1,278 @@
+import csv  # For reading the screening output
+import json  # For writing entity fixtures
+from sanctions_pipeline.screen import screen_names
+
+
+def test_screen_names_substring_match(tmp_path, write_entities):
+    entities = tmp_path / "entities.jsonl"
+    write_entities(entities, ["ACME Corp", "John Doe", "Acme Holdings"])
+
+    people = tmp_path / "people.csv"
+    people.write_text("name\nacme\nJane Roe\n  JOHN \n")
+    out = tmp_path / "matches.csv"
+
+    n = screen_names(str(people), str(entities), str(out))
+
+    assert n == 2
+    rows = list(csv.DictReader(out.open()))
+    assert [r["match_name"] for r in rows] == ["ACME Corp", "", "John Doe"]
+    assert rows[0]["match_schema"] == "Person"
+
+
+def test_screen_names_parallel_matches_serial(tmp_path, write_entities):
+    entities = tmp_path / "entities.jsonl"
+    write_entities(entities, [f"Entity Number {i}" for i in range(50)])
+
+    # Enough rows that every worker gets several byte-range chunks
+    people = tmp_path / "people.csv"
+    with people.open("w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["id", "name"])
+        for i in range(400):
+            w.writerow([i, f"number {i % 70}" if i % 3 else "Nobody, Esq."])
+
+    serial = tmp_path / "serial.csv"
+    parallel = tmp_path / "parallel.csv"
+    n_serial = screen_names(str(people), str(entities), str(serial))
+    n_parallel = screen_names(str(people), str(entities), str(parallel), workers=3)
+
+    assert n_parallel == n_serial
+    assert parallel.read_bytes() == serial.read_bytes()
+    assert not list(tmp_path.glob("parallel.csv.part*"))
+
+
+def test_parallel_keeps_multi_line_quoted_fields_whole(tmp_path, write_entities):
+    entities = tmp_path / "entities.jsonl"
+    write_entities(entities, [f"Entity Number {i}" for i in range(50)])
+
+    # Long multi-line notes make chunk targets land inside quoted fields
+    people = tmp_path / "people.csv"
+    with people.open("w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["id", "name", "notes"])
+        for i in range(400):
+            notes = f'line one\n"quoted" {i}\nline three' if i % 2 else ""
+            w.writerow([i, f"number {i % 70}", notes])
+
+    serial = tmp_path / "serial.csv"
+    parallel = tmp_path / "parallel.csv"
+    n_serial = screen_names(str(people), str(entities), str(serial))
+    n_parallel = screen_names(str(people), str(entities), str(parallel), workers=3)
+
+    assert n_parallel == n_serial
+    assert parallel.read_bytes() == serial.read_bytes()
+    assert len(list(csv.DictReader(parallel.open(newline="")))) == 400
+
+
+def test_screen_names_fuzzy_tolerates_typos(tmp_path, write_entities):
+    entities = tmp_path / "entities.jsonl"
+    write_entities(entities, ["Osama bin Laden", "Acme Trading LLC"])
+
+    people = tmp_path / "people.csv"
+    people.write_text("name\nUsama bin Ladin\nAcme Tradng LLC\nJane Roe\n")
+    out = tmp_path / "matches.csv"
+
+    n = screen_names(
+        str(people), str(entities), str(out), method="fuzzy", threshold=0.6
+    )
+
+    assert n == 2
+    rows = list(csv.DictReader(out.open()))
+    assert [r["match_name"] for r in rows] == [
+        "Osama bin Laden",
+        "Acme Trading LLC",
+        "",
+    ]
+    assert 0.6 <= float(rows[1]["match_score"]) < 1.0
+    assert rows[2]["match_score"] == ""
+
+
+def test_screen_names_top_k_rows_and_json(tmp_path, write_entities):
+    entities = tmp_path / "entities.jsonl"
+    write_entities(entities, ["Acme Holdings Group", "ACME", "Acme Corp", "Beta"])
+
+    people = tmp_path / "people.csv"
+    people.write_text("name\nacme\nnobody\n")
+
+    rows_out = tmp_path / "rows.csv"
+    assert screen_names(str(people), str(entities), str(rows_out), top_k=2) == 1
+    rows = list(csv.DictReader(rows_out.open()))
+    # Best coverage first, then the unmatched row with empty match columns
+    assert [(r["match_rank"], r["match_id"]) for r in rows] == [
+        ("1", "row-1"),
+        ("2", "row-2"),
+        ("", ""),
+    ]
+
+    json_out = tmp_path / "json.csv"
+    screen_names(str(people), str(entities), str(json_out), top_k=5, output_mode="json")
+    rows = list(csv.DictReader(json_out.open()))
+    matches = json.loads(rows[0]["matches"])
+    assert [m["match_name"] for m in matches] == [
+        "ACME",
+        "Acme Corp",
+        "Acme Holdings Group",
+    ]
+    assert json.loads(rows[1]["matches"]) == []
+
+
+def test_rescreen_matches_full_screen(tmp_path):
+    from sanctions_pipeline.screen import rescreen_names
+    from sanctions_pipeline.transform import transform_incremental
+
+    people = tmp_path / "people.csv"
+    people.write_text("id,name\n1,acme\n2,globex\n3,initech\n4,umbrella\n5,nobody\n")
+
+    sanctions = tmp_path / "sanctions.csv"
+    entities = tmp_path / "entities.jsonl"
+    sanctions.write_text(
+        "name,type\nGlobex Corp,entity\nACME Ltd,entity\nUmbrella Inc,entity\n"
+    )
+    transform_incremental(str(sanctions), str(entities))
+    old_entities = tmp_path / "old.jsonl"
+    old_entities.write_bytes(entities.read_bytes())
+
+    previous = tmp_path / "previous.csv"
+    screen_names(str(people), str(entities), str(previous))
+
+    # Update: Globex renamed, Umbrella delisted, Initech and another ACME listed
+    sanctions.write_text(
+        "name,type\nGlobex Holdings,entity\nACME Ltd,entity\n,entity\n"
+        "Initech LLC,entity\nACME Trading,entity\n"
+    )
+    transform_incremental(str(sanctions), str(entities))
+    delta = tmp_path / "entities.delta.jsonl"
+
+    expected = tmp_path / "expected.csv"
+    screen_names(str(people), str(entities), str(expected))
+
+    via_delta = tmp_path / "via_delta.csv"
+    stats = rescreen_names(
+        str(people),
+        str(previous),
+        str(entities),
+        str(via_delta),
+        delta_jsonl=str(delta),
+    )
+    assert via_delta.read_bytes() == expected.read_bytes()
+    # Only the rows whose previous match changed or vanished hit the full index
+    assert stats["rescreened"] == 2
+    assert stats["matched"] == 3
+
+    via_old = tmp_path / "via_old.csv"
+    rescreen_names(
+        str(people),
+        str(previous),
+        str(entities),
+        str(via_old),
+        old_entities_jsonl=str(old_entities),
+    )
+    assert via_old.read_bytes() == expected.read_bytes()
+
+
+def test_screen_names_normalizes_spelling_variants(tmp_path, write_entities):
+    entities = tmp_path / "entities.jsonl"
+    write_entities(entities, ["Al Qaida", "Müller GmbH"])
+
+    people = tmp_path / "people.csv"
+    people.write_text("name\nAL-QAIDA\nmuller\nАль-Каида\n", encoding="utf-8")
+    out = tmp_path / "matches.csv"
+
+    n = screen_names(str(people), str(entities), str(out))
+
+    assert n == 2
+    rows = list(csv.DictReader(out.open(encoding="utf-8")))
+    assert [r["match_name"] for r in rows] == ["Al Qaida", "Müller GmbH", ""]
+
+    # Transliterated spellings are close enough for the fuzzy matcher
+    n = screen_names(
+        str(people), str(entities), str(out), method="fuzzy", threshold=0.6
+    )
+    rows = list(csv.DictReader(out.open(encoding="utf-8")))
+    assert rows[2]["match_name"] == "Al Qaida"
+
+
+def test_screen_names_narrows_by_type_birth_year_and_country(tmp_path):
+    from sanctions_pipeline.screen import rescreen_names
+    from sanctions_pipeline.transform import transform_to_simple_jsonl
+
+    sanctions = tmp_path / "sanctions.csv"
+    sanctions.write_text(
+        "name,type,aliases,dob,nationality\n"
+        "John Doe,Individual,Ivan Petrov,1964-01-01,Libya\n"
+        "John Doe Shipping,Entity,,,Libya\n"
+        "John Doe,Individual,,12 Mar 1980,Iran\n"
+    )
+    entities = tmp_path / "entities.jsonl"
+    transform_to_simple_jsonl(str(sanctions), str(entities))
+
+    people = tmp_path / "people.csv"
+    people.write_text(
+        "name,Type,Date of Birth,Citizenship\n"
+        "john doe,individual,1980-03-12,\n"
+        "john doe,company,,\n"
+        "ivan petrov,,1964,libya\n"
+        "john doe,individual,1990-01-01,\n"
+    )
+    out = tmp_path / "matches.csv"
+    assert screen_names(str(people), str(entities), str(out)) == 3
+    rows = list(csv.DictReader(out.open()))
+    assert [(r["match_id"], r["match_name"]) for r in rows] == [
+        ("row-2", "John Doe"),
+        ("row-1", "John Doe Shipping"),
+        ("row-0", "Ivan Petrov"),
+        ("", ""),
+    ]
+
+    unfiltered = tmp_path / "unfiltered.csv"
+    screen_names(str(people), str(entities), str(unfiltered), attributes=False)
+    rows = list(csv.DictReader(unfiltered.open()))
+    assert [r["match_id"] for r in rows] == ["row-0", "row-0", "row-0", "row-0"]
+
+    # Rescreening against an unchanged list reuses every previous match
+    again = tmp_path / "again.csv"
+    stats = rescreen_names(
+        str(people),
+        str(out),
+        str(entities),
+        str(again),
+        old_entities_jsonl=str(entities),
+    )
+    assert again.read_bytes() == out.read_bytes()
+    assert stats["rescreened"] == 0
+
+
+def test_attribute_filter_never_drops_on_unresolved_values(tmp_path):
+    entities = tmp_path / "entities.jsonl"
+    entities.write_text(
+        json.dumps({"schema": "Person", "id": "p", "name": "John Doe"})
+        + "\n"
+        + json.dumps(
+            {
+                "schema": "Person",
+                "id": "r",
+                "name": "Ivan Petrov",
+                "country": "Russian Federation",
+            }
+        )
+        + "\n"
+        + json.dumps(
+            {"schema": "Organization", "id": "o", "name": "Acme", "country": "Narnia"}
+        )
+        + "\n"
+    )
+    people = tmp_path / "people.csv"
+    people.write_text(
+        "name,type,nationality\n"
+        "John Doe,Person,\n"  # synonym of Individual
+        "John Doe,retail,\n"  # unknown type: no schema filter
+        "Ivan Petrov,,Russia\n"  # names and codes resolve to the same ISO code
+        "Ivan Petrov,,RU\n"
+        "Ivan Petrov,,Atlantis\n"  # unresolved country: no country filter
+        "Acme,company,Iran\n"  # entity country unresolved: not excluded
+        "John Doe,company,\n"  # a real mismatch is still filtered
+    )
+    out = tmp_path / "matches.csv"
+    screen_names(str(people), str(entities), str(out))
+    rows = list(csv.DictReader(out.open()))
+    assert [r["match_id"] for r in rows] == ["p", "p", "r", "r", "r", "o", ""]
@@ -0,0 +1,112 @@
+import asyncio  # The service is asyncio-based; tests drive it with asyncio.run
+import httpx  # Async client to call the running server
+from sanctions_pipeline.service import ScreeningService
+
+
+async def _with_server(service, fn):
+    """Start the service on a free port, run fn(client), then shut down."""
+    server = await asyncio.start_server(service.handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}") as client:
+            return await fn(client)
+
+
+def test_service_single_and_batch(tmp_path, write_entities):
+    entities = tmp_path / "entities.jsonl"
+    write_entities(entities, ["ACME Corp", "Globex"], schema="Organization")
+    service = ScreeningService(str(entities))
+
+    async def calls(client):
+        single = await client.get("/screen", params={"name": "acme"})
+        batch = await client.post("/screen/batch", json={"names": ["globex", "nobody"]})
+        # Many requests in flight at once on separate connections
+        many = await asyncio.gather(
+            *(client.post("/screen", json={"name": "acme"}) for _ in range(20))
+        )
+        bad = await client.post("/screen/batch", json={"names": "acme"})
+        return single, batch, many, bad
+
+    single, batch, many, bad = asyncio.run(_with_server(service, calls))
+
+    assert single.json()["matches"][0]["match_name"] == "ACME Corp"
+    results = batch.json()["results"]
+    assert [len(r["matches"]) for r in results] == [1, 0]
+    assert all(r.status_code == 200 for r in many)
+    assert bad.status_code == 400
+
+
+def test_service_hot_reload_swaps_index(tmp_path, write_entities):
+    entities = tmp_path / "entities.jsonl"
+    write_entities(entities, ["ACME Corp"], schema="Organization")
+    service = ScreeningService(str(entities))
+    old_version = service.version
+
+    async def calls(client):
+        before = await client.get("/screen", params={"name": "initech"})
+        write_entities(entities, ["ACME Corp", "Initech"], schema="Organization")
+        reload = await client.post("/reload")
+        after = await client.get("/screen", params={"name": "initech"})
+        return before, reload, after
+
+    before, reload, after = asyncio.run(_with_server(service, calls))
+
+    assert before.json()["matches"] == []
+    assert reload.json()["reloaded"] is True
+    assert after.json()["matches"][0]["match_id"] == "row-1"
+    assert service.version != old_version
+
+
+def test_service_reports_errors_as_json(tmp_path, write_entities):
+    entities = tmp_path / "entities.jsonl"
+    write_entities(entities, ["ACME Corp"], schema="Organization")
+    service = ScreeningService(str(entities))
+
+    async def raw(request):
+        server = await asyncio.start_server(service.handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(request)
+            response = await reader.read()
+            writer.close()
+            return response
+
+    bad_length = asyncio.run(
+        raw(b"POST /screen HTTP/1.1\r\nContent-Length: ten\r\n\r\n")
+    )
+    assert bad_length.startswith(b"HTTP/1.1 400 ")
+    assert bad_length.endswith(b'{"error": "bad Content-Length"}')
+
+    def broken(name):
+        raise ValueError("boom")
+
+    service.screener.matches = broken
+    failed = asyncio.run(raw(b"GET /screen?name=acme HTTP/1.0\r\n\r\n"))
+    assert failed.startswith(b"HTTP/1.1 500 ")
+    assert failed.endswith(b'{"error": "internal error"}')
+
+
+def test_watch_reloads_only_when_file_changes(tmp_path, write_entities):
+    entities = tmp_path / "entities.jsonl"
+    write_entities(entities, ["ACME Corp"], schema="Organization")
+    service = ScreeningService(str(entities))
+    reloads = []
+
+    async def reload(force=False):
+        reloads.append(entities.stat().st_size)
+        return True
+
+    service.reload = reload
+
+    async def run():
+        watcher = asyncio.create_task(service.watch(0.01))
+        await asyncio.sleep(0.2)
+        write_entities(entities, ["ACME Corp", "Initech"], schema="Organization")
+        await asyncio.sleep(0.2)
+        watcher.cancel()
+
+    asyncio.run(run())
+    # Once for the initial stable stat, once after the change; never re-polled
+    assert len(reloads) == 2
+    assert reloads[0] < reloads[1]
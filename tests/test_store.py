@@ -0,0 +1,90 @@
+import csv  # For reading the screening output
+import json  # For reading the JSONL entities
+import pickle  # Store columns must survive pickling (saved index, spawned workers)
+import pytest
+from sanctions_pipeline.index import build_index
+from sanctions_pipeline.screen import screen_names
+from sanctions_pipeline.store import EntityStore, is_store, write_store
+from sanctions_pipeline.transform import transform_to_simple_jsonl, transform_to_store
+
+
+def test_store_roundtrip(tmp_path):
+    entities = [
+        {"id": "row-0", "name": "Zoë Ünal", "schema": "Person", "key": "zoë ünal"},
+        {"id": "row-1", "name": "ACME", "schema": "Organization", "key": "acme"},
+    ]
+    path = tmp_path / "entities.store"
+    assert write_store(entities, str(path)) == 2
+    assert is_store(str(path))
+
+    store = EntityStore.open(str(path))
+    assert list(store.iter_entities()) == entities
+    names = store.column("name")
+    assert names[-1] == "ACME"
+    assert pickle.loads(pickle.dumps(names))[0] == "Zoë Ünal"
+
+
+def test_screen_from_store_matches_jsonl(tmp_path):
+    input_csv = tmp_path / "sdn.csv"
+    input_csv.write_text(
+        "name,type\nJohn Doe,individual\n,entity\nACME Corp,entity\nAcme Ltd,entity\n"
+    )
+    jsonl = tmp_path / "entities.jsonl"
+    store = tmp_path / "entities.store"
+    transform_to_simple_jsonl(str(input_csv), str(jsonl))
+    assert transform_to_store(str(input_csv), str(store)) == 3
+
+    from_store = build_index(str(store))
+    from_jsonl = build_index(str(jsonl))
+    assert list(from_store.ids) == from_jsonl.ids
+    assert from_store.grams == from_jsonl.grams
+
+    people = tmp_path / "people.csv"
+    people.write_text("name\nacme\ndoe\nnobody\n")
+    out_store = tmp_path / "store.csv"
+    out_jsonl = tmp_path / "jsonl.csv"
+    screen_names(str(people), str(store), str(out_store), workers=2)
+    screen_names(str(people), str(jsonl), str(out_jsonl))
+    assert out_store.read_bytes() == out_jsonl.read_bytes()
+
+
+@pytest.mark.parametrize("aliases", [True, False])
+def test_store_screens_aliases_and_attributes_like_jsonl(tmp_path, aliases):
+    input_csv = tmp_path / "sdn.csv"
+    input_csv.write_text(
+        "name,type,aka,dob,nationality\n"
+        f"Ivan Petrov,individual,{'Vanya Petrov' if aliases else ''},1970-01-01,Russia\n"
+        "Ivan Petrov,individual,,1985,Iran\n"
+        "ACME Corp,entity,,,\n"
+    )
+    jsonl = tmp_path / "entities.jsonl"
+    store = tmp_path / "entities.store"
+    transform_to_simple_jsonl(str(input_csv), str(jsonl))
+    transform_to_store(str(input_csv), str(store))
+    fields = ("id", "aliases", "birth_date", "country")
+    from_jsonl = [json.loads(line) for line in jsonl.read_text().splitlines()]
+    assert [
+        {f: e.get(f) for f in fields}
+        for e in EntityStore.open(str(store)).iter_entities()
+    ] == [{f: e.get(f) for f in fields} for e in from_jsonl]
+
+    people = tmp_path / "people.csv"
+    people.write_text(
+        "name,birth_date,country\n"
+        "vanya petrov,,\n"
+        "ivan petrov,1985-05-05,\n"
+        "ivan petrov,,RU\n"
+        "acme,,Iran\n"
+    )
+    out_store = tmp_path / "store.csv"
+    out_jsonl = tmp_path / "jsonl.csv"
+    n = screen_names(str(people), str(store), str(out_store), top_k=5)
+    assert n == screen_names(str(people), str(jsonl), str(out_jsonl), top_k=5)
+    assert out_store.read_bytes() == out_jsonl.read_bytes()
+    rows = list(csv.DictReader(out_jsonl.open(newline="")))
+    assert [(r["name"], r["match_id"]) for r in rows] == [
+        ("vanya petrov", "row-0" if aliases else ""),
+        ("ivan petrov", "row-1"),
+        ("ivan petrov", "row-0"),
+        ("acme", "row-2"),
+    ]
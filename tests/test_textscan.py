@@ -0,0 +1,78 @@
+import csv  # For reading the hits output
+import json
+import pytest
+
+pytest.importorskip("ahocorasick")
+
+from sanctions_pipeline.textscan import load_automaton, screen_text  # noqa: E402
+
+
+def test_screen_text_reports_hits_with_offsets(tmp_path, write_entities):
+    entities = tmp_path / "entities.jsonl"
+    write_entities(
+        entities, ["Al-Qaida", "Ali", "Müller GmbH", "Li"], schema="Organization"
+    )
+    memos = tmp_path / "memos.csv"
+    memos.write_text(
+        "ref,memo\n"
+        'p1,"Invoice 7 to AL QAIDA group, via alibaba"\n'
+        "p2,Goods for müller  gmbh / Ali.\n"
+        "p3,nothing to see\n",
+        encoding="utf-8",
+    )
+    out = tmp_path / "hits.csv"
+
+    counts = screen_text(str(memos), str(entities), str(out), column="memo")
+
+    assert counts == {"rows": 3, "matched": 2, "hits": 3}
+    rows = list(csv.DictReader(out.open(encoding="utf-8")))
+    # Word boundaries only ("ali" not in "alibaba"); "li" is below min_length
+    assert [(r["ref"], r["match_id"], r["match_text"]) for r in rows] == [
+        ("p1", "row-0", "AL QAIDA"),
+        ("p2", "row-2", "müller  gmbh"),
+        ("p2", "row-1", "Ali"),
+    ]
+    for r in rows:
+        memo = r["memo"]
+        assert memo[int(r["match_start"]) : int(r["match_end"])] == r["match_text"]
+
+
+def test_automaton_matches_aliases_as_their_entity(tmp_path):
+    entities = tmp_path / "entities.jsonl"
+    rows = [
+        {"id": "row-0", "name": "Ivan Petrov", "aliases": ["Vanya", "I. Petrov"]},
+        {"id": "row-1", "name": "Li", "aliases": ["Lee Holdings", "Li"]},
+    ]
+    entities.write_text(
+        "".join(json.dumps({**r, "schema": "Person"}) + "\n" for r in rows),
+        encoding="utf-8",
+    )
+
+    automaton = load_automaton(str(entities))
+
+    assert len(automaton) == 2
+    assert automaton.scan("sent to VANYA and ivan petrov") == [
+        (0, 8, 13),
+        (0, 18, 29),
+    ]
+    # The name is below min_length but the alias still compiles the entity in
+    assert automaton.scan("lee holdings ltd") == [(1, 0, 12)]
+    assert automaton.names[1] == "Li"
+
+
+def test_automaton_cache_is_rebuilt_when_entities_change(tmp_path, write_entities):
+    entities = tmp_path / "entities.jsonl"
+    cache = tmp_path / "entities.ac"
+    write_entities(entities, ["Acme Corp"], schema="Organization")
+
+    first = load_automaton(str(entities), str(cache))
+    assert cache.exists()
+    assert [o for o, _, _ in first.scan("paid acme corp")] == [0]
+    assert load_automaton(str(entities), str(cache)).source_digest == (
+        first.source_digest
+    )
+
+    write_entities(entities, ["Globex"], schema="Organization")
+    second = load_automaton(str(entities), str(cache))
+    assert second.scan("paid acme corp") == []
+    assert second.scan("paid GLOBEX") == [(0, 5, 11)]
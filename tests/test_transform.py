@@ -1,6 +1,9 @@
 import json  # For parsing JSON output from transform functions
+import pytest
 from sanctions_pipeline.transform import (
     transform_to_simple_jsonl,
+    transform_to_parquet,
+    transform_columnar,
     transform_csv_to_ftm,
 )  # Functions we're testing
 
@@ -34,6 +37,7 @@ def test_transform_to_simple_jsonl_dfat_like(tmp_path):
     entity1 = json.loads(lines[0])  # Convert JSON string to Python dict
     assert entity1["name"] == "John Doe"  # Check name was extracted correctly
     assert entity1["schema"] == "Person"  # Should be Person because Type=Individual
+    assert entity1["name_key"] == "john doe"  # Matching key precomputed for screening
     assert "1988 (Taliban)" in entity1["notes"]  # Check program/committee was captured
     assert (
         "Listed by UN on 2020-01-01" in entity1["notes"]
@@ -77,3 +81,235 @@ def test_transform_csv_to_ftm_dfat_like(tmp_path):
     assert entity["schema"] == "Person"  # Schema type
     assert "name" in entity["properties"]  # FTM stores data in 'properties' dict
     assert "Jane Smith" in entity["properties"]["name"]  # Name should be in a list
+
+
+def test_streaming_xlsx_rows_match_pandas(tmp_path):
+    """The streaming .xlsx reader yields the same rows as the pandas reader."""
+    import datetime
+
+    import openpyxl
+
+    from sanctions_pipeline.transform import (
+        _iter_rows_from_excel,
+        _iter_rows_from_xlsx,
+    )
+
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(["Name of Individual or Entity", "Type", None, "Type", 2020, "Listed"])
+    ws.append(["John Doe", "Individual", 1, "x", datetime.datetime(2020, 1, 2), True])
+    ws.append([None] * 6)  # Blank row in the middle is kept
+    # Mixed cell types: integral floats are written as integers, like pandas
+    ws.append(["ACME Corp", "Entity", None, " y ", 1.5, False])
+    ws.append(["Globex", "Entity", 1e20, 2.0, datetime.time(3, 4), 12345678901234567.0])
+    ws.append([None] * 6)  # Trailing blank rows are dropped
+    xlsx = tmp_path / "dfat.xlsx"
+    wb.save(xlsx)
+
+    streamed = list(_iter_rows_from_xlsx(xlsx))
+    assert streamed == list(_iter_rows_from_excel(xlsx))
+    assert len(streamed) == 4
+
+    output_jsonl = tmp_path / "entities.jsonl"
+    assert transform_to_simple_jsonl(str(xlsx), str(output_jsonl)) == 3
+    ids = [json.loads(line)["id"] for line in output_jsonl.read_text().splitlines()]
+    assert ids == ["row-0", "row-2", "row-3"]
+
+
+def test_parallel_transform_is_byte_identical(tmp_path, monkeypatch):
+    """Transforming on a process pool gives exactly the serial output."""
+    import sanctions_pipeline.transform as transform
+
+    input_csv = tmp_path / "sdn.csv"
+    rows = ["name,type,program,remarks"]
+    for i in range(250):
+        name = "" if i % 17 == 0 else f"Entity {i}"  # Some rows are skipped
+        rows.append(f"{name},{'individual' if i % 2 else 'entity'},SDGT,Note {i}")
+    input_csv.write_text("\n".join(rows) + "\n")
+
+    # Small batches so several are in flight across the workers
+    monkeypatch.setattr(transform, "BATCH_SIZE", 16)
+
+    for fn in (transform_to_simple_jsonl, transform_csv_to_ftm):
+        serial = tmp_path / f"{fn.__name__}-serial.jsonl"
+        parallel = tmp_path / f"{fn.__name__}-parallel.jsonl"
+        assert fn(str(input_csv), str(serial)) == 235
+        assert fn(str(input_csv), str(parallel), workers=3) == 235
+        assert parallel.read_bytes() == serial.read_bytes()
+
+
+def test_incremental_transform_writes_delta(tmp_path):
+    """A second incremental run only emits the rows that changed."""
+    from sanctions_pipeline.transform import transform_incremental
+
+    input_csv = tmp_path / "sdn.csv"
+    output_jsonl = tmp_path / "entities.jsonl"
+    delta = tmp_path / "entities.delta.jsonl"
+
+    input_csv.write_text(
+        "name,type,program\n"
+        "John Doe,individual,SDGT\n"
+        "ACME Corp,entity,IRAN\n"
+        "Globex,entity,CUBA\n"
+    )
+    first = transform_incremental(str(input_csv), str(output_jsonl))
+    assert first["added"] == 3
+    assert (tmp_path / "entities.state.json").exists()
+
+    # Change row 1, blank out row 2's name, append a new row
+    input_csv.write_text(
+        "name,type,program\n"
+        "John Doe,individual,SDGT\n"
+        "ACME Corp,entity,SYRIA\n"
+        ",entity,CUBA\n"
+        "Initech,entity,DPRK\n"
+    )
+    second = transform_incremental(str(input_csv), str(output_jsonl))
+    assert second == {
+        "total": 3,
+        "added": 1,
+        "updated": 1,
+        "deleted": 1,
+        "unchanged": 1,
+    }
+
+    ops = [json.loads(line) for line in delta.read_text().splitlines()]
+    assert [(o["op"], o["id"]) for o in ops] == [
+        ("update", "row-1"),
+        ("delete", "row-2"),
+        ("add", "row-3"),
+    ]
+    assert ops[0]["entity"]["notes"] == "Program: SYRIA"
+
+    # The snapshot matches a full (non-incremental) transform of the new input
+    full = tmp_path / "full.jsonl"
+    transform_to_simple_jsonl(str(input_csv), str(full))
+    assert output_jsonl.read_text() == full.read_text()
+
+
+def test_incremental_transform_cold_starts_on_changed_snapshot(tmp_path):
+    """A snapshot that no longer matches its state is rebuilt from scratch."""
+    from sanctions_pipeline.transform import transform_incremental
+
+    input_csv = tmp_path / "sdn.csv"
+    output_jsonl = tmp_path / "entities.jsonl"
+    input_csv.write_text("name,type\nJohn Doe,individual\nACME Corp,entity\n")
+    transform_incremental(str(input_csv), str(output_jsonl))
+
+    # Lines reused from this snapshot would be wrong
+    output_jsonl.write_text('{"id": "row-0", "name": "Stale"}\n')
+    again = transform_incremental(str(input_csv), str(output_jsonl))
+
+    assert again["added"] == 2 and again["unchanged"] == 0
+    full = tmp_path / "full.jsonl"
+    transform_to_simple_jsonl(str(input_csv), str(full))
+    assert output_jsonl.read_text() == full.read_text()
+
+
+def test_transform_columnar_matches_row_by_row(tmp_path):
+    # Header variants the row path resolves: fallbacks, case, a later duplicate
+    input_csv = tmp_path / "input.csv"
+    input_csv.write_text(
+        "Full_Name,NAME ,Type,Regime,Remarks,name\n"
+        '"John ""JD"" Doe","Shadowed by the later name column",Individual,SDGT,"multi\nline",\n'
+        ",,Entity,,,\n"
+        "Fallback Org,,entity,,Front company,\n"
+        ",  ,individual,IRAN,,Late Duplicate Column\n"
+        "Müller,, ,, ,\n",
+        encoding="utf-8",
+    )
+    rows_out = tmp_path / "rows.jsonl"
+    cols_out = tmp_path / "cols.jsonl"
+
+    n = transform_to_simple_jsonl(str(input_csv), str(rows_out))
+    assert transform_columnar(str(input_csv), str(cols_out), chunk_rows=2) == n == 4
+    assert cols_out.read_bytes() == rows_out.read_bytes()
+
+
+def test_transform_columnar_handles_ragged_rows(tmp_path):
+    # With chunk_rows=1 some chunks hold only short rows
+    input_csv = tmp_path / "input.csv"
+    input_csv.write_text(
+        "name,sdn_type,program,remarks\nA,individual\nB,entity,X,r\nC\n",
+        encoding="utf-8",
+    )
+    rows_out = tmp_path / "rows.jsonl"
+    cols_out = tmp_path / "cols.jsonl"
+
+    n = transform_to_simple_jsonl(str(input_csv), str(rows_out))
+    assert transform_columnar(str(input_csv), str(cols_out), chunk_rows=1) == n == 3
+    assert cols_out.read_bytes() == rows_out.read_bytes()
+
+
+def test_transform_to_parquet_matches_jsonl_and_screens(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    from sanctions_pipeline.screen import screen_names
+
+    input_csv = tmp_path / "input.csv"
+    input_csv.write_text(
+        "name,type,program,remarks\n"
+        "John Doe,Individual,SDGT,\n"
+        ",Entity,,\n"
+        "ACME Corp,Entity,,Front company\n"
+        "Jane Roe,individual,IRAN,Alias JR\n",
+        encoding="utf-8",
+    )
+    jsonl = tmp_path / "entities.jsonl"
+    parquet = tmp_path / "entities.parquet"
+
+    assert transform_to_simple_jsonl(str(input_csv), str(jsonl)) == 3
+    assert transform_to_parquet(str(input_csv), str(parquet), row_group_size=2) == 3
+
+    # Same entities, written as two row groups
+    table = pq.read_table(parquet)
+    assert pq.ParquetFile(parquet).num_row_groups == 2
+    rows = [{k: v for k, v in r.items() if v is not None} for r in table.to_pylist()]
+    assert rows == [json.loads(line) for line in jsonl.read_text().splitlines()]
+
+    people = tmp_path / "people.csv"
+    people.write_text("name\nacme\njane\nnobody\n")
+    from_jsonl, from_parquet = tmp_path / "a.csv", tmp_path / "b.csv"
+    screen_names(str(people), str(jsonl), str(from_jsonl))
+    screen_names(str(people), str(parquet), str(from_parquet))
+    assert from_parquet.read_bytes() == from_jsonl.read_bytes()
+
+
+def test_transform_carries_aliases_birth_date_and_country(tmp_path):
+    input_csv = tmp_path / "input.csv"
+    input_csv.write_text(
+        "Name of Individual or Entity,Type,Aliases,Date of Birth,Citizenship\n"
+        "John Doe,Individual,JD; Johnny D | John Doe,1964-01-01 00:00:00,Libya\n"
+        "ACME Corp,Entity,;,,Iran\n"
+        "Jane Roe,Individual,,,\n",
+        encoding="utf-8",
+    )
+    rows_out = tmp_path / "rows.jsonl"
+    cols_out = tmp_path / "cols.jsonl"
+
+    assert transform_to_simple_jsonl(str(input_csv), str(rows_out)) == 3
+    entities = [json.loads(line) for line in rows_out.read_text().splitlines()]
+    assert entities[0]["aliases"] == ["JD", "Johnny D"]
+    assert entities[0]["birth_date"] == "1964-01-01"
+    assert entities[0]["country"] == "Libya"
+    assert entities[1]["country"] == "Iran" and "aliases" not in entities[1]
+    assert set(entities[2]) == {"schema", "id", "name", "name_key"}
+
+    # The columnar path writes the same attributes
+    transform_columnar(str(input_csv), str(cols_out), chunk_rows=2)
+    assert cols_out.read_bytes() == rows_out.read_bytes()
+
+    # FTM: one alias value per alias, on the FTM properties
+    ftm_out = tmp_path / "ftm.jsonl"
+    transform_csv_to_ftm(str(input_csv), str(ftm_out))
+    person = json.loads(ftm_out.read_text().splitlines()[0])["properties"]
+    assert sorted(person["alias"]) == ["JD", "Johnny D"]
+    assert person["birthDate"] == ["1964-01-01"]
+    assert person["nationality"]
+
+    # Parquet keeps the aliases as a list column
+    pytest.importorskip("pyarrow")
+    from sanctions_pipeline.writers import iter_parquet
+
+    parquet = tmp_path / "entities.parquet"
+    transform_to_parquet(str(input_csv), str(parquet))
+    assert list(iter_parquet(str(parquet))) == entities
@@ -1,4 +1,5 @@
 import pytest  # Testing framework
+import json  # For writing entity fixtures
 from sanctions_pipeline.validate import validate_jsonl  # The function we're testing
 
 
@@ -27,3 +28,91 @@ def test_validate_jsonl_min_rows(tmp_path):
 
     with pytest.raises(AssertionError, match="Too few records: 1 < 5"):
         validate_jsonl(str(f), min_rows=5)  # Require 5 rows, but only have 1
+
+
+def test_validate_jsonl_check_fields_reports_lines(tmp_path):
+    f = tmp_path / "entities.jsonl"
+    f.write_text(
+        '{"id": "row-0", "schema": "Person", "name": "Alice"}\n'
+        '{"id": "row-1", "schema": "Person"}\n'
+        '{"id": "row-0", "schema": "Person", "name": "Alice again"}\n'
+        "\n"
+        '{"id": "row-2", "schema": "Persn", "name": "Bob"}\n'
+        '{"id": "row-3", "schema": "Vessel", "properties": {"name": ["Ship"]}}\n'
+    )
+
+    with pytest.raises(AssertionError) as e:
+        validate_jsonl(str(f), check_fields=True, block_size=40)
+    message = str(e.value)
+    assert "missing_name=1 (lines 2)" in message
+    assert "unknown_schema=1 (lines 5)" in message
+    assert "duplicate_id=1 (lines 3)" in message
+
+    # Without field checks the same file is valid JSON
+    assert validate_jsonl(str(f))["total"] == 5
+
+
+def test_validate_jsonl_parallel_matches_serial(tmp_path):
+    f = tmp_path / "entities.jsonl"
+    rows = [
+        f'{{"id": "row-{i % 900}", "schema": "Person", "name": "N{i}"}}'
+        for i in range(1000)
+    ]
+    rows[500] = "{bad json}"
+    f.write_text("\n".join(rows) + "\n")
+
+    def run(workers):
+        with pytest.raises(AssertionError) as e:
+            validate_jsonl(str(f), workers=workers, block_size=2048)
+        return str(e.value)
+
+    assert run(1) == run(3) == "Bad JSON lines: 1 (lines 501)"
+
+
+def test_validate_parquet(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    f = tmp_path / "entities.parquet"
+    table = pa.table(
+        {
+            "id": ["row-0", "row-1", "row-0"],
+            "schema": ["Person", "Organization", "Person"],
+            "name": ["Alice", None, "Alice again"],
+        }
+    )
+    pq.write_table(table, f, row_group_size=2)
+
+    assert validate_jsonl(str(f))["total"] == 3
+    with pytest.raises(AssertionError) as e:
+        validate_jsonl(str(f), check_fields=True)
+    assert "missing_name=1 (lines 2)" in str(e.value)
+    assert "duplicate_id=1 (lines 3)" in str(e.value)
+
+
+@pytest.mark.parametrize("numpy_min_ids", [0, 100_000])
+def test_id_hash_collisions_are_not_duplicates(tmp_path, monkeypatch, numpy_min_ids):
+    from sanctions_pipeline import validate
+    from sanctions_pipeline.validate import RecordValidator
+
+    # Every id hashes the same, so only the ids themselves tell them apart
+    monkeypatch.setattr(validate, "_id_hash", lambda entity_id: 7)
+    monkeypatch.setattr(validate, "NUMPY_MIN_IDS", numpy_min_ids)
+    records = [
+        {"id": "row-0", "schema": "Person", "name": "Alice"},
+        {"id": "row-1", "schema": "Person", "name": "Bob"},
+        {"id": "row-0", "schema": "Person", "name": "Alice again"},
+    ]
+    f = tmp_path / "entities.jsonl"
+    f.write_text("".join(json.dumps(r) + "\n" for r in records))
+
+    with pytest.raises(
+        AssertionError, match=r"^Invalid records: duplicate_id=1 \(lines 3\)$"
+    ):
+        validate_jsonl(str(f), check_fields=True)
+
+    validator = RecordValidator()
+    for record in records[:2]:
+        validator.check(record)
+    f.write_text("".join(json.dumps(r) + "\n" for r in records[:2]))
+    assert validator.finish(path=str(f))["errors"] == {}